@@ -1,6 +1,7 @@
 import numpy as np
+from tan.history import History
 
-def eigpower(A, tol=1e-6, nmax=100, x0=None):
+def eigpower(A, tol=1e-6, nmax=100, x0=None, history="none", callback=None):
     """
     Evalue numériquement une valeur propre d’une matrice par la méthode de la puissance.
 
@@ -9,11 +10,20 @@ def eigpower(A, tol=1e-6, nmax=100, x0=None):
     - tol : Tolerance pour l'erreur absolue (1.e-6 par défaut).
     - nmax : Nombre maximal d'itérations (100 par défaut).
     - x0 : Vecteur initial (vecteur de 1 par défaut).
+    - history : Stockage de l'historique des erreurs err ("none" par défaut, "list" ou
+      "array", voir tan.history.History).
+    - callback : Fonction appelée à chaque itération par callback(iter, x, lambda, err) ;
+      si elle retourne True, les itérations s'arrêtent.
 
     Retourne :
+    Le triplet (lambda, x, iter) avec history="none" (par défaut), comme les
+    versions précédentes de eigpower et les notebooks du cours ; le quadruplet
+    (lambda, x, iter, err) si history est "list" ou "array".
     - lambda : Valeur propre de module maximal de la matrice A.
     - x : Vecteur propre associé à la valeur propre lambda.
     - iter : Nombre d'itérations effectuées.
+    - err : Historique des erreurs |lambda_k - lambda_{k-1}| (quatrième valeur,
+      seulement si history est "list" ou "array").
     """
     n, m = A.shape
     if n != m:
@@ -27,6 +37,7 @@ def eigpower(A, tol=1e-6, nmax=100, x0=None):
     lambda_ = x0.T @ pro
     err = tol * abs(lambda_) + 1
     iter_ = 0
+    hist = History(history, nmax + 1)
     while err > tol * abs(lambda_) and abs(lambda_) != 0 and iter_ <= nmax:
         x = pro
         x = x / np.linalg.norm(x)
@@ -35,7 +46,12 @@ def eigpower(A, tol=1e-6, nmax=100, x0=None):
         err = abs(lambda_new - lambda_)
         lambda_ = lambda_new
         iter_ += 1
+        hist.append(err)
+        if callback is not None and callback(iter_, x, lambda_, err):
+            break
 
+    if history != "none":
+        return lambda_, x, iter_, hist.result()
     return lambda_, x, iter_
 
 # Exemple d'utilisation
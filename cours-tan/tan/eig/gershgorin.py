@@ -1,6 +1,51 @@
 import numpy as np
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import scipy.sparse as sp
+
+
+def gershgorin_discs(A):
+    """
+    Calcule les centres et les rayons des disques de Gershgorin d'une matrice A.
+
+    Paramètres :
+    - A : Matrice carrée, dense ou creuse (une matrice creuse n'est pas densifiée).
+
+    Retourne :
+    - center : Centres des disques, i.e. la diagonale de A.
+    - radiir : Rayons des disques de lignes, sum_{j != i} |a_ij|.
+    - radiic : Rayons des disques de colonnes, sum_{j != i} |a_ji|.
+    """
+    if sp.issparse(A):
+        center = A.diagonal()
+        absA = abs(A)
+        radiir = np.asarray(absA.sum(axis=1)).ravel() - np.abs(center)
+        radiic = np.asarray(absA.sum(axis=0)).ravel() - np.abs(center)
+    else:
+        center = np.diag(A)
+        radiir = np.sum(np.abs(A), axis=1) - np.abs(center)
+        radiic = np.sum(np.abs(A), axis=0) - np.abs(center)
+    return center, radiir, radiic
+
+
+def gershgorin_bounds(A):
+    """
+    Encadre les valeurs propres d'une matrice A à spectre réel (symétrique par exemple).
+
+    Les valeurs propres appartiennent à la réunion des disques de lignes et à
+    celle des disques de colonnes ; leurs traces sur l'axe réel donnent
+    l'intervalle [lmin, lmax].
+
+    Paramètres :
+    - A : Matrice carrée, dense ou creuse, à valeurs propres réelles.
+
+    Retourne :
+    - lmin, lmax : Bornes inférieure et supérieure des valeurs propres de A.
+    """
+    center, radiir, radiic = gershgorin_discs(A)
+    center = np.real(center)
+    lmin = max(np.min(center - radiir), np.min(center - radiic))
+    lmax = min(np.max(center + radiir), np.max(center + radiic))
+    return float(lmin), float(lmax)
+
 
 def gershgorin_circles(A):
     """
@@ -12,11 +57,11 @@ def gershgorin_circles(A):
     Retourne :
     - fig : Objet figure de Plotly contenant les cercles de Gershgorin.
     """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
 
     n = A.shape[0]
-    center = np.diag(A)
-    radiir = np.sum(np.abs(A - np.diag(center)), axis=1)
-    radiic = np.sum(np.abs(A.T - np.diag(center)), axis=1)
+    center, radiir, radiic = gershgorin_discs(A)
 
     theta = np.linspace(0, 2 * np.pi, 100)
     
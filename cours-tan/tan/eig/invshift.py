@@ -1,8 +1,9 @@
 import numpy as np
 from scipy.linalg import lu, solve_triangular
+from tan.history import History
 
 
-def invshift(A, mu=0, tol=1e-6, nmax=10000, x0=None):
+def invshift(A, mu=0, tol=1e-6, nmax=10000, x0=None, history="none", callback=None):
     """
     Evalue numériquement une valeur propre d'une matrice par la méthode de la puissance inverse.
     
@@ -12,11 +13,21 @@ def invshift(A, mu=0, tol=1e-6, nmax=10000, x0=None):
     - tol : Tolérance pour l'erreur absolue (1.e-6 par défaut).
     - nmax : Nombre maximal d'itérations (100 par défaut).
     - x0 : Vecteur initial (vecteur aléatoire par défaut).
+    - history : Stockage de l'historique des erreurs err ("none" par défaut, "list" ou
+      "array", voir tan.history.History).
+    - callback : Fonction appelée à chaque itération par callback(iter, x, lambda, err),
+      où lambda est l'estimation courante de la valeur propre de A ; si elle
+      retourne True, les itérations s'arrêtent.
     
     Retourne :
+    Le triplet (lambda, x, iter) avec history="none" (par défaut), comme les
+    versions précédentes de invshift et les notebooks du cours ; le quadruplet
+    (lambda, x, iter, err) si history est "list" ou "array".
     - lambda : Valeur propre de la matrice A la plus proche de MU.
     - x : Vecteur propre associé à la valeur propre lambda.
     - iter : Numéro de l'itération à laquelle la valeur propre est calculée.
+    - err : Historique des erreurs sur la valeur propre de (A - mu I)^{-1}
+      (quatrième valeur, seulement si history est "list" ou "array").
     """
     n, m = A.shape
     if n != m:
@@ -31,6 +42,7 @@ def invshift(A, mu=0, tol=1e-6, nmax=10000, x0=None):
     lamb = np.dot(x0, pro)
     err = tol * abs(lamb) + 1
     iter = 0
+    hist = History(history, nmax + 1)
     while (err > tol * abs(lamb)) and (abs(lamb) != 0) and (iter <= nmax):
         x = pro/np.linalg.norm(pro)
         z = solve_triangular(L, P.T @ x, lower=True)
@@ -40,5 +52,10 @@ def invshift(A, mu=0, tol=1e-6, nmax=10000, x0=None):
         lamb = lamb_new
 
         iter += 1
+        hist.append(err)
+        if callback is not None and callback(iter, x, 1 / lamb + mu, err):
+            break
     lamb = 1 / lamb + mu
+    if history != "none":
+        return lamb, x, iter, hist.result()
     return lamb, x, iter
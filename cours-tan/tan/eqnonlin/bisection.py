@@ -1,4 +1,7 @@
-def bisection(fun, a, b, tol, nmax, *args):
+from tan.history import History
+
+
+def bisection(fun, a, b, tol, nmax, *args, history="list", callback=None):
     """
     BISECTION Find function zeros.
     ZERO=BISECTION(FUN,A,B,TOL,NMAX) tries to find a zero ZERO of the continuous 
@@ -11,46 +14,57 @@ def bisection(fun, a, b, tol, nmax, *args):
     and the iteration number at which ZERO was computed.
     [ZERO,RES,NITER,INC]= BISECTION(FUN,...) returns a vector INC with the absolute value of the
     differences between successive approximations (increments).
+    BISECTION(FUN,...,HISTORY=H) stores the increments in a list (H="list", default),
+    a preallocated NumPy array (H="array") or not at all (H="none", INC is None);
+    see tan.history.History.
+    BISECTION(FUN,...,CALLBACK=CB) calls CB(NITER,X,INC) after each iteration with the
+    current approximation X and its increment; the iterations stop if CB returns True.
     """
     x = [a, (a+b)/2.0, b]
-    inc = [x[1]]
+    inc = History(history, nmax + 1)
     fx = [fun(x[0], *args), fun(x[1], *args), fun(x[2], *args)]
 
     if fx[0] * fx[2] > 0:
         raise ValueError(
             'The sign of FUN at the extrema of the interval must be different')
     elif fx[0] == 0:
-        return a, 0, 0, inc
+        inc.append(x[1])
+        return a, 0, 0, inc.result()
     elif fx[2] == 0:
-        return b, 0, 0, inc
+        inc.append(x[1])
+        return b, 0, 0, inc.result()
 
     niter = 0
     I = (b - a) / 2.0
+    # the increment of the last iteration is not reported, so each value is
+    # only stored once the next iteration starts
+    last = x[1]
     while I >= tol and niter < nmax:
         niter += 1
+        inc.append(last)
         if fx[0] * fx[1] < 0:
             x[2] = x[1]
             x[1] = x[0] + (x[2] - x[0]) / 2.0
-            inc.append(abs(x[2] - x[1]))
+            last = abs(x[2] - x[1])
         elif fx[1] * fx[2] < 0:
             x[0] = x[1]
             x[1] = x[0] + (x[2] - x[0]) / 2.0
-            inc.append(abs(x[0] - x[1]))
+            last = abs(x[0] - x[1])
         else:
             x[1] = x[fx.index(0)]
             I = 0
-            inc.append(0)
+            last = 0
 
         fx = [fun(x[0], *args), fun(x[1], *args), fun(x[2], *args)]
         I = (x[2] - x[0]) / 2.0
-        
+        if callback is not None and callback(niter, x[1], last):
+            break
 
-    inc.pop()
     if niter >= nmax:
         print('Bisection stopped without converging to the desired tolerance because the maximum number of iterations was reached')
 
     zero = x[1]
     res = fun(x[1], *args)
-    return zero, res, niter, inc
+    return zero, res, niter, inc.result()
 
 
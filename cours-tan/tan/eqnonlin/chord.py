@@ -1,4 +1,7 @@
-def chord(fun, a, b, x0, tol, nmax, *args):
+from tan.history import History
+
+
+def chord(fun, a, b, x0, tol, nmax, *args, history="list", callback=None):
     """
     CHORD Chord method.
     ZERO=CHORD(FUN,A,B,X0,TOL,NMAX) tries to find the zero ZERO of the 
@@ -9,6 +12,12 @@ def chord(fun, a, b, x0, tol, nmax, *args):
     
     [ZERO,RES,NITER]= CHORD(FUN,...) returns the value of the residual in ZERO
     and the iteration number at which ZERO was computed.
+    
+    CHORD(FUN,...,HISTORY=H) stores the increments in a list (H="list", default),
+    a preallocated NumPy array (H="array") or not at all (H="none", INC is None);
+    see tan.history.History.
+    CHORD(FUN,...,CALLBACK=CB) calls CB(NITER,X,INC) after each iteration with the
+    current approximation X and its increment; the iterations stop if CB returns True.
     """
     x = a
     fa = fun(x, *args)
@@ -19,7 +28,8 @@ def chord(fun, a, b, x0, tol, nmax, *args):
     niter = 0
     x = x0
     fx = fun(x, *args)
-    inc=[x0]
+    inc = History(history, nmax + 1)
+    inc.append(x0)
     while niter < nmax and err > tol:
         niter += 1
         xn = x - fx / r
@@ -27,6 +37,8 @@ def chord(fun, a, b, x0, tol, nmax, *args):
         inc.append(err)
         x = xn
         fx = fun(x, *args)
+        if callback is not None and callback(niter, x, err):
+            break
         
     if niter >= nmax:
         print('Chord method stopped without converging to the desired tolerance',
@@ -35,4 +47,4 @@ def chord(fun, a, b, x0, tol, nmax, *args):
     zero = x
     res = fx
     
-    return zero, res, niter,inc
+    return zero, res, niter, inc.result()
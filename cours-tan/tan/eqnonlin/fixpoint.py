@@ -1,4 +1,7 @@
-def fixpoint(phi, x0, tol, nmax, *args):
+from tan.history import History
+
+
+def fixpoint(phi, x0, tol, nmax, *args, history="list", callback=None):
     """
     FIXPOINT Fixed point iterations.
     P=FIXPOINT(PHI,X0,TOL,NMAX) tries to find the fixed point P of the 
@@ -11,12 +14,19 @@ def fixpoint(phi, x0, tol, nmax, *args):
     
     [P,RES,NITER,INC]= FIXPOINT(PHI,...) returns a list INC with the absolute values of the
     differences between successive approximations (increments).
+    
+    FIXPOINT(FUN,...,HISTORY=H) stores the increments in a list (H="list", default),
+    a preallocated NumPy array (H="array") or not at all (H="none", INC is None);
+    see tan.history.History.
+    FIXPOINT(FUN,...,CALLBACK=CB) calls CB(NITER,X,INC) after each iteration with the
+    current approximation X and its increment; the iterations stop if CB returns True.
     """
     x = x0
     phix = phi(x, *args)
     niter = 0
     diff = tol + 1
-    inc = [x0]
+    inc = History(history, nmax + 1)
+    inc.append(x0)
     
     while diff >= tol and niter < nmax:
         niter += 1
@@ -24,6 +34,8 @@ def fixpoint(phi, x0, tol, nmax, *args):
         x = phix
         phix = phi(x, *args)
         inc.append(diff)
+        if callback is not None and callback(niter, x, diff):
+            break
         
     if niter >= nmax:
         print('fixpoint stopped without converging to the desired tolerance',
@@ -32,4 +44,4 @@ def fixpoint(phi, x0, tol, nmax, *args):
     p = x
     res = phix - x
     
-    return p, res, niter, inc
+    return p, res, niter, inc.result()
@@ -1,4 +1,7 @@
-def newton(f, df, x0, tol, nmax, *args):
+from tan.history import History
+
+
+def newton(f, df, x0, tol, nmax, *args, history="list", callback=None):
     """
     NEWTON Find function zeros.
     ZERO=NEWTON(FUN,DFUN,X0,TOL,NMAX) tries to find the zero ZERO of the 
@@ -12,12 +15,19 @@ def newton(f, df, x0, tol, nmax, *args):
     
     [ZERO,RES,NITER,INC]= NEWTON(FUN,...) returns a list INC with the absolute values of the
     differences between successive approximations (increments).
+    
+    NEWTON(FUN,...,HISTORY=H) stores the increments in a list (H="list", default),
+    a preallocated NumPy array (H="array") or not at all (H="none", INC is None);
+    see tan.history.History.
+    NEWTON(FUN,...,CALLBACK=CB) calls CB(NITER,X,INC) after each iteration with the
+    current approximation X and its increment; the iterations stop if CB returns True.
     """
     x = x0
     fx = f(x, *args)
     dfx = df(x, *args)
     niter = 0
-    inc = [x0]
+    inc = History(history, nmax + 1)
+    inc.append(x0)
     diff = tol + 1
     
     while diff >= tol and niter < nmax:
@@ -28,6 +38,8 @@ def newton(f, df, x0, tol, nmax, *args):
         fx = f(x, *args)
         dfx = df(x, *args)
         inc.append(diff)
+        if callback is not None and callback(niter, x, diff):
+            break
         
     if niter >= nmax:
         print('Newton method stopped without converging to the desired tolerance because the maximum number of iterations was reached')
@@ -35,6 +47,6 @@ def newton(f, df, x0, tol, nmax, *args):
     zero = x
     res = fx
     
-    return zero, res, niter, inc
+    return zero, res, niter, inc.result()
 
 
@@ -0,0 +1,61 @@
+import numpy as np
+
+
+class History:
+    """Historique de convergence d'une méthode itérative (incréments, résidus, ...).
+
+    Toutes les méthodes itératives de `tan` enregistrent une valeur par itération
+    avec `append` et retournent `result()`. Trois modes sont disponibles :
+
+    - "list" (par défaut) : une liste Python, comme historiquement ;
+    - "array" : un tableau NumPy préalloué pour `capacity` itérations (agrandi
+      si nécessaire), sans création d'objets Python à chaque itération ;
+    - "none" : rien n'est enregistré et `result()` retourne None.
+
+    Les valeurs peuvent être des scalaires ou des tableaux de même shape (par
+    exemple les incréments des k colonnes d'un système à plusieurs seconds
+    membres) ; en mode "array", le résultat est alors de shape (niter, k).
+
+    Paramètres
+    ----------
+    mode : str, optionnel
+        "list", "array" ou "none".
+    capacity : int, optionnel
+        Le nombre de valeurs attendu, typiquement maxiter + 1.
+    """
+
+    def __init__(self, mode="list", capacity=0):
+        if mode not in ("list", "array", "none"):
+            raise ValueError(f"Mode d'historique inconnu : {mode}")
+        self.mode = mode
+        if mode == "list":
+            self.data = []
+            self.append = self.data.append
+        elif mode == "array":
+            self.data = None
+            self.capacity = max(int(capacity), 1)
+            self.n = 0
+        else:
+            self.data = None
+            self.append = _ignore
+
+    def append(self, value):
+        """Enregistre la valeur de l'itération courante."""
+        if self.data is None:
+            self.data = np.empty((self.capacity,) + np.shape(value))
+        elif self.n == len(self.data):
+            self.data = np.concatenate([self.data, np.empty_like(self.data)])
+        self.data[self.n] = value
+        self.n += 1
+
+    def result(self):
+        """Retourne l'historique : une liste, un tableau ou None selon le mode."""
+        if self.mode == "array":
+            if self.data is None:
+                return np.empty(0)
+            return self.data[:self.n]
+        return self.data
+
+
+def _ignore(value):
+    pass
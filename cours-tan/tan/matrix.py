@@ -1,27 +1,39 @@
 import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
 
-def matrix(n, epsi):
+def matrix(n, epsi, format="dense"):
     """
     Generate a matrix A and vector b based on given parameters.
-    
+
     Parameters:
     -----------
     n : int
         The size of the square matrix A.
     epsi : float
         A parameter that influences off-diagonal values in matrix A.
-        
+    format : str, optional
+        The storage of A:
+        - "dense" (default): a n x n ndarray,
+        - "dia" or "csr": a scipy.sparse matrix with the 5 diagonals,
+        - "banded": the (5, n) LAPACK banded storage with 2 sub- and 2
+          super-diagonals, ab[2 + i - j, j] = A[i, j], as expected by
+          `tan.syslin.banded` and `scipy.linalg.solve_banded((2, 2), ab, b)`,
+        - "operator": a matrix-free LinearOperator (with a `diagonal()` method).
+        Only the dense format needs O(n^2) memory.
+
     Returns:
     --------
-    A : ndarray
+    A : ndarray, sparse matrix or LinearOperator
         A n x n matrix defined as:
-        A = diag(ones(n)) + 
-            epsi * (diag(ones(n-1), -1) + diag(ones(n-1), 1)) + 
+        A = diag(ones(n)) +
+            epsi * (diag(ones(n-1), -1) + diag(ones(n-1), 1)) +
             epsi**2 * (diag(ones(n-2), -2) + diag(ones(n-2), 2))
     b : ndarray
         A vector defined as:
         b = A @ ones(n)
-    
+        computed in O(n) by summing the bands of each row.
+
     Example:
     --------
     >>> A, b = matrix(5, 0.1)
@@ -30,11 +42,89 @@ def matrix(n, epsi):
     >>> print(b)
     ...
     """
-    
-    A = np.diag(np.ones(n)) + \
-        epsi * (np.diag(np.ones(n-1), -1) + np.diag(np.ones(n-1), 1)) + \
-        epsi**2 * (np.diag(np.ones(n-2), -2) + np.diag(np.ones(n-2), 2))
-    
-    b = A @ np.ones(n)
-    
+
+    i = np.arange(n)
+    b = 1 + epsi * ((i > 0).astype(float) + (i < n-1)) + \
+        epsi**2 * ((i > 1).astype(float) + (i < n-2))
+
+    if format == "dense":
+        A = np.diag(np.ones(n)) + \
+            epsi * (np.diag(np.ones(n-1), -1) + np.diag(np.ones(n-1), 1)) + \
+            epsi**2 * (np.diag(np.ones(n-2), -2) + np.diag(np.ones(n-2), 2))
+    elif format in ("dia", "csr"):
+        A = sp.diags([epsi**2, epsi, 1.0, epsi, epsi**2], [-2, -1, 0, 1, 2],
+                     shape=(n, n), format=format)
+    elif format == "banded":
+        A = np.empty((5, n))
+        A[0] = A[4] = epsi**2
+        A[1] = A[3] = epsi
+        A[2] = 1.0
+        # entries falling outside of the matrix are set to zero
+        A[0, :2] = A[1, :1] = 0
+        A[3, n-1:] = A[4, n-2:] = 0
+    elif format == "operator":
+        A = _PentadiagonalOperator(n, epsi)
+    else:
+        raise ValueError(f"Unknown format: {format}")
+
     return A, b
+
+
+class _PentadiagonalOperator(spla.LinearOperator):
+    """Matrix-free action of the pentadiagonal matrix built by `matrix`."""
+
+    def __init__(self, n, epsi):
+        super().__init__(dtype=float, shape=(n, n))
+        self.epsi = epsi
+
+    def _matvec(self, x):
+        return self._matmat(x)
+
+    def _matmat(self, x):
+        e = self.epsi
+        y = np.array(x, dtype=float)
+        y[1:] += e * x[:-1]
+        y[:-1] += e * x[1:]
+        y[2:] += e**2 * x[:-2]
+        y[:-2] += e**2 * x[2:]
+        return y
+
+    def _adjoint(self):
+        return self
+
+    def diagonal(self):
+        return np.ones(self.shape[0])
+
+
+def laplacian(shape, format="csr"):
+    """
+    Generate the finite-difference Laplacian on a 1D or 2D structured grid.
+
+    Parameters:
+    -----------
+    shape : int or tuple of int
+        The number of interior grid points, (n,) or n in 1D and (nx, ny) in 2D.
+    format : str, optional
+        The sparse format of the matrix ("csr" by default).
+
+    Returns:
+    --------
+    A : sparse matrix
+        The matrix of -u'' (3-point stencil) or -Laplace(u) (5-point stencil)
+        with homogeneous Dirichlet conditions, scaled by h^2: 2 (resp. 4) on
+        the diagonal and -1 for each neighbour. In 2D, the unknowns are
+        numbered row by row, u[i, j] being unknown i * ny + j.
+
+    Example:
+    --------
+    >>> A = laplacian((3, 3))
+    >>> A.shape
+    (9, 9)
+    """
+    shape = (shape,) if np.isscalar(shape) else tuple(shape)
+    T = [sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m)) for m in shape]
+    if len(T) == 1:
+        return T[0].asformat(format)
+    if len(T) == 2:
+        return sp.kronsum(T[1], T[0], format=format)
+    raise ValueError("Only 1D and 2D grids are supported")
@@ -0,0 +1,9 @@
+__all__ = ["SolveResult", "diagnose", "solve"]
+
+
+def __getattr__(name):
+    # import différé : `import tan.syslin.pcg` ne charge pas tous les solveurs de tan.syslin.auto
+    if name in __all__:
+        from tan.syslin import auto
+        return getattr(auto, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,280 @@
+import time
+
+import numpy as np
+from tan.eig.gershgorin import gershgorin_discs
+from tan.syslin import direct
+from tan.syslin.banded import _bands, solve_banded
+from tan.syslin.bicgstab import bicgstab
+from tan.syslin.gauss_seidel import gauss_seidel2
+from tan.syslin.gmres import gmres
+from tan.syslin.gradient import chebyshev
+from tan.syslin.jacobi import jacobi2
+from tan.syslin.mixed import mixed_solve
+from tan.syslin.pcg import pcg
+from tan.syslin.precond import Jacobi
+from tan.syslin.sor import sor2
+from tan.syslin.utils import is_operator, is_sparse, size
+
+METHODS = ("auto", "direct", "mixed", "banded", "pcg", "gmres", "bicgstab", "chebyshev", "jacobi",
+           "gauss_seidel", "sor")
+
+
+class SolveResult:
+    """Résultat de `solve`.
+
+    Attributs
+    ---------
+    x : ndarray
+        La solution.
+    niter : int
+        Le nombre d'itérations (0 pour une méthode directe).
+    history : ndarray ou None
+        L'historique des normes résiduelles relatives (ou des incréments pour
+        les méthodes stationnaires), None pour une méthode directe.
+    method : str
+        La méthode effectivement utilisée.
+    time : float
+        Le temps total en secondes, diagnostic compris.
+    residual : float
+        La norme résiduelle relative finale ||b - Ax|| / ||b||.
+    diagnostics : dict
+        Les diagnostics de A (voir `diagnose`) et la raison du choix.
+    converged : bool
+        True pour la méthode directe, sinon True si residual <= max(tol, 1e-12).
+    """
+
+    __slots__ = ("x", "niter", "history", "method", "time", "residual", "diagnostics",
+                 "converged")
+
+    def __init__(self, x, niter, history, method, time, residual, diagnostics, converged=True):
+        self.x = x
+        self.niter = niter
+        self.history = history
+        self.method = method
+        self.time = time
+        self.residual = residual
+        self.diagnostics = diagnostics
+        self.converged = converged
+
+    def __repr__(self):
+        return (f"SolveResult(method={self.method!r}, niter={self.niter}, "
+                f"residual={self.residual:.2e}, converged={self.converged}, "
+                f"time={self.time:.3g}s)")
+
+
+def diagnose(A):
+    """Calcule des diagnostics peu coûteux de la matrice A, en O(nnz).
+
+    Paramètres
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+
+    Retourne
+    --------
+    d : dict
+        - "n", "sparse", "operator", "nnz", "density" ;
+        - "symmetric" : A = A^T (testé par deux produits avec des vecteurs
+          aléatoires pour un LinearOperator) ;
+        - "positive_diagonal", "diagonally_dominant" (strictement, par lignes) ;
+        - "bandwidth" : (l, u) le nombre de sous- et sur-diagonales ;
+        - "gershgorin" : (lmin, lmax) l'encadrement du spectre (si A est symétrique) ;
+        - "spd" : True si A est symétrique et lmin > 0 (certifié), None si A
+          est symétrique à diagonale positive (probable), False sinon ;
+        - "condition" : lmax / lmin, majorant du conditionnement si "spd" est True ;
+        - "time" : le temps du diagnostic.
+        Les entrées inaccessibles pour un LinearOperator valent None.
+    """
+    t0 = time.perf_counter()
+    n = size(A)
+    d = dict(n=n, sparse=is_sparse(A), operator=is_operator(A), nnz=None, density=None,
+             symmetric=None, positive_diagonal=None, diagonally_dominant=None,
+             bandwidth=None, gershgorin=None, spd=None, condition=None)
+    if d["operator"]:
+        rng = np.random.default_rng(0)
+        u, v = rng.standard_normal(n), rng.standard_normal(n)
+        Av = A @ v
+        d["symmetric"] = bool(abs(np.dot(u, Av) - np.dot(v, A @ u))
+                              <= 1e-10 * np.linalg.norm(u) * np.linalg.norm(Av))
+        if hasattr(A, "diagonal"):
+            d["positive_diagonal"] = bool(np.all(np.asarray(A.diagonal()) > 0))
+        if d["symmetric"] and d["positive_diagonal"]:
+            d["spd"] = None
+        else:
+            d["spd"] = False
+        d["time"] = time.perf_counter() - t0
+        return d
+    if d["sparse"]:
+        A = A.tocsr()
+        d["nnz"] = A.nnz
+        d["symmetric"] = bool(abs(A - A.T).max() <= 1e-12 * abs(A).max()) if A.nnz else True
+    else:
+        A = np.asarray(A)
+        d["nnz"] = int(np.count_nonzero(A))
+        d["symmetric"] = bool(np.allclose(A, A.T, rtol=1e-12, atol=0))
+    d["density"] = d["nnz"] / n**2
+    center, radiir, radiic = gershgorin_discs(A)
+    center = np.real(center)
+    d["positive_diagonal"] = bool(np.all(center > 0))
+    d["diagonally_dominant"] = bool(np.all(np.abs(center) > radiir))
+    d["bandwidth"] = _bands(A)
+    d["spd"] = False
+    if d["symmetric"]:
+        lmin = max(np.min(center - radiir), np.min(center - radiic))
+        lmax = min(np.max(center + radiir), np.max(center + radiic))
+        d["gershgorin"] = (float(lmin), float(lmax))
+        if lmin > 0:
+            d["spd"] = True
+            d["condition"] = float(lmax / lmin)
+        elif d["positive_diagonal"]:
+            d["spd"] = None
+    d["time"] = time.perf_counter() - t0
+    return d
+
+
+def solve(A, b, method="auto", x0=None, tol=1e-6, maxiter=None, **options):
+    """Résout le système linéaire Ax = b, en choisissant la méthode si besoin.
+
+    Avec method="auto", A est d'abord inspectée par `diagnose` (symétrie,
+    dominance diagonale, creux, largeur de bande, disques de Gershgorin), puis
+    on choisit la méthode applicable la moins coûteuse selon un modèle de coût
+    simple :
+
+    - LinearOperator : `pcg` (préconditionneur de Jacobi si la diagonale est
+      accessible) si A est symétrique à diagonale positive, `gmres` sinon ;
+    - petite matrice (n <= 200) : méthode directe ;
+    - A symétrique définie positive certifiée par Gershgorin : `pcg` si son
+      nombre d'itérations estimé, sqrt(kappa) ln(2/tol) / 2, coûte moins qu'une
+      factorisation (dense en n^3/3, bande en n l (l+u)) ;
+    - matrice creuse à bande étroite (l + u < 64) : factorisation bande ;
+    - matrice creuse symétrique à diagonale positive : `pcg` préconditionné
+      par Jacobi, avec repli sur la méthode directe s'il ne converge pas ;
+    - grande matrice dense (n >= 1000) : factorisation en simple précision et
+      raffinement itératif en double (`tan.syslin.mixed`), avec repli
+      automatique en double précision si A est trop mal conditionnée ;
+    - sinon : méthode directe (LU dense ou SuperLU, avec cache des
+      factorisations, voir `tan.syslin.direct`).
+
+    Le repli sur la méthode directe n'a lieu que si la méthode a été choisie
+    automatiquement : une méthode demandée explicitement n'est jamais
+    remplacée, et si elle ne converge pas, le résultat l'indique par
+    `converged` = False.
+
+    Paramètres
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        La matrice du système.
+    b : ndarray, shape (n,)
+        Le second membre.
+    method : str, optionnel
+        "auto" (par défaut) ou l'une des méthodes "direct", "mixed", "banded", "pcg",
+        "gmres", "bicgstab", "chebyshev", "jacobi", "gauss_seidel", "sor".
+    x0 : ndarray, optionnel
+        L'estimation initiale pour les méthodes itératives.
+    tol : float, optionnel
+        La tolérance des méthodes itératives.
+    maxiter : int, optionnel
+        Le nombre maximum d'itérations (max(100, 2n) par défaut).
+    **options
+        Options transmises au solveur choisi (par exemple P, restart, omega).
+
+    Retourne
+    --------
+    result : SolveResult
+        La solution, le nombre d'itérations, l'historique, la méthode
+        utilisée, le temps, les diagnostics et l'indicateur de convergence.
+    """
+    t0 = time.perf_counter()
+    if method not in METHODS:
+        raise ValueError(f"Méthode inconnue : {method}")
+    b = np.asarray(b, dtype=float)
+    n = size(A)
+    if maxiter is None:
+        maxiter = max(100, 2 * n)
+    diag = diagnose(A)
+    chosen = method == "auto"
+    if chosen:
+        method, reason = _choose(diag, tol)
+        diag["reason"] = reason
+    x, niter, history = _run(method, A, b, x0, tol, maxiter, diag, options)
+    residual = _residual(A, b, x)
+    converged = _converged(method, residual, tol)
+    if chosen and not converged and method != "mixed" and not diag["operator"]:
+        diag["reason"] += f" ; {method} n'a pas convergé ({residual:.1e}), repli sur direct"
+        method = "direct"
+        x, niter, history = _run(method, A, b, x0, tol, maxiter, diag, {})
+        residual = _residual(A, b, x)
+        converged = True
+    return SolveResult(x, niter, history, method, time.perf_counter() - t0, residual, diag,
+                       converged)
+
+
+def _choose(d, tol):
+    """Choisit la méthode la moins coûteuse d'après les diagnostics ; retourne (méthode, raison)."""
+    n = d["n"]
+    if d["operator"]:
+        if d["symmetric"] and d["positive_diagonal"] is not False:
+            return "pcg", "opérateur symétrique"
+        return "gmres", "opérateur non symétrique"
+    if n <= 200:
+        return "direct", "petit système"
+    l, u = d["bandwidth"]
+    banded = d["sparse"] and l + u < 64
+    if d["sparse"]:
+        direct_cost = n * l * (l + u + 1) if banded else None
+    else:
+        direct_cost = n**3 / 3 if d["spd"] else 2 * n**3 / 3
+    if d["spd"]:
+        k = 0.5 * np.sqrt(d["condition"]) * np.log(2 / tol)
+        cg_cost = k * 2 * d["nnz"]
+        if direct_cost is None or cg_cost < direct_cost:
+            return "pcg", f"SPD (Gershgorin), kappa <= {d['condition']:.3g}, ~{k:.0f} itérations"
+    if banded:
+        return "banded", f"bande étroite (l={l}, u={u})"
+    if d["sparse"] and d["spd"] is None:
+        return "pcg", "creuse symétrique à diagonale positive"
+    if not d["sparse"] and n >= 1000:
+        return "mixed", "grande matrice dense, factorisation float32 et raffinement"
+    return "direct", "méthode directe"
+
+
+def _run(method, A, b, x0, tol, maxiter, d, options):
+    """Appelle le solveur `method` et retourne (x, niter, history)."""
+    spd = bool(d["spd"])
+    if method == "direct":
+        if d["spd"] is None:
+            # symétrique à diagonale positive : on tente Cholesky avant LU
+            try:
+                return direct.solve(A, b, spd=True), 0, None
+            except np.linalg.LinAlgError:
+                pass
+        return direct.solve(A, b, spd=spd), 0, None
+    if method == "mixed":
+        x, niter, history, d["precision"] = mixed_solve(A, b, spd=spd, history="array",
+                                                        **options)
+        return x, niter, history
+    if method == "banded":
+        l, u = d["bandwidth"]
+        return solve_banded(A, b, l, u, spd=spd), 0, None
+    if x0 is None:
+        x0 = np.zeros(d["n"])
+    kw = dict(tol=tol, maxiter=maxiter, history="array")
+    if method in ("pcg", "gmres", "bicgstab", "chebyshev"):
+        if "P" not in options and d["positive_diagonal"]:
+            options = dict(options, P=Jacobi(A))
+        solver = dict(pcg=pcg, gmres=gmres, bicgstab=bicgstab, chebyshev=chebyshev)[method]
+        out = solver(A, b, x0=x0, **kw, **options)
+    else:
+        solver = dict(jacobi=jacobi2, gauss_seidel=gauss_seidel2, sor=sor2)[method]
+        out = solver(A, b, x0, **kw, **options)
+    return out[0], out[1], out[-1]
+
+
+def _converged(method, residual, tol):
+    """Indique si la résolution a convergé : toujours vrai pour la méthode directe."""
+    return method == "direct" or residual <= max(tol, 1e-12)
+
+
+def _residual(A, b, x):
+    nb = np.linalg.norm(b)
+    r = np.linalg.norm(b - A @ x)
+    return float(r / nb) if nb > 0 else float(r)
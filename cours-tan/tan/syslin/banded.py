@@ -0,0 +1,118 @@
+import numpy as np
+import scipy.linalg
+from scipy.linalg import lapack
+from tan.syslin.utils import is_operator, is_sparse
+
+
+def to_banded(A, l=None, u=None):
+    """Convertit A au stockage bande de LAPACK.
+
+    Le stockage bande d'une matrice à l sous-diagonales et u sur-diagonales est
+    le tableau ab de shape (l + u + 1, n) tel que ab[u + i - j, j] = A[i, j]. C'est
+    le format de `scipy.linalg.solve_banded` et de `tan.matrix.matrix(..., format="banded")`.
+
+    Paramètres
+    ----------
+    A : ndarray ou matrice creuse, shape (n, n)
+        La matrice. Une matrice creuse est convertie en O(nnz) sans être densifiée.
+    l, u : int, optionnel
+        Le nombre de sous- et sur-diagonales. Par défaut, ils sont déduits de la
+        structure de A.
+
+    Retourne
+    --------
+    l, u : int
+        Le nombre de sous- et sur-diagonales.
+    ab : ndarray, shape (l + u + 1, n)
+        Le stockage bande de A.
+    """
+    if is_operator(A):
+        raise TypeError("la structure d'un LinearOperator n'est pas accessible")
+    if l is None or u is None:
+        lA, uA = _bands(A)
+        l = lA if l is None else l
+        u = uA if u is None else u
+    n = A.shape[0]
+    ab = np.zeros((l + u + 1, n))
+    if is_sparse(A):
+        D = A.todia()
+        w = min(D.data.shape[1], n)
+        for k, o in enumerate(D.offsets):
+            if -l <= o <= u:
+                ab[u - o, :w] += D.data[k, :w]
+    else:
+        for o in range(-l, u + 1):
+            ab[u - o, max(0, o):n + min(0, o)] = np.diagonal(A, o)
+    return l, u, ab
+
+
+def banded_factor(A, l=None, u=None, spd=False):
+    """Factorise une matrice bande une seule fois et retourne la fonction de résolution.
+
+    La factorisation LU avec pivot partiel (LAPACK gbtrf) coûte O(n l (l + u)) et
+    la résolution O(n (2l + u)) par second membre ; la factorisation de Cholesky
+    (LAPACK pbtrf) d'une matrice symétrique définie positive n'utilise que la
+    partie supérieure et coûte O(n u^2). La mémoire reste O(n (l + u)).
+
+    Paramètres
+    ----------
+    A : ndarray ou matrice creuse
+        La matrice, soit carrée (dense ou creuse), soit déjà au stockage bande :
+        lorsque l et u sont donnés, un tableau dense non carré à l + u + 1
+        lignes est considéré comme un stockage bande. Un tableau carré est
+        toujours une matrice, même si n = l + u + 1.
+    l, u : int, optionnel
+        Le nombre de sous- et sur-diagonales.
+    spd : bool, optionnel
+        Si True, A est supposée symétrique définie positive et on utilise la
+        factorisation de Cholesky.
+
+    Retourne
+    --------
+    solve : callable
+        La fonction b -> A^{-1} b, pour b de shape (n,) ou (n, k).
+    """
+    if (l is not None and u is not None and not is_sparse(A)
+            and A.shape[0] == l + u + 1 and A.shape[0] != A.shape[1]):
+        ab = np.asarray(A, dtype=float)
+    else:
+        l, u, ab = to_banded(A, l, u)
+    if spd:
+        c = scipy.linalg.cholesky_banded(ab[:u + 1], lower=False)
+        return lambda b: scipy.linalg.cho_solve_banded((c, False), b)
+    abf = np.zeros((2 * l + u + 1, ab.shape[1]))
+    abf[l:] = ab
+    lub, piv, info = lapack.dgbtrf(abf, l, u, overwrite_ab=True)
+    if info > 0:
+        raise np.linalg.LinAlgError("Matrice singulière")
+
+    def solve(b):
+        x, info = lapack.dgbtrs(lub, l, u, np.asarray(b, dtype=float), piv)
+        return x
+
+    return solve
+
+
+def solve_banded(A, b, l=None, u=None, spd=False):
+    """Résout le système linéaire Ax = b pour une matrice bande.
+
+    Voir `banded_factor` pour la description des paramètres.
+
+    Retourne
+    --------
+    x : ndarray
+        La solution du système linéaire.
+    """
+    return banded_factor(A, l, u, spd)(b)
+
+
+def _bands(A):
+    """Nombre de sous- et sur-diagonales non nulles de A."""
+    if is_sparse(A):
+        C = A.tocoo()
+        i, j = C.row[C.data != 0], C.col[C.data != 0]
+    else:
+        i, j = np.nonzero(A)
+    if len(i) == 0:
+        return 0, 0
+    return int(max(0, np.max(i - j))), int(max(0, np.max(j - i)))
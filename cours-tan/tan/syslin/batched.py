@@ -0,0 +1,270 @@
+import numpy as np
+from tan.history import History
+
+
+def is_batched(A):
+    """Indique si A est une pile de matrices, de shape (batch, n, n)."""
+    return isinstance(A, np.ndarray) and A.ndim == 3
+
+
+def jacobi_batched(A, b, x0=None, tol=1e-6, maxiter=100, omega=1.0, history="list",
+                   callback=None):
+    """Résout simultanément les systèmes A[k] x = b[k] par la méthode de Jacobi.
+
+    Voir `iterate_batched` ; ici M^{-1} = omega D^{-1} est diagonale.
+    """
+    A, b = _check(A, b)
+    d = np.diagonal(A, axis1=1, axis2=2)
+    return iterate_batched(A, b, omega / d, x0, tol, maxiter, history, callback)
+
+
+def sor_batched(A, b, x0=None, omega=1.0, tol=1e-6, maxiter=100, history="list",
+                callback=None):
+    """Résout simultanément les systèmes A[k] x = b[k] par la méthode SOR (Gauss-Seidel si omega = 1).
+
+    M_k = D_k / omega_k + L_k est inversée une fois pour toutes les matrices
+    (np.linalg.inv sur la pile, O(batch n^3)) : pour de petites matrices, un
+    produit par M_k^{-1} dense est bien moins coûteux qu'une boucle de
+    descentes triangulaires. Avec omega="auto", omega_k est calculé pour
+    chaque système à partir d'une estimation du rayon spectral de la matrice
+    de Jacobi par 20 itérations de la puissance menées sur toute la pile.
+    Cette valeur n'est optimale que pour des matrices bien ordonnées
+    (« consistently ordered ») : comme pour `sor2`, omega_k = 1 est retenu
+    pour les systèmes où SOR ne contracte pas plus vite que Gauss-Seidel
+    (10 itérations de la puissance sur chaque matrice d'itération).
+    """
+    A, b = _check(A, b)
+    d = np.diagonal(A, axis1=1, axis2=2)
+    if not (isinstance(omega, str) and omega == "auto"):
+        omega = np.broadcast_to(np.asarray(omega, dtype=float), (A.shape[0],))
+        return iterate_batched(A, b, _sor_inverse(A, d, omega), x0, tol, maxiter, history,
+                               callback)
+    rho, v = _jacobi_spectral_radius(A, d)
+    omega = np.where(rho < 1, 2 / (1 + np.sqrt(np.maximum(1 - rho**2, 0))), 1.0)
+    Minv = _sor_inverse(A, d, omega)
+    Minv_gs = _sor_inverse(A, d, np.ones(A.shape[0]))
+    slower = _contraction(A, Minv, v) >= _contraction(A, Minv_gs, v)
+    Minv[slower] = Minv_gs[slower]
+    return iterate_batched(A, b, Minv, x0, tol, maxiter, history, callback)
+
+
+def _sor_inverse(A, d, omega):
+    """Les inverses des M_k = D_k / omega_k + L_k."""
+    M = np.tril(A, -1)
+    i = np.arange(A.shape[1])
+    M[:, i, i] = d / omega[:, None]
+    return np.linalg.inv(M)
+
+
+def _contraction(A, Minv, v, maxiter=10):
+    """Estime le rayon spectral de I - M_k^{-1} A_k pour chaque matrice par la puissance à partir de v."""
+    v = v / np.linalg.norm(v, axis=1)[:, None]
+    logs = np.zeros((maxiter, len(v)))
+    for k in range(maxiter):
+        y = v - np.einsum("kij,kj->ki", Minv, np.einsum("kij,kj->ki", A, v))
+        ny = np.linalg.norm(y, axis=1)
+        logs[k] = np.log(np.where(ny > 0, ny, 1e-300))
+        v = y / np.where(ny > 0, ny, 1)[:, None]
+    return np.exp(logs[maxiter // 2:].mean(axis=0))
+
+
+def iterate_batched(A, b, Minv, x0=None, tol=1e-6, maxiter=100, history="list", callback=None):
+    """Itère x_new = x + M^{-1}(b - Ax) simultanément sur une pile de systèmes.
+
+    Tous les systèmes actifs sont traités ensemble par des produits
+    `np.einsum` sur la pile, sans boucle Python sur les systèmes. Un système
+    est retiré de la pile dès que son incrément passe sous `tol` et conserve
+    alors son dernier itéré, comme `iterate_columns` pour plusieurs seconds
+    membres ; la pile n'est recopiée que lorsque des systèmes convergent.
+
+    Paramètres
+    ----------
+    A : ndarray, shape (batch, n, n)
+        Les matrices.
+    b : ndarray, shape (batch, n)
+        Les seconds membres.
+    Minv : ndarray, shape (batch, n) ou (batch, n, n)
+        Les inverses M_k^{-1}, diagonales (shape (batch, n)) ou pleines.
+    x0 : ndarray, shape (batch, n), optionnel
+        Les estimations initiales (nulles par défaut).
+    tol : float, optionnel
+        La tolérance sur l'incrément de chaque système.
+    maxiter : int, optionnel
+        Le nombre maximum d'itérations.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage de l'historique `inc` (voir `tan.history.History`).
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc) avec la pile
+        (batch, n) des itérés et le tableau (batch,) des incréments ; si elle
+        retourne True, les itérations s'arrêtent.
+
+    Retourne
+    --------
+    x : ndarray, shape (batch, n)
+        Les solutions.
+    niter : ndarray, shape (batch,)
+        Le nombre d'itérations effectuées pour chaque système.
+    inc : list, ndarray ou None
+        Pour chaque itération, le tableau (batch,) des incréments (nan pour les
+        systèmes déjà convergés) ; un tableau (niter, batch) en mode "array".
+    """
+    A, b = _check(A, b)
+    nb = A.shape[0]
+    x = np.zeros(b.shape) if x0 is None else np.array(np.broadcast_to(x0, b.shape), dtype=float)
+    active = np.arange(nb)
+    Aa, ba, Ma, xa = A, b, Minv, x.copy()
+    niter = np.zeros(nb, dtype=int)
+    inc = History(history, maxiter)
+    it = 0
+    while active.size > 0:
+        it += 1
+        r = ba - np.einsum("kij,kj->ki", Aa, xa)
+        dx = Ma * r if Ma.ndim == 2 else np.einsum("kij,kj->ki", Ma, r)
+        e = np.linalg.norm(dx, axis=1)
+        row = np.full(nb, np.nan)
+        row[active] = e
+        inc.append(row)
+        niter[active] = it
+        if callback is not None:
+            xc = x.copy()
+            xc[active] = xa + dx
+            if callback(it, xc, row):
+                break
+        if it == maxiter:
+            break
+        keep = e >= tol
+        xa += dx
+        x[active[keep]] = xa[keep]
+        if not keep.all():
+            active = active[keep]
+            Aa, ba, Ma, xa = Aa[keep], ba[keep], Ma[keep], xa[keep]
+    return x, niter, inc.result()
+
+
+def pcg_batched(A, b, P=None, x0=None, tol=1e-6, maxiter=100, atol=0.0, history="list",
+                callback=None):
+    """Résout simultanément les systèmes A[k] x = b[k] par le gradient conjugué préconditionné.
+
+    Les itérations de tous les systèmes actifs sont menées ensemble : un produit
+    `np.einsum` sur la pile et des produits scalaires par ligne (axis=1) ;
+    chaque système a ses propres pas alpha_k et beta_k. Un système est retiré
+    de la pile dès qu'il satisfait le critère d'arrêt de `pcg`.
+
+    Paramètres
+    ----------
+    A : ndarray, shape (batch, n, n)
+        Les matrices, symétriques définies positives.
+    b : ndarray, shape (batch, n)
+        Les seconds membres.
+    P : ndarray, optionnel
+        Le préconditionneur : None (identité), "jacobi" (diagonales des A[k]),
+        un tableau (batch, n) des diagonales des P_k, ou une pile (batch, n, n)
+        de matrices P_k, inversées une seule fois.
+    x0 : ndarray, shape (batch, n), optionnel
+        Les estimations initiales (nulles par défaut).
+    tol, maxiter, atol :
+        Voir `pcg`, pour chaque système.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage des historiques `inc` et `res` (voir `tan.history.History`).
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc, res) avec la
+        pile des itérés et les tableaux (batch,) des incréments et des normes
+        résiduelles relatives ; si elle retourne True, les itérations s'arrêtent.
+
+    Retourne
+    --------
+    x : ndarray, shape (batch, n)
+        Les solutions.
+    niter : ndarray, shape (batch,)
+        Le nombre d'itérations effectuées pour chaque système.
+    inc, res : list, ndarray ou None
+        Pour chaque itération, les tableaux (batch,) des incréments et des
+        normes résiduelles relatives (nan pour les systèmes déjà convergés).
+    """
+    A, b = _check(A, b)
+    nb = A.shape[0]
+    if P is None:
+        Minv = None
+    elif isinstance(P, str) and P == "jacobi":
+        Minv = 1 / np.diagonal(A, axis1=1, axis2=2)
+    elif np.ndim(P) == 2:
+        Minv = 1 / np.asarray(P, dtype=float)
+    else:
+        Minv = np.linalg.inv(np.asarray(P, dtype=float))
+    x = np.zeros(b.shape) if x0 is None else np.array(np.broadcast_to(x0, b.shape), dtype=float)
+    r = b - np.einsum("kij,kj->ki", A, x)
+    nr0 = np.linalg.norm(r, axis=1)
+    res = History(history, maxiter + 1)
+    res.append(np.ones(nb))
+    inc = History(history, maxiter)
+    niter = np.zeros(nb, dtype=int)
+    active = np.flatnonzero(nr0 > 0)
+    Aa, Ma, xa, ra, nra = A[active], _take(Minv, active), x[active], r[active], nr0[active]
+    z = _apply(Ma, ra)
+    p = z.copy()
+    rz = np.sum(ra * z, axis=1)
+    it = 0
+    while active.size > 0 and it < maxiter:
+        it += 1
+        q = np.einsum("kij,kj->ki", Aa, p)
+        alpha = rz / np.sum(p * q, axis=1)
+        xa += alpha[:, None] * p
+        ra -= alpha[:, None] * q
+        rn = np.linalg.norm(ra, axis=1) / nra
+        e = np.abs(alpha) * np.linalg.norm(p, axis=1)
+        rows = np.full((2, nb), np.nan)
+        rows[0, active] = e
+        rows[1, active] = rn
+        inc.append(rows[0])
+        res.append(rows[1])
+        niter[active] = it
+        x[active] = xa
+        if callback is not None and callback(it, x.copy(), rows[0], rows[1]):
+            break
+        z = _apply(Ma, ra)
+        rz_new = np.sum(ra * z, axis=1)
+        keep = ~((rn < tol) | (rn * nra <= atol) | (e < tol) | (rz_new == 0))
+        if not keep.all():
+            active = active[keep]
+            Aa, Ma, xa, ra, nra = Aa[keep], _take(Ma, keep), xa[keep], ra[keep], nra[keep]
+            z, p, rz, rz_new = z[keep], p[keep], rz[keep], rz_new[keep]
+        p *= (rz_new / rz)[:, None]
+        p += z
+        rz = rz_new
+    return x, niter, inc.result(), res.result()
+
+
+def _check(A, b):
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    if A.ndim != 3 or A.shape[1] != A.shape[2] or b.shape != A.shape[:2]:
+        raise ValueError(f"Shapes incompatibles : A {A.shape} (batch, n, n) et b {b.shape} (batch, n)")
+    return A, b
+
+
+def _apply(Minv, r):
+    if Minv is None:
+        return r.copy()
+    if Minv.ndim == 2:
+        return Minv * r
+    return np.einsum("kij,kj->ki", Minv, r)
+
+
+def _take(Minv, idx):
+    return None if Minv is None else Minv[idx]
+
+
+def _jacobi_spectral_radius(A, d, maxiter=20):
+    """Estime le rayon spectral de I - D_k^{-1} A_k pour chaque matrice (voir `jacobi_spectral_radius`).
+
+    Retourne aussi les derniers itérés de la puissance.
+    """
+    w = np.abs(d)
+    v = np.random.default_rng(0).random(d.shape)
+    v /= np.sqrt(np.sum(w * v * v, axis=1))[:, None]
+    rho = np.zeros(len(d))
+    for _ in range(maxiter):
+        y = v - np.einsum("kij,kj->ki", A, v) / d
+        rho = np.sqrt(np.sum(w * y * y, axis=1))
+        v = y / np.where(rho > 0, rho, 1)[:, None]
+    return rho, v
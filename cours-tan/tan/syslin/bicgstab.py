@@ -0,0 +1,130 @@
+import numpy as np
+from tan.history import History
+from tan.syslin.precond import aspreconditioner
+from tan.syslin.utils import size
+
+def bicgstab(A, b, P=None, x0=None, tol=1e-6, maxiter=100, atol=0.0, history="list",
+             callback=None):
+    """
+    Calcule la solution du système linéaire Ax = b par la méthode BiCGStab.
+
+    Paramètres :
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        Matrice des coefficients, quelconque (non symétrique). Seuls des produits
+        A @ v sont utilisés.
+
+    b : ndarray, shape (n,)
+        Vecteur de droite.
+
+    P : Preconditioner, ndarray, matrice creuse ou LinearOperator, optionnel
+        Préconditionneur (voir `tan.syslin.precond`), appliqué à droite. Par
+        défaut, il s'agit de l'identité.
+
+    x0 : ndarray, shape (n,), optionnel
+        Estimation initiale de la solution. Par défaut, il s'agit d'un vecteur nul.
+
+    tol : float, optionnel
+        Tolérance sur la norme résiduelle relative ||r|| / ||r0||. La valeur par défaut est 1e-6.
+
+    maxiter : int, optionnel
+        Nombre maximal d'itérations pour le solveur. La valeur par défaut est 100.
+
+    atol : float, optionnel
+        Tolérance absolue sur la norme résiduelle ||r||. La valeur par défaut est 0.
+
+    history : {"list", "array", "none"}, optionnel
+        Le stockage des historiques `inc` et `res` (voir `tan.history.History`).
+
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc, res) ; si elle
+        retourne True, les itérations s'arrêtent.
+
+    Retourne :
+    -------
+    x : ndarray, shape (n,)
+        Solution approximative de Ax = b.
+
+    niter : int
+        Nombre d'itérations effectuées.
+
+    inc : liste
+        L'incrément à chaque itération.
+
+    res : list
+        La norme résiduelle relative à chaque itération.
+
+    Notes :
+    -----
+    Chaque itération effectue deux produits matrice-vecteur, deux applications
+    du préconditionneur et quatre produits scalaires, soit O(nnz) ; la mémoire
+    est de quelques vecteurs de taille n, contrairement à GMRES. Une
+    annulation de (r^, r) ou de omega (rupture de la méthode) lève une
+    ValueError ; on peut alors relancer à partir de l'itéré courant ou utiliser
+    `gmres`. Le résidu est mis à jour par récurrence ; lorsqu'il passe sous la
+    tolérance, le vrai résidu b - Ax est recalculé et la méthode redémarre à
+    partir de celui-ci s'il est encore trop grand.
+    """
+    n = size(A)
+    P = aspreconditioner(P)
+    b = np.asarray(b, dtype=float)
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float)
+    r = b - A @ x
+    nr0 = np.linalg.norm(r)
+    res = History(history, maxiter + 1)
+    res.append(1)
+    inc = History(history, maxiter)
+    niter = 0
+    if nr0 == 0:
+        return x, niter, inc.result(), res.result()
+    rhat = r.copy()
+    p = np.zeros(n)
+    v = np.zeros(n)
+    rho = alpha = omega = 1.0
+    while niter < maxiter:
+        niter += 1
+        rho_new = np.dot(rhat, r)
+        if rho_new == 0:
+            raise ValueError("Rupture de BiCGStab : (r^, r) = 0")
+        beta = (rho_new / rho) * (alpha / omega)
+        p -= omega * v
+        p *= beta
+        p += r
+        phat = P.apply(p)
+        v = A @ phat
+        alpha = rho_new / np.dot(rhat, v)
+        r -= alpha * v
+        dx = alpha * phat
+        if np.linalg.norm(r) / nr0 < tol:
+            # s = r - alpha v est déjà assez petit : on s'arrête à mi-itération
+            omega = 0.0
+        else:
+            shat = P.apply(r)
+            t = A @ shat
+            tt = np.dot(t, t)
+            omega = np.dot(t, r) / tt if tt > 0 else 0.0
+            if omega == 0:
+                raise ValueError("Rupture de BiCGStab : omega = 0")
+            dx += omega * shat
+            r -= omega * t
+        x += dx
+        rho = rho_new
+        rn = np.linalg.norm(r) / nr0
+        if rn < tol or rn * nr0 <= atol:
+            # le résidu mis à jour par récurrence peut s'écarter du vrai
+            # résidu : on le vérifie et, si besoin, on redémarre avec ce dernier
+            r = b - A @ x
+            rn = np.linalg.norm(r) / nr0
+            if not (rn < tol or rn * nr0 <= atol):
+                rhat = r.copy()
+                p[:] = 0
+                v = np.zeros(n)
+                rho = alpha = omega = 1.0
+        e = np.linalg.norm(dx)
+        res.append(rn)
+        inc.append(e)
+        if callback is not None and callback(niter, x, e, rn):
+            break
+        if rn < tol or rn * nr0 <= atol:
+            break
+    return x, niter, inc.result(), res.result()
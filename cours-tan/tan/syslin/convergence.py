@@ -0,0 +1,248 @@
+import numpy as np
+import scipy.sparse.linalg as spla
+from tan.syslin.auto import diagnose
+from tan.syslin.sor import _auto_omega
+from tan.syslin.splitting import SORSplitting
+from tan.syslin.utils import diagonal, size
+
+STATIONARY = ("jacobi", "gauss_seidel", "sor")
+
+
+class Prediction:
+    """Prédiction de `predict` pour une méthode stationnaire.
+
+    Attributs
+    ---------
+    method : str
+        La méthode : "jacobi", "gauss_seidel" ou "sor".
+    omega : float
+        Le paramètre de relaxation (1 pour Jacobi et Gauss-Seidel).
+    rho : float
+        L'estimation du rayon spectral de la matrice d'itération.
+    niter : float
+        Le nombre d'itérations prédit pour atteindre la tolérance, inf si la
+        méthode diverge.
+    converges : bool
+        True si rho < 1.
+    """
+
+    __slots__ = ("method", "omega", "rho", "niter", "converges")
+
+    def __init__(self, method, omega, rho, niter):
+        self.method = method
+        self.omega = omega
+        self.rho = rho
+        self.niter = niter
+        self.converges = bool(rho < 1)
+
+    def __repr__(self):
+        return (f"Prediction(method={self.method!r}, omega={self.omega:.4g}, "
+                f"rho={self.rho:.6f}, niter={self.niter})")
+
+
+def iteration_operator(A, method="jacobi", omega=1.0):
+    """Retourne la matrice d'itération B = I - M^{-1} A sous forme d'opérateur, sans la former.
+
+    Paramètres
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        La matrice du système. Pour Gauss-Seidel et SOR, A doit donner accès à
+        sa partie triangulaire inférieure (pas de LinearOperator).
+    method : {"jacobi", "gauss_seidel", "sor"}, optionnel
+        La méthode : M = D / omega (Jacobi pondéré), M = D - E (Gauss-Seidel)
+        ou M = D / omega - E (SOR).
+    omega : float, optionnel
+        Le paramètre de relaxation (ignoré pour Gauss-Seidel).
+
+    Retourne
+    --------
+    B : scipy.sparse.linalg.LinearOperator
+        Chaque produit B @ x coûte un produit A @ x et une division par la
+        diagonale (Jacobi) ou une descente triangulaire (Gauss-Seidel, SOR).
+    """
+    n = size(A)
+    solve = _splitting(A, method, omega)
+    apply = lambda x: x - solve(A @ x)
+    return spla.LinearOperator((n, n), matvec=lambda x: apply(np.ravel(x)), dtype=float)
+
+
+def spectral_radius(A, method="jacobi", omega=1.0, tol=1e-6, maxiter=100):
+    """Estime le rayon spectral de la matrice d'itération d'une méthode stationnaire, sans la former.
+
+    La méthode converge pour tout x0 si et seulement si le rayon spectral est
+    < 1, et l'erreur est alors divisée par environ 1/rho à chaque itération.
+    Calculer np.linalg.eigvals(B) coûte O(n^3) et demande de former B ; ici,
+    seules des applications de B (voir `iteration_operator`) sont utilisées :
+
+    - Jacobi, A symétrique à diagonale positive : B est semblable à la matrice
+      symétrique I - omega D^{-1/2} A D^{-1/2}, dont on calcule la valeur
+      propre de plus grand module par Lanczos (ARPACK, `eigsh`) ;
+    - sinon (Gauss-Seidel, SOR, Jacobi non symétrique) : B n'est pas
+      symétrique et peut avoir des valeurs propres complexes ; on calcule sa
+      valeur propre de plus grand module par Arnoldi (ARPACK, `eigs`). Si
+      ARPACK ne converge pas (plusieurs valeurs propres de même module, comme
+      pour SOR avec omega > omega optimal, ou B très non normale), rho est
+      estimé par la croissance des itérés de la puissance, ||B^k x|| ^ (1/k)
+      sur 200 itérations. Pour B très non normale, cette estimation dépasse
+      rho, mais elle suit mieux la décroissance effectivement observée sur
+      les premières centaines d'itérations.
+
+    Pour n <= 16, B est construite colonne par colonne par n applications et
+    ses valeurs propres sont calculées directement.
+
+    Paramètres
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        La matrice du système.
+    method : {"jacobi", "gauss_seidel", "sor"}, optionnel
+        La méthode.
+    omega : float, optionnel
+        Le paramètre de relaxation de Jacobi pondéré et de SOR.
+    tol : float, optionnel
+        La précision relative demandée à ARPACK. Le nombre d'itérations prédit
+        dépend de 1 - rho : quand rho est proche de 1, il faut une précision
+        nettement plus petite que 1 - rho.
+    maxiter : int, optionnel
+        Le nombre maximum de redémarrages d'ARPACK, avec une base de Krylov
+        de 20 vecteurs.
+
+    Retourne
+    --------
+    rho : float
+        L'estimation du rayon spectral.
+    """
+    n = size(A)
+    B = iteration_operator(A, method, omega)
+    if n <= 16:
+        return float(np.max(np.abs(np.linalg.eigvals(B @ np.eye(n)))))
+    v0 = np.random.default_rng(0).random(n)
+    if method == "jacobi":
+        d = diagonal(A)
+        if np.all(d > 0) and diagnose(A)["symmetric"]:
+            s = np.sqrt(d)
+            C = spla.LinearOperator((n, n), matvec=lambda x: s * (B @ (np.ravel(x) / s)),
+                                    dtype=float)
+            lam = spla.eigsh(C, k=1, which="LM", v0=v0, ncv=min(n, 20), tol=tol,
+                             maxiter=maxiter, return_eigenvectors=False)
+            return float(np.abs(lam[0]))
+    try:
+        lam = spla.eigs(B, k=1, which="LM", v0=v0, ncv=min(n - 1, 20), tol=tol,
+                        maxiter=maxiter, return_eigenvectors=False)
+        return float(np.abs(lam[0]))
+    except spla.ArpackNoConvergence:
+        return _growth_rate(B, v0)
+
+
+def predict(A, b=None, x0=None, tol=1e-6, methods=STATIONARY, omega="auto", rtol=1e-6):
+    """Prédit le nombre d'itérations des méthodes stationnaires avant de les lancer.
+
+    Pour chaque méthode, le rayon spectral rho de la matrice d'itération est
+    estimé par `spectral_radius`. Les solveurs (`jacobi2`, `gauss_seidel2`,
+    `sor2`, ...) s'arrêtent lorsque l'incrément ||x_{k+1} - x_k|| passe sous
+    `tol` ; comme l'incrément est multiplié par B à chaque itération, il
+    décroît asymptotiquement comme rho^k ||dx_0||, d'où la prédiction
+
+        niter = 1 + ceil(log(tol / ||dx_0||) / log(rho)),
+
+    où le premier incrément dx_0 = M^{-1}(b - A x0) coûte une itération. Sans
+    b, tol est interprété comme le facteur de réduction de l'erreur :
+    niter = ceil(log(tol) / log(rho)). La prédiction est asymptotique : elle
+    est d'autant plus fiable que niter est grand. Une méthode dont rho >= 1
+    diverge (niter = inf) et peut être écartée avant toute itération.
+
+    Paramètres
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        La matrice du système.
+    b : ndarray, shape (n,), optionnel
+        Le second membre.
+    x0 : ndarray, shape (n,), optionnel
+        L'estimation initiale (nulle par défaut).
+    tol : float, optionnel
+        La tolérance passée au solveur.
+    methods : tuple de str, optionnel
+        Les méthodes à évaluer parmi "jacobi", "gauss_seidel" et "sor".
+    omega : float ou "auto", optionnel
+        Le paramètre de SOR. Avec "auto", omega est choisi exactement comme
+        par `sor2` : omega = 2 / (1 + sqrt(1 - rho_J^2)) à partir d'une
+        estimation du rayon spectral de Jacobi, ou 1 si SOR ne contracte pas
+        plus vite que Gauss-Seidel avec cette valeur (matrice qui n'est pas
+        « consistently ordered », voir `tan.syslin.sor._auto_omega`). La
+        prédiction porte donc sur la méthode effectivement lancée.
+    rtol : float, optionnel
+        La précision relative des rayons spectraux (voir `spectral_radius`).
+
+    Retourne
+    --------
+    predictions : dict
+        Pour chaque méthode, une `Prediction`.
+
+    Exemple
+    -------
+    >>> p = predict(A, b, tol=1e-8)
+    >>> [m for m, q in p.items() if q.niter <= 1000]
+    ['gauss_seidel', 'sor']
+    """
+    for m in methods:
+        if m not in STATIONARY:
+            raise ValueError(f"méthode inconnue {m!r}, choisir parmi {STATIONARY}")
+    rho_j = None
+    if "jacobi" in methods:
+        rho_j = spectral_radius(A, "jacobi", tol=rtol)
+    r0 = None
+    if b is not None:
+        b = np.asarray(b, dtype=float)
+        r0 = b if x0 is None else b - A @ np.asarray(x0, dtype=float)
+    predictions = {}
+    for m in methods:
+        w = 1.0
+        if m == "jacobi":
+            rho = rho_j
+        else:
+            if m == "sor":
+                w = _auto_omega(A, SORSplitting(A))[0] if omega == "auto" else float(omega)
+            rho = spectral_radius(A, m, w, tol=rtol)
+        if r0 is None:
+            niter = _niter(rho, tol)
+        else:
+            e0 = np.linalg.norm(_splitting(A, m, w)(r0))
+            niter = 1 if e0 < tol else 1 + _niter(rho, tol / e0)
+        predictions[m] = Prediction(m, w, rho, niter)
+    return predictions
+
+
+def _splitting(A, method, omega):
+    """La fonction r -> M^{-1} r de la décomposition A = M - N de la méthode."""
+    if method == "jacobi":
+        w = omega / diagonal(A)
+        return lambda r: w * r
+    if method in ("gauss_seidel", "sor"):
+        if method == "gauss_seidel":
+            omega = 1.0
+        S = SORSplitting(A, omega)
+        # M = (D + omega L) / omega
+        return lambda r: omega * S.solve(r)
+    raise ValueError(f"méthode inconnue {method!r}, choisir parmi {STATIONARY}")
+
+
+def _niter(rho, reduction):
+    """Le nombre d'itérations k tel que rho^k <= reduction."""
+    if rho >= 1:
+        return np.inf
+    if rho == 0 or reduction >= 1:
+        return 1
+    return int(np.ceil(np.log(reduction) / np.log(rho)))
+
+
+def _growth_rate(B, x, maxiter=200):
+    """Estime rho par ||B^k x|| ^ (1/k) (formule de Gelfand), en renormalisant les itérés."""
+    x = x / np.linalg.norm(x)
+    log_growth = 0.0
+    for k in range(1, maxiter + 1):
+        x = B @ x
+        nx = np.linalg.norm(x)
+        if nx == 0:
+            return 0.0
+        log_growth += np.log(nx)
+        x /= nx
+    return float(np.exp(log_growth / maxiter))
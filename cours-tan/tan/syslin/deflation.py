@@ -0,0 +1,250 @@
+import numpy as np
+import scipy.linalg
+from tan.history import History
+from tan.syslin.precond import aspreconditioner
+from tan.syslin.utils import size
+
+
+def deflated_cg(A, b, W, P=None, x0=None, tol=1e-6, maxiter=100, atol=0.0, history="list",
+                callback=None):
+    """
+    Calcule la solution du système linéaire Ax = b par le gradient conjugué préconditionné déflaté.
+
+    Paramètres :
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        Matrice des coefficients, symétrique définie positive.
+
+    b : ndarray, shape (n,)
+        Vecteur de droite.
+
+    W : ndarray, shape (n, k) ou None
+        Base de l'espace de déflation, typiquement des approximations des
+        vecteurs propres de A associés aux plus petites valeurs propres. Avec
+        None, la méthode est exactement `pcg`.
+
+    P, x0, tol, maxiter, atol, history, callback :
+        Voir `pcg`. La norme résiduelle relative est rapportée au résidu de x0
+        (avant la correction initiale sur W), comme pour `pcg`.
+
+    Retourne :
+    -------
+    x : ndarray, shape (n,)
+        Solution approximative de Ax = b.
+
+    niter : int
+        Nombre d'itérations effectuées.
+
+    inc : liste
+        L'incrément à chaque itération.
+
+    res : list
+        La norme résiduelle relative à chaque itération.
+
+    Notes :
+    -----
+    L'itéré initial est corrigé pour que le résidu soit orthogonal à W, puis
+    chaque direction de descente est rendue A-orthogonale à W :
+
+        p = z + beta p - W (W^T A W)^{-1} (AW)^T z.
+
+    Les itérations se déroulent donc dans le complément A-orthogonal de W, où
+    les plus petites valeurs propres de A ont été retirées : le conditionnement
+    effectif, et donc le nombre d'itérations, diminue. Le surcoût est de k
+    produits par A pour former AW, puis de O(k n) par itération.
+    """
+    return _dcg(A, b, W, P, x0, tol, maxiter, atol, history, callback, 0, 0)[:4]
+
+
+class RecycledCG:
+    """Gradient conjugué déflaté avec recyclage, pour une suite de systèmes SPD voisins.
+
+    Lors de la résolution d'une suite de systèmes A_i x = b_i qui varient
+    lentement (pas de temps, balayage de `epsi`), `pcg` retrouve à chaque
+    système les mêmes modes lents, responsables de la plupart des itérations.
+    RecycledCG conserve `k` approximations des vecteurs propres associés aux
+    plus petites valeurs propres et les retire des résolutions suivantes (voir
+    `deflated_cg`).
+
+    Les vecteurs sont récoltés à partir des coefficients du gradient conjugué,
+    sans produit supplémentaire par A : les vecteurs z_j = P r_j et les
+    produits A z_j, qui se déduisent des produits A p_j déjà calculés, sont
+    conservés sur une fenêtre de `m` vecteurs, réduite par redémarrage épais
+    lorsqu'elle est pleine (voir `_Window`). À la fin de la résolution, une
+    projection de Rayleigh-Ritz de A sur l'espace engendré par W et la fenêtre
+    donne les k vecteurs de Ritz de plus petites valeurs de Ritz, qui forment
+    le nouveau W. Le gain apparaît dès la deuxième résolution et augmente au
+    fil des suivantes, à mesure que les vecteurs de Ritz convergent.
+
+    Paramètres
+    ----------
+    k : int, optionnel
+        Le nombre de vecteurs conservés d'une résolution à l'autre.
+    m : int, optionnel
+        La taille de la fenêtre de vecteurs récoltés pendant une résolution
+        (4k par défaut, au moins 2k + 2). La mémoire utilisée est de (2k + 2m)
+        vecteurs de taille n pendant une résolution, k vecteurs entre deux
+        résolutions.
+
+    Attributs
+    ---------
+    W : ndarray, shape (n, k) ou None
+        L'espace de déflation courant.
+    ritz : ndarray ou None
+        Les valeurs de Ritz associées aux colonnes de W (pour la dernière matrice).
+    """
+
+    def __init__(self, k=8, m=None):
+        self.k = k
+        self.m = 4 * k if m is None else m
+        self.W = None
+        self.ritz = None
+
+    def solve(self, A, b, P=None, x0=None, tol=1e-6, maxiter=100, atol=0.0, history="list",
+              callback=None):
+        """Résout Ax = b en déflatant W, puis met W à jour. Voir `pcg` pour les paramètres et le retour."""
+        W = self.W if self.W is not None and len(self.W) == size(A) else None
+        x, niter, inc, res, ritz = _dcg(A, b, W, P, x0, tol, maxiter, atol, history, callback,
+                                        self.k, self.m)
+        if ritz is not None:
+            self.W, self.ritz = ritz
+        return x, niter, inc, res
+
+    def clear(self):
+        """Oublie l'espace de déflation."""
+        self.W = None
+        self.ritz = None
+
+
+def _dcg(A, b, W, P, x0, tol, maxiter, atol, history, callback, k, m):
+    """Gradient conjugué déflaté ; si k > 0, retourne aussi k vecteurs de Ritz récoltés (ou None)."""
+    n = size(A)
+    P = aspreconditioner(P)
+    b = np.asarray(b, dtype=float)
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float)
+    r = b - A @ x
+    nr0 = np.linalg.norm(r)
+    if W is not None:
+        AW = np.asarray(A @ W)
+        try:
+            c = scipy.linalg.cho_factor((W.T @ AW + AW.T @ W) / 2)
+        except np.linalg.LinAlgError:
+            W = None
+    if W is None:
+        W = AW = np.zeros((n, 0))
+        project = lambda v: np.zeros(0)
+    else:
+        project = lambda v: scipy.linalg.cho_solve(c, v)
+        mu = project(W.T @ r)
+        x += W @ mu
+        r -= AW @ mu
+    window = _Window(n, k, m) if k > 0 else None
+    res = History(history, maxiter + 1)
+    res.append(1)
+    inc = History(history, maxiter)
+    niter = 0
+    if nr0 == 0:
+        return x, niter, inc.result(), res.result(), None
+    z = P.apply(r)
+    mu = project(AW.T @ z)
+    p = z - W @ mu
+    # q_old intervient dans A z avec beta = 0 à la première itération :
+    # il doit être fini, d'où np.zeros pour les deux tampons échangés
+    q = np.zeros_like(x)
+    q_old = np.zeros_like(x)
+    beta = 0.0
+    rz = np.dot(r, z)
+    while niter < maxiter:
+        niter += 1
+        q_old, q = q, q_old
+        q[:] = A @ p
+        if window is not None:
+            # p = z + beta p_old - W mu, donc A z = A p - beta A p_old + AW mu
+            window.append(z, q - beta * q_old + AW @ mu)
+        alpha = rz / np.dot(p, q)
+        x += alpha * p
+        r -= alpha * q
+        rn = np.linalg.norm(r) / nr0
+        e = abs(alpha) * np.linalg.norm(p)
+        res.append(rn)
+        inc.append(e)
+        if callback is not None and callback(niter, x, e, rn):
+            break
+        if rn < tol or rn * nr0 <= atol:
+            break
+        if e < tol:
+            break
+        z = P.apply(r)
+        rz_new = np.dot(r, z)
+        if rz_new == 0:
+            break
+        beta = rz_new / rz
+        mu = project(AW.T @ z)
+        p *= beta
+        p += z
+        p -= W @ mu
+        rz = rz_new
+    if window is None:
+        return x, niter, inc.result(), res.result(), None
+    Z, AZ = window.basis()
+    C, theta = _rayleigh_ritz(np.hstack([W, Z]), np.hstack([AW, AZ]), k)
+    return x, niter, inc.result(), res.result(), (np.hstack([W, Z]) @ C, theta)
+
+
+class _Window:
+    """Les vecteurs z_j du gradient conjugué et leurs produits A z_j, sur une fenêtre de m vecteurs.
+
+    Quand la fenêtre est pleine, elle est réduite (redémarrage épais, comme
+    dans eigCG de Stathopoulos et Orginos) aux k vecteurs de Ritz de plus
+    petites valeurs de Ritz sur la fenêtre, et aux k vecteurs de Ritz sur la
+    fenêtre privée de son dernier vecteur : ces derniers conservent la
+    direction de progression des premiers, et les vecteurs de Ritz convergent
+    au fil des itérations sans produit supplémentaire par A.
+    """
+
+    def __init__(self, n, k, m):
+        self.k = k
+        self.m = max(m, 2 * k + 2)
+        self.Z = np.empty((n, self.m))
+        self.AZ = np.empty((n, self.m))
+        self.count = 0
+
+    def append(self, z, Az):
+        if self.count == self.m:
+            self.restart()
+        self.Z[:, self.count] = z
+        self.AZ[:, self.count] = Az
+        self.count += 1
+
+    def restart(self):
+        Z, AZ = self.Z, self.AZ
+        C1, _ = _rayleigh_ritz(Z, AZ, self.k)
+        C2, _ = _rayleigh_ritz(Z[:, :-1], AZ[:, :-1], self.k)
+        C = np.hstack([C1, np.vstack([C2, np.zeros((1, C2.shape[1]))])])
+        j = C.shape[1]
+        Z[:, :j] = Z @ C
+        AZ[:, :j] = AZ @ C
+        self.count = j
+
+    def basis(self):
+        return self.Z[:, :self.count], self.AZ[:, :self.count]
+
+
+def _rayleigh_ritz(Z, AZ, k):
+    """Projection de Rayleigh-Ritz de A sur l'espace engendré par les colonnes de Z.
+
+    On résout Z^T A Z y = theta Z^T Z y après avoir retiré de Z^T Z les
+    directions numériquement dépendantes. Retourne les coefficients C tels que
+    les colonnes de Z C soient les k vecteurs de Ritz (orthonormés) de plus
+    petites valeurs de Ritz, et ces valeurs.
+    """
+    s = np.linalg.norm(Z, axis=0)
+    s[s == 0] = 1
+    G = (Z.T @ AZ) / np.outer(s, s)
+    G = (G + G.T) / 2
+    lam, U = np.linalg.eigh((Z.T @ Z) / np.outer(s, s))
+    ok = lam > 1e-10 * lam[-1]
+    V = U[:, ok] / np.sqrt(lam[ok])
+    theta, Y = np.linalg.eigh(V.T @ G @ V)
+    k = min(k, len(theta))
+    return (V @ Y[:, :k]) / s[:, None], theta[:k]
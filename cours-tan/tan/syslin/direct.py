@@ -0,0 +1,278 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from tan.syslin.utils import is_operator, is_sparse
+
+
+def forward_substitution(L, b, unit=False, block=64):
+    """Résout le système triangulaire inférieur Lx = b par blocs.
+
+    Les inconnues sont traitées par blocs de `block` lignes : chaque bloc est
+    obtenu par une descente sur le bloc diagonal, puis sa contribution est
+    retranchée de tous les seconds membres suivants en un seul produit
+    matrice-vecteur (ou matrice-matrice si b a plusieurs colonnes). Il n'y a
+    donc que n / block itérations Python au lieu de n.
+
+    Paramètres
+    ----------
+    L : ndarray, shape (n, n)
+        La matrice triangulaire inférieure (seule sa partie inférieure est lue).
+    b : ndarray, shape (n,) ou (n, k)
+        Le second membre.
+    unit : bool, optionnel
+        Si True, la diagonale de L est supposée égale à 1 et n'est pas lue.
+    block : int, optionnel
+        La taille des blocs.
+
+    Retourne
+    --------
+    x : ndarray
+        La solution du système.
+    """
+    x = np.array(b, dtype=float)
+    n = L.shape[0]
+    for k in range(0, n, block):
+        e = min(k + block, n)
+        x[k:e] = scipy.linalg.solve_triangular(L[k:e, k:e], x[k:e], lower=True,
+                                               unit_diagonal=unit)
+        x[e:] -= L[e:, k:e] @ x[k:e]
+    return x
+
+
+def backward_substitution(U, b, unit=False, block=64):
+    """Résout le système triangulaire supérieur Ux = b par blocs.
+
+    Voir `forward_substitution` ; les blocs sont parcourus du dernier au premier.
+    """
+    x = np.array(b, dtype=float)
+    n = U.shape[0]
+    for e in range(n, 0, -block):
+        k = max(e - block, 0)
+        x[k:e] = scipy.linalg.solve_triangular(U[k:e, k:e], x[k:e], lower=False,
+                                               unit_diagonal=unit)
+        x[:k] -= U[:k, k:e] @ x[k:e]
+    return x
+
+
+def lu(A, block=64):
+    """Factorisation LU avec pivot partiel, par blocs.
+
+    Algorithme « right-looking » : on factorise un panneau de `block` colonnes
+    (recherche du pivot et élimination vectorisées sur chaque colonne), puis on
+    calcule le bloc de U à droite du panneau par une descente triangulaire et on
+    met à jour la sous-matrice restante par un seul produit matrice-matrice.
+    L'essentiel des O(n^3) opérations est ainsi effectué par BLAS-3.
+
+    Paramètres
+    ----------
+    A : ndarray, shape (n, n)
+        La matrice à factoriser.
+    block : int, optionnel
+        La taille des panneaux.
+
+    Retourne
+    --------
+    LU : ndarray, shape (n, n)
+        Les facteurs L (sous la diagonale, diagonale unité implicite) et U (partie
+        triangulaire supérieure) stockés dans un même tableau.
+    perm : ndarray, shape (n,)
+        La permutation des lignes : A[perm] = L @ U.
+    """
+    A = np.array(A, dtype=float)
+    n = A.shape[0]
+    perm = np.arange(n)
+    for k in range(0, n, block):
+        e = min(k + block, n)
+        for j in range(k, e):
+            p = j + np.argmax(np.abs(A[j:, j]))
+            if A[p, j] == 0:
+                raise np.linalg.LinAlgError("Matrice singulière")
+            if p != j:
+                A[[j, p]] = A[[p, j]]
+                perm[[j, p]] = perm[[p, j]]
+            A[j+1:, j] /= A[j, j]
+            A[j+1:, j+1:e] -= np.outer(A[j+1:, j], A[j, j+1:e])
+        if e < n:
+            A[k:e, e:] = scipy.linalg.solve_triangular(A[k:e, k:e], A[k:e, e:],
+                                                       lower=True, unit_diagonal=True)
+            A[e:, e:] -= A[e:, k:e] @ A[k:e, e:]
+    return A, perm
+
+
+def lu_solve(LU, perm, b):
+    """Résout Ax = b à partir de la factorisation (LU, perm) calculée par `lu`."""
+    y = forward_substitution(LU, np.asarray(b, dtype=float)[perm], unit=True)
+    return backward_substitution(LU, y)
+
+
+def cholesky(A, block=64):
+    """Factorisation de Cholesky A = L L^T d'une matrice symétrique définie positive, par blocs.
+
+    Chaque bloc diagonal est factorisé, le panneau situé en dessous est obtenu par
+    une descente triangulaire et la sous-matrice restante est mise à jour par un
+    produit matrice-matrice. Seule la partie inférieure de A est lue.
+
+    Paramètres
+    ----------
+    A : ndarray, shape (n, n)
+        La matrice symétrique définie positive.
+    block : int, optionnel
+        La taille des blocs.
+
+    Retourne
+    --------
+    L : ndarray, shape (n, n)
+        Le facteur triangulaire inférieur.
+    """
+    A = np.array(A, dtype=float)
+    n = A.shape[0]
+    for k in range(0, n, block):
+        e = min(k + block, n)
+        A[k:e, k:e] = np.linalg.cholesky(A[k:e, k:e])
+        if e < n:
+            A[e:, k:e] = scipy.linalg.solve_triangular(A[k:e, k:e], A[e:, k:e].T,
+                                                       lower=True).T
+            A[e:, e:] -= A[e:, k:e] @ A[e:, k:e].T
+    return np.tril(A)
+
+
+def cholesky_solve(L, b):
+    """Résout Ax = b à partir du facteur de Cholesky L calculé par `cholesky`."""
+    return backward_substitution(L.T, forward_substitution(L, b))
+
+
+def factorize(A, spd=False):
+    """Factorise A une seule fois et retourne la fonction de résolution.
+
+    Une matrice dense est factorisée par `cholesky` (si spd) ou `lu`, une matrice
+    creuse par SuperLU.
+
+    Paramètres
+    ----------
+    A : ndarray ou matrice creuse, shape (n, n)
+        La matrice du système.
+    spd : bool, optionnel
+        Si True, A est supposée symétrique définie positive.
+
+    Retourne
+    --------
+    solve : callable
+        La fonction b -> A^{-1} b, pour b de shape (n,) ou (n, k).
+    """
+    return _factorize(A, spd)[0]
+
+
+def fingerprint(A):
+    """Empreinte d'une matrice, utilisée comme clé du cache des factorisations.
+
+    On calcule A u et v^T A pour deux vecteurs aléatoires u, v fixés (qui ne
+    dépendent que de n), puis un hachage BLAKE2 de ces 2n valeurs, de la forme
+    et du type de A. Cela coûte deux produits matrice-vecteur, O(n^2) ou O(nnz),
+    négligeable devant une factorisation. Toute modification d'un coefficient
+    change l'empreinte, sauf si elle est de l'ordre des erreurs d'arrondi de A u,
+    c'est-à-dire de l'erreur inverse de la factorisation elle-même.
+    """
+    n = A.shape[1]
+    rng = np.random.default_rng(n)
+    u, v = rng.standard_normal(n), rng.standard_normal(A.shape[0])
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((A.shape, str(A.dtype), is_sparse(A))).encode())
+    h.update(np.ascontiguousarray(A @ u, dtype=float).data)
+    h.update(np.ascontiguousarray(A.T @ v, dtype=float).data)
+    return h.hexdigest()
+
+
+class FactorizationCache:
+    """Cache LRU de factorisations, borné en mémoire.
+
+    Les factorisations sont indexées par l'empreinte de la matrice (voir
+    `fingerprint`) : résoudre à nouveau un système avec la même matrice A ne
+    refactorise pas A. Lorsque la mémoire occupée par les facteurs dépasse
+    `maxbytes`, les factorisations les moins récemment utilisées sont évincées ;
+    une factorisation plus grande que `maxbytes` n'est pas conservée.
+
+    Paramètres
+    ----------
+    maxbytes : int, optionnel
+        La mémoire maximale occupée par les facteurs (256 Mo par défaut).
+    """
+
+    def __init__(self, maxbytes=2**28):
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, A, spd=False):
+        """Retourne la fonction de résolution de A, en factorisant A si besoin."""
+        key = (fingerprint(A), spd)
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+        self.misses += 1
+        solve, nbytes = _factorize(A, spd)
+        if nbytes <= self.maxbytes:
+            self._entries[key] = (solve, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.maxbytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+        return solve
+
+    def clear(self):
+        """Vide le cache."""
+        self._entries.clear()
+        self.nbytes = 0
+
+
+default_cache = FactorizationCache()
+
+
+def solve(A, b, spd=False, cache=True):
+    """Résout le système linéaire Ax = b par une méthode directe.
+
+    Paramètres
+    ----------
+    A : ndarray ou matrice creuse, shape (n, n)
+        La matrice du système.
+    b : ndarray, shape (n,) ou (n, k)
+        Le second membre.
+    spd : bool, optionnel
+        Si True, A est supposée symétrique définie positive (Cholesky).
+    cache : bool ou FactorizationCache, optionnel
+        Si True (par défaut), la factorisation est cherchée puis conservée dans
+        `default_cache` ; si False, A est toujours refactorisée.
+
+    Retourne
+    --------
+    x : ndarray
+        La solution du système.
+    """
+    if cache is True:
+        cache = default_cache
+    if cache is False or cache is None:
+        return factorize(A, spd)(b)
+    return cache.get(A, spd)(b)
+
+
+def _factorize(A, spd):
+    """Factorise A et retourne la fonction de résolution et la taille des facteurs en octets."""
+    if is_operator(A):
+        raise TypeError("un LinearOperator ne peut pas être factorisé")
+    if is_sparse(A):
+        f = spla.splu(sp.csc_matrix(A, dtype=float))
+        return f.solve, (f.L.nnz + f.U.nnz) * 12 + 2 * A.shape[0] * 4
+    if spd:
+        L = cholesky(A)
+        return (lambda b: cholesky_solve(L, b)), L.nbytes
+    LU, perm = lu(A)
+    return (lambda b: lu_solve(LU, perm, b)), LU.nbytes + perm.nbytes
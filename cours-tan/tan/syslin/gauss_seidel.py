@@ -1,13 +1,21 @@
 import numpy as np
-import scipy.linalg # <0>
+from tan.history import History
+from tan.syslin.batched import is_batched, sor_batched
+from tan.syslin.outofcore import is_stream
+from tan.syslin.sor import _sor_blocks, _sor_stream
+from tan.syslin.splitting import SORSplitting, stationary
+from tan.syslin.utils import bandwidth, diagonal, is_operator, is_sparse, iterate_columns, size
 
-def gauss_seidel1(A, b, x0, tol=1e-6, maxiter=100):
+def gauss_seidel1(A, b, x0, tol=1e-6, maxiter=100, history="list", callback=None, block=None):
     """Solve the linear system Ax = b using the Gauss-Seidel method.
 
     Parameters
     ----------
-    A : array_like
-        The matrix of the linear system.
+    A : array_like, sparse matrix, np.memmap or path
+        The matrix of the linear system. Sparse matrices are swept with a
+        sparse triangular solve and are never densified. A matrix on disk
+        (np.memmap or `.npy` file) is streamed in row blocks, reading it
+        once per iteration (see `tan.syslin.outofcore.MatrixStream.sweep`).
     b : array_like
         The right-hand side vector of the linear system.
     x0 : array_like
@@ -16,6 +24,17 @@ def gauss_seidel1(A, b, x0, tol=1e-6, maxiter=100):
         The tolerance for the stopping criterion.
     maxiter : int, optional
         The maximum number of iterations.
+    history : {"list", "array", "none"}, optional
+        How the `inc` history is stored (see `tan.history.History`): a list
+        (default), a preallocated NumPy array, or not at all (None is returned).
+    callback : callable, optional
+        Called after each iteration as callback(niter, x, inc) with the new
+        iterate x and its increment; returning True stops the iterations.
+    block : int, optional
+        If given, the rows of a dense A are updated by contiguous blocks of
+        this size, with one matrix-vector product and one small triangular
+        solve per block instead of a Python loop over the rows. The iterates
+        are the same as with the row loop.
 
     Returns
     -------
@@ -26,38 +45,121 @@ def gauss_seidel1(A, b, x0, tol=1e-6, maxiter=100):
     inc : array_like
         The increment at each iteration.
     """
+    if is_stream(A):
+        return _sor_stream(A, b, x0, 1.0, tol, maxiter, history, callback)
+    if is_sparse(A) or is_operator(A) or is_batched(A):
+        return gauss_seidel2(A, b, x0, tol, maxiter, history, callback)
+    if block is not None:
+        return _sor_blocks(A, b, x0, 1.0, block, tol, maxiter, history, callback)
     x = x0.copy()
     niter = 0
-    inc = []
+    inc = History(history, maxiter)
     while True:
         niter += 1
         x_new = np.zeros_like(x)
         for i in range(len(A)):
             x_new[i] = (b[i] - np.dot(A[i, :i], x_new[:i]) - np.dot(A[i, i+1:], x[i+1:])) / A[i, i]
 
-        inc.append(np.linalg.norm(x_new - x))
-        if inc[-1] < tol:
+        e = np.linalg.norm(x_new - x)
+        inc.append(e)
+        if callback is not None and callback(niter, x_new, e):
+            break
+        if e < tol:
             break
         if niter == maxiter:
             break
         x = x_new
-    return x, niter,inc
+    return x, niter, inc.result()
 
-def gauss_seidel2(A, b, x0, tol=1e-6, maxiter=100):
+def gauss_seidel2(A, b, x0, tol=1e-6, maxiter=100, history="list", callback=None,
+                  workspace=None):
     """Solve the linear system Ax = b using the Gauss-Seidel method.
 
+    Each iteration is a forward triangular solve (D-E) x_new = F x + b against
+    the lower part of A; the iteration matrix B = (D-E)^{-1} F is never formed.
+    For a sparse matrix the sweep costs O(nnz).
+
+    Parameters
+    ----------
+    A : array_like or sparse matrix
+        The matrix of the linear system. Sparse matrices are swept with a
+        sparse triangular solve and are never densified.
+    b : array_like, shape (n,) or (n, k)
+        The right-hand side vector of the linear system. With k right-hand
+        sides, the columns are swept together (one block triangular solve per
+        iteration) and each column stops as soon as it has converged. With a
+        stack of matrices A of shape (batch, n, n) and b of shape (batch, n),
+        the independent systems are iterated together (see `tan.syslin.batched`).
+    x0 : array_like
+        The initial guess for the solution.
+    tol : float, optional
+        The tolerance for the stopping criterion.
+    maxiter : int, optional
+        The maximum number of iterations.
+    history : {"list", "array", "none"}, optional
+        How the `inc` history is stored (see `tan.history.History`): a list
+        (default), a preallocated NumPy array, or not at all (None is returned).
+    callback : callable, optional
+        Called after each iteration as callback(niter, x, inc) with the new
+        iterate x and its increment; returning True stops the iterations.
+        With a single right-hand side, x is a work vector reused by the next
+        iteration.
+    workspace : Workspace, optional
+        Work vectors (see `tan.syslin.splitting.Workspace`) to reuse across
+        solves, so that no vector is allocated per iteration for a dense A.
+
+    Returns
+    -------
+    x : array_like
+        The solution of the linear system.
+    niter : int or ndarray of shape (k,)
+        The number of iterations performed (for each column if b is 2D).
+    inc : array_like
+        The increment at each iteration.
+    """
+    if is_operator(A):
+        raise TypeError("Gauss-Seidel needs the lower triangular part of A, "
+                        "which a LinearOperator does not provide")
+    if is_batched(A):
+        return sor_batched(A, b, x0, 1.0, tol, maxiter, history, callback)
+    S = SORSplitting(A)
+    if np.ndim(b) == 2:
+        return iterate_columns(lambda x, b: S.solve(b - S.U @ x), b, x0, tol, maxiter,
+                               history, callback)
+    return stationary(S, b, x0, tol, maxiter, history, callback, workspace=workspace)
+
+
+def gauss_seidel_multicolor(A, b, x0, colors=None, tol=1e-6, maxiter=100, history="list",
+                            callback=None):
+    """Solve the linear system Ax = b using multicolor Gauss-Seidel.
+
+    The unknowns are split into colors such that no two unknowns of the same
+    color are coupled in A (red-black ordering for a 1D or 2D Laplacian). All
+    the unknowns of one color are then updated at once with a single vectorized
+    operation, and a sweep costs O(nnz).
+
     Parameters
     ----------
-    A : array_like
+    A : array_like or sparse matrix
         The matrix of the linear system.
     b : array_like
         The right-hand side vector of the linear system.
     x0 : array_like
         The initial guess for the solution.
+    colors : array_like of int, optional
+        The color of each unknown. Unknowns sharing a color must not be
+        coupled in A. By default, unknown i gets color i mod (p+1) where p is
+        the bandwidth of A, e.g. red-black ordering for a tridiagonal matrix.
     tol : float, optional
         The tolerance for the stopping criterion.
     maxiter : int, optional
         The maximum number of iterations.
+    history : {"list", "array", "none"}, optional
+        How the `inc` history is stored (see `tan.history.History`): a list
+        (default), a preallocated NumPy array, or not at all (None is returned).
+    callback : callable, optional
+        Called after each iteration as callback(niter, x, inc) with the new
+        iterate x and its increment; returning True stops the iterations.
 
     Returns
     -------
@@ -68,23 +170,36 @@ def gauss_seidel2(A, b, x0, tol=1e-6, maxiter=100):
     inc : array_like
         The increment at each iteration.
     """
-    x = x0.copy()
+    if is_operator(A):
+        raise TypeError("multicolor Gauss-Seidel needs the rows of A, "
+                        "which a LinearOperator does not provide")
+    if colors is None:
+        colors = np.arange(size(A)) % (bandwidth(A) + 1)
+    colors = np.asarray(colors)
+    if is_sparse(A):
+        A = A.tocsr()
+    b = np.asarray(b, dtype=float)
+    d = diagonal(A)
+    sweeps = []
+    for c in np.unique(colors):
+        idx = np.flatnonzero(colors == c)
+        sweeps.append((idx, A[idx], b[idx], d[idx]))
+    x = np.array(x0, dtype=float)
+    x_old = np.empty_like(x)
     niter = 0
-    inc = []
-    D=np.diag(np.diag(A))
-    E=-np.tril(A,-1)
-    F=-np.triu(A,1)
-    invB=np.linalg.inv(D-E)
-    B=scipy.linalg.solve_triangular(D-E,F,lower=True)
-    g=scipy.linalg.solve_triangular(D-E,b,lower=True)
-    x_new = np.zeros_like(x)
+    inc = History(history, maxiter)
     while True:
         niter += 1
-        x_new=np.dot(B,x)+g
-        inc.append(np.linalg.norm(x_new - x))
-        if inc[-1] < tol:
+        x_old[:] = x
+        for idx, rows, bc, dc in sweeps:
+            x[idx] += (bc - rows @ x) / dc
+        x_old -= x
+        e = np.linalg.norm(x_old)
+        inc.append(e)
+        if callback is not None and callback(niter, x, e):
+            break
+        if e < tol:
             break
         if niter == maxiter:
             break
-        x = x_new
-    return x, niter,inc
\ No newline at end of file
+    return x, niter, inc.result()
@@ -0,0 +1,138 @@
+import numpy as np
+import scipy.linalg
+from tan.history import History
+from tan.syslin.precond import aspreconditioner
+from tan.syslin.utils import size
+
+def gmres(A, b, P=None, x0=None, tol=1e-6, maxiter=100, atol=0.0, restart=20,
+          history="list", callback=None):
+    """
+    Calcule la solution du système linéaire Ax = b par la méthode GMRES(m) avec redémarrage.
+
+    Paramètres :
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        Matrice des coefficients, quelconque (non symétrique). Seuls des produits
+        A @ v sont utilisés.
+
+    b : ndarray, shape (n,)
+        Vecteur de droite.
+
+    P : Preconditioner, ndarray, matrice creuse ou LinearOperator, optionnel
+        Préconditionneur (voir `tan.syslin.precond`), appliqué à droite : on
+        résout A P^{-1} u = b puis x = P^{-1} u, de sorte que le résidu suivi
+        est celui du système initial. Par défaut, il s'agit de l'identité.
+
+    x0 : ndarray, shape (n,), optionnel
+        Estimation initiale de la solution. Par défaut, il s'agit d'un vecteur nul.
+
+    tol : float, optionnel
+        Tolérance sur la norme résiduelle relative ||r|| / ||r0||. La valeur par défaut est 1e-6.
+
+    maxiter : int, optionnel
+        Nombre maximal d'itérations (produits matrice-vecteur), tous cycles confondus.
+
+    atol : float, optionnel
+        Tolérance absolue sur la norme résiduelle ||r||. La valeur par défaut est 0.
+
+    restart : int, optionnel
+        Dimension m de l'espace de Krylov avant redémarrage. La valeur par défaut est 20.
+
+    history : {"list", "array", "none"}, optionnel
+        Le stockage des historiques `inc` et `res` (voir `tan.history.History`).
+
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc, res) ; si elle
+        retourne True, les itérations s'arrêtent. L'itéré x n'est formé à chaque
+        itération que si un callback est donné.
+
+    Retourne :
+    -------
+    x : ndarray, shape (n,)
+        Solution approximative de Ax = b.
+
+    niter : int
+        Nombre d'itérations effectuées.
+
+    inc : liste
+        L'incrément ||P (x_k - x_{k-1})|| à chaque itération (l'incrément de x
+        lorsque P = I).
+
+    res : list
+        La norme résiduelle relative à chaque itération.
+
+    Notes :
+    -----
+    Chaque itération effectue un produit A @ v, une application du
+    préconditionneur et l'orthogonalisation du nouveau vecteur contre la base
+    de Krylov (Gram-Schmidt classique réorthogonalisé, soit deux produits
+    matrice-vecteur avec la base), pour un coût O(nnz + m n). La matrice de
+    Hessenberg est triangularisée au fur et à mesure par des rotations de
+    Givens, ce qui donne la norme du résidu sans former x. La mémoire est
+    O(m n). L'itéré est mis à jour et le résidu recalculé à chaque redémarrage.
+    """
+    n = size(A)
+    P = aspreconditioner(P)
+    b = np.asarray(b, dtype=float)
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float)
+    r = b - A @ x
+    nr0 = np.linalg.norm(r)
+    res = History(history, maxiter + 1)
+    res.append(1)
+    inc = History(history, maxiter)
+    niter = 0
+    if nr0 == 0:
+        return x, niter, inc.result(), res.result()
+    m = min(restart, n)
+    V = np.empty((m + 1, n))
+    H = np.zeros((m + 1, m))
+    cs = np.empty(m)
+    sn = np.empty(m)
+    g = np.empty(m + 1)
+    beta = nr0
+    done = False
+    while not done and niter < maxiter:
+        V[0] = r / beta
+        g[:] = 0
+        g[0] = beta
+        y_old = np.zeros(0)
+        for j in range(m):
+            niter += 1
+            w = A @ P.apply(V[j])
+            h = V[:j+1] @ w
+            w -= V[:j+1].T @ h
+            h2 = V[:j+1] @ w
+            w -= V[:j+1].T @ h2
+            h += h2
+            hn = np.linalg.norm(w)
+            H[:j+1, j] = h
+            for i in range(j):
+                H[i, j], H[i+1, j] = (cs[i] * H[i, j] + sn[i] * H[i+1, j],
+                                      -sn[i] * H[i, j] + cs[i] * H[i+1, j])
+            d = np.hypot(H[j, j], hn)
+            if d == 0:
+                raise np.linalg.LinAlgError("Matrice singulière")
+            cs[j], sn[j] = H[j, j] / d, hn / d
+            H[j, j] = d
+            g[j+1] = -sn[j] * g[j]
+            g[j] *= cs[j]
+            k = j + 1
+            y = scipy.linalg.solve_triangular(H[:k, :k], g[:k])
+            e = np.sqrt(np.sum((y[:-1] - y_old) ** 2) + y[-1] ** 2)
+            y_old = y
+            rn = abs(g[k]) / nr0
+            inc.append(e)
+            res.append(rn)
+            if callback is not None and callback(niter, x + P.apply(V[:k].T @ y), e, rn):
+                done = True
+            if rn < tol or rn * nr0 <= atol or hn == 0:
+                done = True
+            if done or niter == maxiter:
+                break
+            V[j+1] = w / hn
+        x += P.apply(V[:k].T @ y)
+        r = b - A @ x
+        beta = np.linalg.norm(r)
+        if beta == 0:
+            break
+    return x, niter, inc.result(), res.result()
@@ -1,19 +1,27 @@
 import numpy as np
+import scipy.sparse as sp
+from tan.eig.gershgorin import gershgorin_bounds
+from tan.history import History
+from tan.syslin.precond import Identity, Jacobi, aspreconditioner
+from tan.syslin.splitting import RichardsonSplitting, stationary
+from tan.syslin.utils import is_operator, is_sparse, size
 
-def gradient(A, b, P=None, x0=None, tol=1e-6, maxiter=100):
+def gradient(A, b, P=None, x0=None, tol=1e-6, maxiter=100, history="list", callback=None):
     """
     Calcule la solution du système linéaire Ax = b en utilisant la méthode de descente de gradient préconditionnée.
     
     Paramètres :
     ----------
-    A : ndarray, shape (n, n)
-        Matrice des coefficients.
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        Matrice des coefficients. Seuls des produits A @ z sont utilisés.
     
     b : ndarray, shape (n,)
         Vecteur de droite.
     
-    P : ndarray, shape (n, n), optionnel
-        Matrice de préconditionnement. Par défaut, il s'agit de la matrice d'identité.
+    P : Preconditioner, ndarray, matrice creuse ou LinearOperator, optionnel
+        Préconditionneur (voir `tan.syslin.precond`). Par défaut, il s'agit de la
+        matrice d'identité. Une matrice est factorisée une seule fois, un
+        LinearOperator représente directement l'action de P^{-1}.
     
     x0 : ndarray, shape (n,), optionnel
         Estimation initiale de la solution. Par défaut, il s'agit d'un vecteur nul.
@@ -23,6 +31,14 @@ def gradient(A, b, P=None, x0=None, tol=1e-6, maxiter=100):
     
     tol : float, optionnel
         Tolérance pour le critère de convergence de la norme résiduelle. La valeur par défaut est 1e-6.
+
+    history : {"list", "array", "none"}, optionnel
+        Le stockage des historiques `inc` et `res` (voir `tan.history.History`) :
+        listes (par défaut), tableaux NumPy préalloués, ou aucun (None est retourné).
+
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc, res) ; si elle
+        retourne True, les itérations s'arrêtent.
     
     Retourne :
     -------
@@ -43,53 +59,72 @@ def gradient(A, b, P=None, x0=None, tol=1e-6, maxiter=100):
     La méthode de descente de gradient préconditionnée utilise la matrice P pour accélérer la convergence. La méthode itère 
     tant que la norme résiduelle est supérieure à la tolérance spécifiée ou jusqu'à ce que le nombre maximal d'itérations soit atteint.
     """
-    if P is None:
-        P = np.eye(len(A))
     if x0 is None:
-        x0 = np.zeros(len(A))
+        x0 = np.zeros(size(A))
+    P = aspreconditioner(P)
     niter = 0
     x = x0.copy()
     r = b - A @ x
     r0 = r
-    z = np.linalg.solve(P, r)
-    res = [1]
-    inc = []
+    z = P.apply(r)
+    res = History(history, maxiter + 1)
+    res.append(1)
+    inc = History(history, maxiter)
     # nous utilisons la norme du résidu relatif  pour le critère d'arrêt
     # nous calculons également l'incrément
     while niter < maxiter:
         alpha = np.dot(r, z) / np.dot(A @ z, z)
         x_new = x + alpha * z
         r = r - alpha * A @ z
-        z = np.linalg.solve(P, r)
-        res.append(np.linalg.norm(r)/np.linalg.norm(r0))
-        inc.append(np.linalg.norm(x_new - x))        
-        if res[-1] < tol:
+        z = P.apply(r)
+        rn = np.linalg.norm(r)/np.linalg.norm(r0)
+        e = np.linalg.norm(x_new - x)
+        res.append(rn)
+        inc.append(e)
+        if callback is not None and callback(niter + 1, x_new, e, rn):
+            break
+        if rn < tol:
             break
-        if inc[-1] < tol:
+        if e < tol:
             break
         x = x_new
         niter = niter + 1
-    return x, niter, inc, res
+    return x, niter, inc.result(), res.result()
 
-def richardson( A, b, x0=None, P=None, alpha=1.0, tol=1e-6, maxiter=100):
+def richardson( A, b, x0=None, P=None, alpha=1.0, tol=1e-6, maxiter=100, history="list",
+               callback=None, workspace=None):
     """Résolvez le système linéaire Ax = b en utilisant la méthode de Richardson.
     
     Paramètres
     ----------
-    A : array_like
+    A : array_like, matrice creuse ou LinearOperator
         La matrice du système linéaire.
     b : array_like
         Le vecteur de droite du système linéaire.
     x0 : semblable à un tableau, optionnel
         L'estimation initiale de la solution. Par défaut, il s'agit d'un vecteur nul.
-    P  : array_like, optionnel
-        La matrice de préconditionnement. Par défaut, il s'agit de la matrice identité.
+    P  : Preconditioner, array_like, matrice creuse ou LinearOperator, optionnel
+        Le préconditionneur (voir `tan.syslin.precond`). Par défaut, il s'agit de la
+        matrice identité. Une matrice est factorisée une seule fois, un
+        LinearOperator représente directement l'action de P^{-1}.
     alpha : float, optionnel
         Le paramètre de relaxation. La valeur par défaut est 1,0.
     tol : float, optionnel
         La tolérance pour le critère d'arrêt. La valeur par défaut est 1e-6.
     maxiter : int, optionnel
         Le nombre maximum d'itérations. La valeur par défaut est 100.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage de l'historique `inc` (voir `tan.history.History`) : liste
+        (par défaut), tableau NumPy préalloué, ou aucun (None est retourné).
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc, res) avec le
+        nouvel itéré, son incrément et la norme résiduelle relative ; si elle
+        retourne True, les itérations s'arrêtent. x est un vecteur de travail,
+        réutilisé à l'itération suivante.
+    workspace : Workspace, optionnel
+        Les vecteurs de travail (voir `tan.syslin.splitting.Workspace`), à
+        réutiliser d'une résolution à l'autre : sans préconditionneur ou avec
+        le préconditionneur de Jacobi, une itération n'alloue aucun vecteur.
     
     Retourne
     -------
@@ -101,26 +136,126 @@ def richardson( A, b, x0=None, P=None, alpha=1.0, tol=1e-6, maxiter=100):
         L'incrément à chaque itération.
     """
     if x0 is None:
-        x0 = np.zeros(len(A))
-    if P is None:
-        P = np.eye(len(A))
-    x = x0.copy()
+        x0 = np.zeros(size(A))
+    # x_new = x + alpha P^{-1} r, puis r = b - A x_new : un seul produit par A par itération
+    S = RichardsonSplitting(A, P, alpha)
+    return stationary(S, b, x0, tol, maxiter, history, callback, workspace=workspace)
+
+
+def chebyshev(A, b, x0=None, P=None, bounds=None, tol=1e-6, maxiter=100, check=10,
+              history="list", callback=None):
+    """Résolvez le système linéaire Ax = b par la méthode de Richardson accélérée de Chebyshev.
+
+    Les pas de Richardson sont choisis de sorte que le polynôme d'erreur soit le
+    polynôme de Chebyshev (translaté) sur l'intervalle [lmin, lmax] contenant
+    le spectre de P^{-1}A, ce qui donne le facteur de réduction optimal
+    (sqrt(kappa) - 1) / (sqrt(kappa) + 1), kappa = lmax / lmin, par itération.
+    Les pas ne dépendent que des bornes : chaque itération coûte un produit
+    A @ d, une application du préconditionneur et aucun produit scalaire. La
+    norme du résidu (seule réduction globale) n'est calculée que toutes les
+    `check` itérations pour le test d'arrêt.
+
+    Paramètres
+    ----------
+    A : array_like, matrice creuse ou LinearOperator
+        La matrice du système linéaire, à spectre réel positif (symétrique
+        définie positive par exemple).
+    b : array_like
+        Le vecteur de droite du système linéaire.
+    x0 : semblable à un tableau, optionnel
+        L'estimation initiale de la solution. Par défaut, il s'agit d'un vecteur nul.
+    P : Preconditioner, array_like, matrice creuse ou LinearOperator, optionnel
+        Le préconditionneur (voir `tan.syslin.precond`). Par défaut, il s'agit de la
+        matrice identité.
+    bounds : tuple (lmin, lmax), optionnel
+        Un encadrement 0 < lmin <= lmax du spectre de P^{-1}A. Par défaut, il
+        est obtenu par les disques de Gershgorin (`tan.eig.gershgorin`) de A,
+        ou de D^{-1}A avec le préconditionneur `Jacobi` ; les autres
+        préconditionneurs et les LinearOperator demandent des bornes explicites.
+    tol : float, optionnel
+        La tolérance sur la norme résiduelle relative. La valeur par défaut est 1e-6.
+    maxiter : int, optionnel
+        Le nombre maximum d'itérations. La valeur par défaut est 100.
+    check : int, optionnel
+        Le nombre d'itérations entre deux calculs de la norme résiduelle.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage de l'historique `res` (voir `tan.history.History`).
+    callback : callable, optionnel
+        Appelée à chaque calcul de la norme résiduelle par callback(niter, x, res) ;
+        si elle retourne True, les itérations s'arrêtent.
+
+    Retourne
+    -------
+    x : array_like
+        La solution du système linéaire.
+    niter : int
+        Le nombre d'itérations effectuées.
+    res : array_like
+        La norme résiduelle relative initiale (1) puis toutes les `check` itérations.
+    """
+    if x0 is None:
+        x0 = np.zeros(size(A))
+    P = aspreconditioner(P)
+    if bounds is None:
+        bounds = _gershgorin_bounds(A, P)
+    lmin, lmax = bounds
+    if not 0 < lmin <= lmax:
+        raise ValueError(f"Les bornes du spectre doivent vérifier 0 < lmin <= lmax, "
+                         f"obtenu [{lmin}, {lmax}]")
+    theta = (lmax + lmin) / 2
+    # delta = 0 (spectre réduit à un point) donnerait sigma infini
+    delta = max((lmax - lmin) / 2, 1e-12 * theta)
+    sigma = theta / delta
+    x = np.array(x0, dtype=float)
     r = b - A @ x
-    r0 = r
-    niter = 0   
-    res = [1]
-    inc = []
-    while True:
+    nr0 = np.linalg.norm(r)
+    res = History(history, maxiter // check + 2)
+    res.append(1)
+    niter = 0
+    if nr0 == 0:
+        return x, niter, res.result()
+    rho = 1 / sigma
+    d = P.apply(r) / theta
+    q = np.empty_like(x)
+    while niter < maxiter:
         niter += 1
-        d = np.linalg.solve(P, b - A @ x)
-        x_new = x + alpha * d
-        res.append(np.linalg.norm(b - A @ x_new)/np.linalg.norm(r0))
-        inc.append(np.linalg.norm(x_new - x))
-        if res[-1] < tol:
-            break
-        if inc[-1] < tol:
-            break
-        if niter == maxiter:
-            break
-        x = x_new
-    return x, niter, inc
+        x += d
+        if isinstance(A, np.ndarray):
+            np.dot(A, d, out=q)
+        else:
+            q[:] = A @ d
+        r -= q
+        if niter % check == 0 or niter == maxiter:
+            rn = np.linalg.norm(r) / nr0
+            res.append(rn)
+            if callback is not None and callback(niter, x, rn):
+                break
+            if rn < tol:
+                break
+        z = P.apply(r)
+        rho_new = 1 / (2 * sigma - rho)
+        d *= rho_new * rho
+        d += (2 * rho_new / delta) * z
+        rho = rho_new
+    return x, niter, res.result()
+
+
+def _gershgorin_bounds(A, P):
+    """Encadrement du spectre de P^{-1}A par les disques de Gershgorin."""
+    if is_operator(A):
+        raise TypeError("les disques de Gershgorin demandent les coefficients de A : "
+                        "donner les bornes du spectre via `bounds`")
+    if isinstance(P, Identity):
+        lmin, lmax = gershgorin_bounds(A)
+    elif isinstance(P, Jacobi):
+        if is_sparse(A):
+            lmin, lmax = gershgorin_bounds(sp.diags(P.invd) @ A)
+        else:
+            lmin, lmax = gershgorin_bounds(np.asarray(A) * P.invd[:, None])
+    else:
+        raise ValueError("bornes de Gershgorin disponibles seulement sans préconditionneur "
+                         "ou avec Jacobi : donner les bornes du spectre via `bounds`")
+    if lmin <= 0:
+        raise ValueError("les disques de Gershgorin contiennent 0 : donner les bornes "
+                         "du spectre via `bounds`")
+    return lmin, lmax
@@ -1,12 +1,20 @@
 import numpy as np
+from tan.history import History
+from tan.syslin.batched import is_batched, jacobi_batched
+from tan.syslin.outofcore import as_stream, is_stream
+from tan.syslin.splitting import JacobiSplitting, stationary
+from tan.syslin.utils import diagonal, is_operator, is_sparse, iterate_columns, scale_rows
 
-def jacobi1(A, b, x0, tol=1e-6, maxiter=100):
+def jacobi1(A, b, x0, tol=1e-6, maxiter=100, history="list", callback=None):
     """Résolvez le système linéaire Ax = b en utilisant la méthode de Jacobi.
 
     Paramètres
     ----------
-    A : array_like
-        La matrice du système linéaire.
+    A : array_like, matrice creuse, LinearOperator, np.memmap ou chemin
+        La matrice du système linéaire. Une matrice creuse ou un LinearOperator
+        (qui doit fournir `diagonal()`) est traité par la version vectorisée
+        `jacobi2`, de même qu'une matrice sur disque (np.memmap ou fichier
+        `.npy`), lue par blocs de lignes (voir `tan.syslin.outofcore`).
     b : array_like
         Le vecteur de droite du système linéaire.
     x0 : semblable à un tableau
@@ -15,6 +23,13 @@ def jacobi1(A, b, x0, tol=1e-6, maxiter=100):
         La tolérance pour le critère d'arrêt.
     maxiter : int, optionnel
         Le nombre maximum d'itérations.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage de l'historique `inc` (voir `tan.history.History`) : liste
+        (par défaut), tableau NumPy préalloué, ou aucun (None est retourné).
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc) avec le
+        nouvel itéré x et son incrément ; si elle retourne True, les itérations
+        s'arrêtent.
 
     Retourne
     -------
@@ -25,61 +40,131 @@ def jacobi1(A, b, x0, tol=1e-6, maxiter=100):
     inc : array_like
         L'incrément à chaque itération.
     """
+    if is_sparse(A) or is_operator(A) or is_stream(A) or is_batched(A):
+        return jacobi2(A, b, x0, tol, maxiter, history=history, callback=callback)
     x = x0.copy()
     niter = 0
-    inc = []
+    inc = History(history, maxiter)
     while True:
         niter += 1
         x_new = np.zeros_like(x)
         for i in range(len(A)):
             x_new[i] = (b[i] - np.dot(A[i, :i], x[:i]) - np.dot(A[i, i+1:], x[i+1:])) / A[i, i] # <1>
-        inc.append(np.linalg.norm(x_new - x))
-        if inc[-1] < tol:
+        e = np.linalg.norm(x_new - x)
+        inc.append(e)
+        if callback is not None and callback(niter, x_new, e):
+            break
+        if e < tol:
             break
         if niter == maxiter:
             break
         x = x_new
-    return x, niter,inc
+    return x, niter, inc.result()
 
-def jacobi2( A, b, x0, tol=1e-6, maxiter=100):
+def jacobi2( A, b, x0, tol=1e-6, maxiter=100, omega=1.0, history="list", callback=None,
+            workspace=None):
     """Résolvez le système linéaire Ax = b en utilisant la méthode de Jacobi.
 
+    L'itération x_new = x + omega D^{-1}(b - Ax) est équivalente à
+    x_new = Bx + g avec B = D^{-1}N, mais la matrice d'itération n'est jamais
+    formée : seule la diagonale de A est extraite, une fois, et chaque itération
+    coûte un produit matrice-vecteur A @ x effectué en place.
+
     Paramètres
     ----------
-    A : array_like
-        La matrice du système linéaire.
-    b : array_like
-        Le vecteur de droite du système linéaire.
+    A : array_like, matrice creuse, LinearOperator, np.memmap ou chemin
+        La matrice du système linéaire. Un LinearOperator doit fournir sa
+        diagonale via une méthode `diagonal()`. Une matrice sur disque
+        (np.memmap ou fichier `.npy`) est lue séquentiellement par blocs de
+        lignes, une fois par itération (voir `tan.syslin.outofcore.MatrixStream`).
+    b : array_like, shape (n,) ou (n, k)
+        Le vecteur de droite du système linéaire. Avec k seconds membres, les
+        colonnes sont itérées ensemble (un produit matrice-matrice par itération)
+        et chaque colonne s'arrête dès qu'elle a convergé. Avec une pile de
+        matrices A de shape (batch, n, n) et b de shape (batch, n), les systèmes
+        indépendants sont itérés ensemble (voir `tan.syslin.batched`).
     x0 : semblable à un tableau
         L'estimation initiale de la solution.
     tol : float, optionnel
         La tolérance pour le critère d'arrêt.
     maxiter : int, optionnel
         Le nombre maximum d'itérations.
+    omega : float, optionnel
+        Le paramètre de relaxation de la méthode de Jacobi pondérée.
+        La valeur par défaut 1.0 donne la méthode de Jacobi classique.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage de l'historique `inc` (voir `tan.history.History`) : liste
+        (par défaut), tableau NumPy préalloué, ou aucun (None est retourné).
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc) avec le
+        nouvel itéré x et son incrément ; si elle retourne True, les itérations
+        s'arrêtent. Avec un seul second membre, x est un vecteur de travail
+        réutilisé à l'itération suivante.
+    workspace : Workspace, optionnel
+        Les vecteurs de travail (voir `tan.syslin.splitting.Workspace`), à
+        réutiliser d'une résolution à l'autre : une itération n'alloue alors
+        aucun vecteur.
 
     Retourne
     --------
     x : array_like
         La solution du système linéaire.
-    niter : int
-        Le nombre d'itérations effectuées.
+    niter : int ou ndarray de shape (k,)
+        Le nombre d'itérations effectuées (pour chaque colonne si b est 2D).
     inc : array_like
         L'incrément à chaque itération.
     """
-    x = x0.copy()
-    niter = 0
-    D=np.diag(np.diag(A))
-    N = D-A
-    B = np.linalg.inv(D).dot(N) # <2>
-    g = np.linalg.inv(D).dot(b) 
-    inc = []
-    while True:
-        niter += 1
-        x_new = B.dot(x) + g # <3>
-        inc.append(np.linalg.norm(x_new - x))
-        if inc[-1] < tol:
-            break
-        if niter == maxiter:
+    if is_batched(A):
+        return jacobi_batched(A, b, x0, tol, maxiter, omega, history, callback)
+    if is_stream(A):
+        A = as_stream(A)
+    S = JacobiSplitting(A, omega) # <2>
+    if np.ndim(b) == 2:
+        return iterate_columns(lambda x, b: x + scale_rows(S.w, b - A @ x), b, x0, tol, maxiter,
+                               history, callback)
+    # une itération : dx = omega D^{-1}(b - Ax) en place, puis x_new = x + dx
+    return stationary(S, b, x0, tol, maxiter, history, callback, workspace=workspace) # <3>
+
+
+def jacobi_spectral_radius(A, maxiter=20, x0=None):
+    """Estime le rayon spectral de la matrice d'itération de Jacobi B = I - D^{-1}A.
+
+    On effectue quelques itérations de la puissance sur B sans jamais la former :
+    chaque application de B coûte un produit A @ x. Le rayon spectral est estimé
+    par le rapport des normes de deux itérés successifs, ce qui reste valable
+    lorsque B possède une paire de valeurs propres ±rho (matrices tridiagonales
+    par exemple). La norme utilisée est celle associée à |D| : lorsque A est
+    symétrique, B est autoadjointe pour ce produit scalaire et l'estimation croît
+    de façon monotone vers rho.
+
+    Paramètres
+    ----------
+    A : array_like, matrice creuse ou LinearOperator
+        La matrice du système linéaire.
+    maxiter : int, optionnel
+        Le nombre d'itérations de la puissance.
+    x0 : array_like, optionnel
+        Le vecteur initial. Par défaut, un vecteur aléatoire (graine fixée).
+
+    Retourne
+    --------
+    rho : float
+        Une estimation (par défaut) du rayon spectral de B.
+    x : ndarray
+        Le dernier itéré normalisé, qui peut être passé en `x0` pour poursuivre
+        les itérations et affiner l'estimation.
+    """
+    d = diagonal(A)
+    w = np.abs(d)
+    if x0 is None:
+        x0 = np.random.default_rng(0).random(len(d))
+    x = np.array(x0, dtype=float)
+    x /= np.sqrt(np.dot(w * x, x))
+    rho = 0.0
+    for _ in range(maxiter):
+        y = x - (A @ x) / d
+        rho = np.sqrt(np.dot(w * y, y))
+        if rho == 0:
             break
-        x = x_new
-    return x, niter, inc
\ No newline at end of file
+        x = y / rho
+    return rho, x
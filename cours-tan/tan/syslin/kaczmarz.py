@@ -0,0 +1,213 @@
+import os
+
+import numpy as np
+import scipy.linalg
+from tan.history import History
+from tan.syslin.utils import is_sparse
+
+
+def kaczmarz(A, b=None, x0=None, tol=1e-6, maxiter=100, block=1, average=True, history="list",
+             callback=None, seed=0):
+    """Résout le système compatible Ax = b par la méthode de Kaczmarz randomisée (par blocs).
+
+    Chaque pas projette l'itéré sur l'ensemble des solutions d'un bloc de
+    lignes A_I x = b_I, le bloc étant tiré avec une probabilité proportionnelle
+    à ||A_I||_F^2 (Strohmer et Vershynin pour une ligne, Needell et Tropp par
+    blocs). Une itération (une époque) effectue autant de pas qu'il y a de
+    blocs : le coût d'une itération est un parcours de A. Seuls x, un paquet de
+    lignes et les normes des blocs de ce paquet sont en mémoire, si bien que A
+    peut être un fichier bien plus grand que la mémoire, ou un flux de lignes.
+
+    Paramètres
+    ----------
+    A : ndarray, np.memmap, chemin d'un `.npy`, matrice creuse, callable ou itérable
+        La matrice, de shape (m, n), typiquement avec m >> n.
+
+        - ndarray, np.memmap, chemin ou matrice creuse (CSR) : accès aléatoire
+          aux paquets de lignes. Les normes des paquets sont calculées par un
+          premier parcours, puis chaque époque tire les blocs en deux temps
+          (voir `_random_access`).
+        - callable : appelée sans argument au début de chaque époque, elle
+          retourne un itérable de paquets (A_rows, b_rows) de lignes
+          consécutives ; les blocs sont alors tirés dans chaque paquet, avec
+          des probabilités proportionnelles à leurs normes, autant de fois que
+          le paquet contient de blocs. b n'est pas utilisé.
+        - itérable de paquets (A_rows, b_rows) : comme un callable, mais il ne
+          peut être parcouru qu'une fois (une seule itération).
+    b : ndarray, np.memmap ou chemin d'un `.npy`, shape (m,)
+        Le second membre, pour une matrice à accès aléatoire.
+    x0 : ndarray, shape (n,), optionnel
+        L'estimation initiale (nulle par défaut).
+    tol : float, optionnel
+        La tolérance sur la norme de l'incrément d'une époque.
+    maxiter : int, optionnel
+        Le nombre maximum d'époques.
+    block : int, optionnel
+        Le nombre de lignes d'un bloc (1 pour Kaczmarz classique).
+    average : bool, optionnel
+        Si True (par défaut), un bloc est traité par deux produits
+        matrice-vecteur (BLAS) : x += (||r||^2 / ||A_I^T r||^2) A_I^T r, avec
+        r = b_I - A_I x. C'est la moyenne des projections sur chaque ligne du
+        bloc, pondérées par leurs normes, avec le pas extrapolé optimal
+        (Necoara). Si False, x est projeté exactement sur {A_I x = b_I} par un
+        problème de moindres carrés de taille block x n.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage de l'historique `inc` (voir `tan.history.History`).
+    callback : callable, optionnel
+        Appelée après chaque époque par callback(niter, x, inc) ; si elle
+        retourne True, les itérations s'arrêtent.
+    seed : int, optionnel
+        La graine du générateur aléatoire.
+
+    Retourne
+    --------
+    x : ndarray, shape (n,)
+        La solution approchée.
+    niter : int
+        Le nombre d'époques effectuées.
+    inc : array_like
+        La norme de l'incrément de chaque époque.
+    """
+    if block < 1:
+        raise ValueError(f"block doit être un entier strictement positif, pas {block}")
+    rng = np.random.default_rng(seed)
+    if isinstance(A, (str, os.PathLike)):
+        A = np.load(A, mmap_mode="r")
+    if isinstance(b, (str, os.PathLike)):
+        b = np.load(b, mmap_mode="r")
+    if isinstance(A, np.ndarray) or is_sparse(A):
+        if is_sparse(A):
+            A = A.tocsr()
+        if b is None or len(b) != A.shape[0]:
+            raise ValueError(f"b doit être de taille {A.shape[0]}")
+        if x0 is None:
+            x0 = np.zeros(A.shape[1])
+        epoch = _random_access(A, b, block, rng)
+        once = False
+    elif callable(A) or hasattr(A, "__iter__"):
+        epoch = _streamed(A, block, rng)
+        once = not callable(A)
+    else:
+        raise TypeError(f"type de matrice non pris en charge : {type(A).__name__}")
+    step = _project_average if average else _project
+    x = None if x0 is None else np.array(x0, dtype=float)
+    x_old = None
+    niter = 0
+    inc = History(history, maxiter)
+    while niter < maxiter:
+        niter += 1
+        for R, br in epoch():
+            if x is None:
+                x = np.zeros(R.shape[1])
+            if x_old is None:
+                x_old = x.copy()
+            step(x, R, br)
+        if x is None:
+            raise ValueError("le flux de lignes est vide")
+        x_old -= x
+        e = np.linalg.norm(x_old)
+        inc.append(e)
+        if callback is not None and callback(niter, x, e):
+            break
+        if e < tol:
+            break
+        if once:
+            break
+        x_old = None
+    return x, niter, inc.result()
+
+
+def _random_access(A, b, block, rng, chunk_bytes=2**26):
+    """Générateur des blocs d'une époque, tirés avec des probabilités proportionnelles à ||A_I||_F^2.
+
+    A est découpée en paquets de lignes consécutives d'environ `chunk_bytes`
+    octets, dont seules les normes ||A_C||_F^2 sont conservées (calculées une
+    fois, par un parcours séquentiel de A). Le tirage se fait en deux temps :
+    le nombre de blocs tirés dans chaque paquet suit une loi multinomiale de
+    probabilités proportionnelles aux normes des paquets, puis, les paquets
+    étant parcourus dans un ordre aléatoire, les blocs sont tirés dans chaque
+    paquet proportionnellement à leurs normes, calculées au chargement du
+    paquet. Chaque bloc est ainsi tiré avec la même probabilité qu'en un seul
+    temps, mais la mémoire est en O(m / rows + rows / block) au lieu de
+    O(m / block), et A est lue par paquets contigus.
+    """
+    m, n = A.shape
+    rows = max(block, chunk_bytes // (8 * n) // block * block)
+    chunks = np.arange(0, m, rows)
+    norms = np.array([_row_norms(A[s:s + rows]).sum() for s in chunks])
+    total = norms.sum()
+    if total == 0:
+        raise ValueError("la matrice est nulle")
+    nblocks = -(-m // block)
+
+    def blocks():
+        counts = rng.multinomial(nblocks, norms / total)
+        for c in rng.permutation(len(chunks)):
+            if counts[c] == 0:
+                continue
+            s = chunks[c]
+            R = A[s:s + rows]
+            br = np.asarray(b[s:s + rows], dtype=float)
+            starts = np.arange(0, R.shape[0], block)
+            bn = np.add.reduceat(_row_norms(R), starts)
+            p = bn / bn.sum()
+            # tirages par lots d'au plus len(starts) indices
+            for size in _batches(counts[c], len(starts)):
+                for k in rng.choice(len(starts), size=size, p=p):
+                    i = starts[k]
+                    yield R[i:i + block], br[i:i + block]
+
+    return blocks
+
+
+def _batches(count, size):
+    """Découpe count en lots d'au plus size."""
+    while count > 0:
+        yield min(count, size)
+        count -= size
+
+
+def _streamed(A, block, rng):
+    """Générateur des blocs d'une époque : blocs tirés dans chaque paquet d'un flux de lignes."""
+
+    def blocks():
+        for R, br in A() if callable(A) else A:
+            R = np.asarray(R, dtype=float) if not is_sparse(R) else R.tocsr()
+            br = np.asarray(br, dtype=float)
+            if R.ndim == 1:
+                R, br = R[None, :], np.atleast_1d(br)
+            starts = np.arange(0, R.shape[0], block)
+            rn = _row_norms(R)
+            norms = np.add.reduceat(rn, starts)
+            total = norms.sum()
+            if total == 0:
+                continue
+            for k in rng.choice(len(starts), size=len(starts), p=norms / total):
+                s = starts[k]
+                yield R[s:s + block], br[s:s + block]
+
+    return blocks
+
+
+def _project_average(x, R, br):
+    """x += (||r||^2 / ||R^T r||^2) R^T r, avec r = b_I - R x : deux produits matrice-vecteur."""
+    r = br - R @ x
+    g = R.T @ r
+    gg = np.dot(g, g)
+    if gg > 0:
+        x += (np.dot(r, r) / gg) * g
+
+
+def _project(x, R, br):
+    """Projection exacte de x sur {R x = b_I} : x += R^+ (b_I - R x)."""
+    r = br - R @ x
+    if is_sparse(R):
+        R = R.toarray()
+    x += scipy.linalg.lstsq(R, r, check_finite=False)[0]
+
+
+def _row_norms(R):
+    """Les carrés des normes des lignes de R."""
+    if is_sparse(R):
+        return np.asarray(R.multiply(R).sum(axis=1)).ravel()
+    return np.einsum("ij,ij->i", R, R)
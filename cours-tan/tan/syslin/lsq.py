@@ -0,0 +1,183 @@
+import numpy as np
+from tan.history import History
+
+
+def cgls(A, b, x0=None, tol=1e-6, maxiter=100, atol=0.0, history="list", callback=None):
+    """
+    Calcule la solution au sens des moindres carrés de Ax = b, min ||b - Ax||, par la méthode CGLS.
+
+    Paramètres :
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (m, n)
+        Matrice des coefficients, typiquement avec m >= n. Seuls des produits
+        A @ p et A.T @ r sont utilisés (un LinearOperator doit donc fournir
+        `rmatvec`) : A^T A n'est jamais formée.
+
+    b : ndarray, shape (m,)
+        Vecteur de droite.
+
+    x0 : ndarray, shape (n,), optionnel
+        Estimation initiale de la solution. Par défaut, il s'agit d'un vecteur nul.
+
+    tol : float, optionnel
+        Tolérance pour le critère de convergence de la norme relative
+        ||A^T r|| / ||A^T r0|| du résidu des équations normales (r = b - Ax
+        ne tend pas vers zéro si le système est incompatible) et de l'incrément.
+
+    maxiter : int, optionnel
+        Nombre maximal d'itérations pour le solveur.
+
+    atol : float, optionnel
+        Tolérance absolue sur ||A^T r||. La valeur par défaut est 0.
+
+    history : {"list", "array", "none"}, optionnel
+        Le stockage des historiques `inc` et `res` (voir `tan.history.History`).
+
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc, res) ; si elle
+        retourne True, les itérations s'arrêtent.
+
+    Retourne :
+    -------
+    x : ndarray, shape (n,)
+        Solution approximative au sens des moindres carrés.
+
+    niter : int
+        Nombre d'itérations effectuées.
+
+    inc : liste
+        L'incrément à chaque itération.
+
+    res : list
+        La norme relative ||A^T r|| / ||A^T r0|| à chaque itération.
+
+    Notes :
+    -----
+    CGLS est le gradient conjugué appliqué aux équations normales
+    A^T A x = A^T b, réorganisé pour ne faire qu'un produit par A et un produit
+    par A^T par itération, sans former A^T A : former A^T A coûte O(m n^2) pour
+    une matrice dense et élève le conditionnement au carré dès la formation,
+    alors que CGLS travaille avec le résidu r = b - Ax. La convergence dépend
+    néanmoins de cond(A)^2 ; `lsqr` est mathématiquement équivalente et plus
+    stable lorsque A est mal conditionnée.
+    """
+    m, n = A.shape
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float)
+    r = np.asarray(b, dtype=float) - A @ x
+    s = A.T @ r
+    gamma = np.dot(s, s)
+    ns0 = np.sqrt(gamma)
+    res = History(history, maxiter + 1)
+    res.append(1)
+    inc = History(history, maxiter)
+    niter = 0
+    if ns0 == 0:
+        return x, niter, inc.result(), res.result()
+    p = s.copy()
+    while niter < maxiter:
+        niter += 1
+        q = A @ p
+        alpha = gamma / np.dot(q, q)
+        x += alpha * p
+        r -= alpha * q
+        s = A.T @ r
+        gamma_new = np.dot(s, s)
+        rn = np.sqrt(gamma_new) / ns0
+        e = abs(alpha) * np.linalg.norm(p)
+        res.append(rn)
+        inc.append(e)
+        if callback is not None and callback(niter, x, e, rn):
+            break
+        if rn < tol or rn * ns0 <= atol:
+            break
+        if e < tol:
+            break
+        p *= gamma_new / gamma
+        p += s
+        gamma = gamma_new
+    return x, niter, inc.result(), res.result()
+
+
+def lsqr(A, b, x0=None, tol=1e-6, maxiter=100, atol=0.0, history="list", callback=None):
+    """
+    Calcule la solution au sens des moindres carrés de Ax = b, min ||b - Ax||, par la méthode LSQR.
+
+    Paramètres :
+    ----------
+    A, b, x0, tol, maxiter, atol, history, callback :
+        Voir `cgls`.
+
+    Retourne :
+    -------
+    x, niter, inc, res :
+        Voir `cgls`. La norme ||A^T r|| est ici estimée par la récurrence, sans
+        produit supplémentaire.
+
+    Notes :
+    -----
+    LSQR (Paige et Saunders) construit par la bidiagonalisation de Golub-Kahan
+    des bases orthonormées U_k et V_k telles que A V_k = U_{k+1} B_k, avec B_k
+    bidiagonale inférieure, puis minimise ||beta_1 e_1 - B_k y|| par des
+    rotations de Givens appliquées au fur et à mesure : x = x0 + V_k y est mis
+    à jour par une récurrence courte. Chaque itération fait un produit par A et
+    un produit par A^T. Les itérés sont en arithmétique exacte ceux de `cgls`,
+    mais LSQR ne passe jamais par A^T r et se comporte mieux lorsque A est mal
+    conditionnée.
+    """
+    m, n = A.shape
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float)
+    u = np.asarray(b, dtype=float) - A @ x
+    beta = np.linalg.norm(u)
+    res = History(history, maxiter + 1)
+    res.append(1)
+    inc = History(history, maxiter)
+    niter = 0
+    if beta == 0:
+        return x, niter, inc.result(), res.result()
+    u /= beta
+    v = A.T @ u
+    alpha = np.linalg.norm(v)
+    ns0 = alpha * beta
+    if alpha == 0:
+        return x, niter, inc.result(), res.result()
+    v /= alpha
+    w = v.copy()
+    phibar = beta
+    rhobar = alpha
+    while niter < maxiter:
+        niter += 1
+        # bidiagonalisation de Golub-Kahan
+        u *= -alpha
+        u += A @ v
+        beta = np.linalg.norm(u)
+        if beta > 0:
+            u /= beta
+            v *= -beta
+            v += A.T @ u
+            alpha = np.linalg.norm(v)
+            if alpha > 0:
+                v /= alpha
+        else:
+            alpha = 0.0
+        # rotation de Givens éliminant beta
+        rho = np.hypot(rhobar, beta)
+        c = rhobar / rho
+        s = beta / rho
+        theta = s * alpha
+        rhobar = -c * alpha
+        phi = c * phibar
+        phibar = s * phibar
+        x += (phi / rho) * w
+        e = abs(phi / rho) * np.linalg.norm(w)
+        w *= -theta / rho
+        w += v
+        rn = phibar * alpha * abs(c) / ns0
+        res.append(rn)
+        inc.append(e)
+        if callback is not None and callback(niter, x, e, rn):
+            break
+        if rn < tol or rn * ns0 <= atol:
+            break
+        if e < tol:
+            break
+    return x, niter, inc.result(), res.result()
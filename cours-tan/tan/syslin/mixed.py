@@ -0,0 +1,132 @@
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.linalg import lapack
+from tan.history import History
+from tan.syslin import direct
+from tan.syslin.utils import is_operator, is_sparse, size
+
+# En dessous de cet inverse du conditionnement (estimé sur les facteurs simple
+# précision), le raffinement converge trop lentement ou pas du tout : on passe
+# directement en double précision.
+RCOND_MIN = 100 * np.finfo(np.float32).eps
+
+
+def mixed_solve(A, b, spd=False, tol=None, maxiter=30, history="list", callback=None):
+    """Résout Ax = b par factorisation en simple précision et raffinement itératif en double.
+
+    A est factorisée en float32 (LAPACK sgetrf/spotrf pour une matrice dense,
+    SuperLU pour une matrice creuse) : la factorisation lit et écrit deux fois
+    moins d'octets et les opérations vectorielles traitent deux fois plus de
+    coefficients. La précision float64 est ensuite retrouvée par raffinement :
+
+        r = b - A x (en float64),  A d = r (facteurs float32),  x = x + d.
+
+    Chaque pas réduit l'erreur d'un facteur de l'ordre de kappa(A) eps_32, on
+    s'arrête comme LAPACK dsgesv dès que ||r|| <= ||x|| ||A|| eps_64 sqrt(n)
+    (norme infinie). Lorsque ce n'est pas sûr, on se replie sur la résolution
+    directe en float64 (`tan.syslin.direct.solve`) : estimation de l'inverse du
+    conditionnement des facteurs float32 inférieure à `RCOND_MIN` (matrice
+    dense), échec de la factorisation float32, corrections qui ne décroissent
+    plus d'un facteur 2, ou `maxiter` pas sans convergence.
+
+    Paramètres
+    ----------
+    A : ndarray ou matrice creuse, shape (n, n)
+        La matrice du système.
+    b : ndarray, shape (n,)
+        Le second membre.
+    spd : bool, optionnel
+        Si True, A est supposée symétrique définie positive (Cholesky pour une
+        matrice dense).
+    tol : float, optionnel
+        Tolérance sur l'erreur inverse ||r|| / (||A|| ||x||) ; par défaut
+        eps_64 sqrt(n).
+    maxiter : int, optionnel
+        Le nombre maximum de pas de raffinement.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage de l'historique `inc` (voir `tan.history.History`).
+    callback : callable, optionnel
+        Appelée après chaque pas par callback(niter, x, inc) ; si elle retourne
+        True, le raffinement s'arrête.
+
+    Retourne
+    --------
+    x : ndarray, shape (n,)
+        La solution.
+    niter : int
+        Le nombre de pas de raffinement effectués.
+    inc : list
+        La norme de la correction d à chaque pas.
+    precision : str
+        "float32" si le raffinement a convergé, "float64" en cas de repli.
+    """
+    if is_operator(A):
+        raise TypeError("la factorisation d'un LinearOperator n'est pas possible")
+    b = np.asarray(b, dtype=float)
+    n = size(A)
+    anorm = _norm_inf(A)
+    if tol is None:
+        tol = np.finfo(np.float64).eps * np.sqrt(n)
+    inc = History(history, maxiter)
+    niter = 0
+    try:
+        solve32, rcond = _factor32(A, spd)
+    except np.linalg.LinAlgError:
+        return direct.solve(A, b, spd=spd), niter, inc.result(), "float64"
+    if rcond is not None and rcond < RCOND_MIN:
+        return direct.solve(A, b, spd=spd), niter, inc.result(), "float64"
+    x = solve32(b)
+    e_old = np.inf
+    while niter < maxiter:
+        r = b - A @ x
+        if np.max(np.abs(r)) <= np.max(np.abs(x)) * anorm * tol:
+            return x, niter, inc.result(), "float32"
+        niter += 1
+        d = solve32(r)
+        e = np.linalg.norm(d)
+        inc.append(e)
+        if not e <= 0.5 * e_old:
+            break
+        x += d
+        e_old = e
+        if callback is not None and callback(niter, x, e):
+            return x, niter, inc.result(), "float32"
+    return direct.solve(A, b, spd=spd), niter, inc.result(), "float64"
+
+
+def _factor32(A, spd):
+    """Factorise A en float32 ; retourne la résolution (float64 -> float64) et rcond (ou None)."""
+    if is_sparse(A):
+        lu = spla.splu(sp.csc_matrix(A, dtype=np.float32))
+        return _scaled(lu.solve), None
+    A32 = np.asarray(A, dtype=np.float32)
+    anorm = float(np.max(np.sum(np.abs(A32), axis=0)))
+    if spd:
+        c = scipy.linalg.cho_factor(A32, check_finite=False)
+        rcond, _ = lapack.spocon(c[0], anorm, uplo="L" if c[1] else "U")
+        return _scaled(lambda r: scipy.linalg.cho_solve(c, r, check_finite=False)), rcond
+    lu, piv, info = lapack.sgetrf(A32)
+    if info > 0:
+        raise np.linalg.LinAlgError("Matrice singulière en simple précision")
+    rcond, _ = lapack.sgecon(lu, anorm, norm="1")
+    return _scaled(lambda r: lapack.sgetrs(lu, piv, r)[0]), rcond
+
+
+def _scaled(solve):
+    """Enveloppe une résolution float32 : le second membre est normalisé pour éviter
+    les dépassements de la simple précision, puis la solution est convertie en float64."""
+    def solve64(r):
+        s = np.max(np.abs(r))
+        if s == 0:
+            return np.zeros_like(r)
+        return s * solve((r / s).astype(np.float32)).astype(float)
+    return solve64
+
+
+def _norm_inf(A):
+    """Norme infinie de A (maximum des sommes des lignes en valeur absolue)."""
+    if is_sparse(A):
+        return float(np.max(abs(A).sum(axis=1)))
+    return float(np.max(np.sum(np.abs(A), axis=1)))
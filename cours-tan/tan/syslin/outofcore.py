@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse.linalg as spla
+
+
+class MatrixStream(spla.LinearOperator):
+    """Matrice dense lue sur disque par blocs de lignes, pour les systèmes qui ne tiennent pas en mémoire.
+
+    La matrice est un fichier `.npy` (ouvert en `np.memmap`) ou un `np.memmap`
+    déjà ouvert, stocké ligne par ligne (ordre C). Elle est parcourue
+    séquentiellement par blocs de lignes d'environ `block_bytes` octets : le
+    bloc suivant est lu par un thread pendant que le bloc courant est traité
+    (les copies NumPy libèrent le GIL), si bien qu'un parcours coûte le temps
+    de lecture du fichier. Seuls deux blocs sont en mémoire à la fois.
+
+    C'est un LinearOperator : `A @ x` est un parcours complet, `diagonal()`
+    est extraite lors du premier parcours puis conservée. `jacobi1` et `jacobi2`
+    l'utilisent comme tout opérateur (un parcours par itération) ; `sweep`
+    effectue une itération de Gauss-Seidel / SOR par blocs en un seul parcours,
+    pour `gauss_seidel1` et `sor1`.
+
+    Paramètres
+    ----------
+    A : str, os.PathLike, np.memmap ou ndarray, shape (n, n)
+        Le chemin d'un fichier `.npy` ou la matrice (un ndarray en mémoire est
+        accepté, les blocs sont alors des vues).
+    block_bytes : int, optionnel
+        La taille visée d'un bloc de lignes, 64 Mo par défaut.
+    """
+
+    def __init__(self, A, block_bytes=2**26):
+        if isinstance(A, (str, os.PathLike)):
+            A = np.load(A, mmap_mode="r")
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise ValueError(f"La matrice doit être carrée, shape {A.shape}")
+        if not A.flags.c_contiguous:
+            raise ValueError("La matrice doit être stockée ligne par ligne (ordre C)")
+        super().__init__(dtype=np.result_type(A.dtype, float), shape=A.shape)
+        self.A = A
+        n = A.shape[0]
+        self.rows = int(max(1, min(n, block_bytes // (n * A.itemsize))))
+        self._diag = None
+
+    def blocks(self):
+        """Itère sur les blocs de lignes : (s, e, A[s:e]), avec lecture anticipée du bloc suivant.
+
+        Le tableau A[s:e] n'est valable que jusqu'au bloc suivant.
+        """
+        n = self.shape[0]
+        bounds = list(range(0, n, self.rows)) + [n]
+        if not isinstance(self.A, np.memmap):
+            for s, e in zip(bounds[:-1], bounds[1:]):
+                yield s, e, self.A[s:e]
+            return
+        bufs = [np.empty((self.rows, n), dtype=self.A.dtype) for _ in range(2)]
+
+        def read(k, s, e):
+            np.copyto(bufs[k][:e - s], self.A[s:e])
+            return bufs[k][:e - s]
+
+        with ThreadPoolExecutor(1) as reader:
+            future = reader.submit(read, 0, bounds[0], bounds[1])
+            for k in range(len(bounds) - 1):
+                block = future.result()
+                if k + 2 < len(bounds):
+                    future = reader.submit(read, (k + 1) % 2, bounds[k + 1], bounds[k + 2])
+                yield bounds[k], bounds[k + 1], block
+
+    def diagonal(self):
+        if self._diag is None:
+            d = np.empty(self.shape[0])
+            for s, e, R in self.blocks():
+                d[s:e] = _block_diagonal(R, s)
+            self._diag = d
+        return self._diag.copy()
+
+    def _matvec(self, x):
+        return self._matmat(x.reshape(-1, 1)).ravel()
+
+    def _matmat(self, X):
+        Y = np.empty((self.shape[0], X.shape[1]))
+        d = np.empty(self.shape[0])
+        for s, e, R in self.blocks():
+            Y[s:e] = R @ X
+            d[s:e] = _block_diagonal(R, s)
+        self._diag = d
+        return Y
+
+    def sweep(self, x, b, omega=1.0, v=None):
+        """Effectue en place une itération de SOR sur x, en un seul parcours de A.
+
+        Pour le bloc de lignes I = [s, e), avec x déjà mis à jour sur [0, s),
+        la correction d vérifie (D/omega + L)_II d = b_I - A_I x, où L est la
+        partie triangulaire strictement inférieure : c'est exactement la suite
+        des mises à jour ligne par ligne de SOR (Gauss-Seidel si omega = 1),
+        calculée par un produit matrice-vecteur et une descente triangulaire
+        (BLAS) par bloc.
+
+        Paramètres
+        ----------
+        x : ndarray, shape (n,)
+            L'itéré, modifié en place.
+        b : ndarray, shape (n,)
+            Le second membre.
+        omega : float, optionnel
+            Le paramètre de relaxation.
+        v : ndarray, shape (n,), optionnel
+            Si donné, A @ v est calculé pendant le même parcours.
+
+        Retourne
+        --------
+        e : float
+            La norme de la correction.
+        Av : ndarray ou None
+            Le produit A @ v.
+        """
+        n = self.shape[0]
+        Av = None if v is None else np.empty(n)
+        d = np.empty(n)
+        e2 = 0.0
+        for s, e, R in self.blocks():
+            if v is not None:
+                Av[s:e] = R @ v
+            d[s:e] = _block_diagonal(R, s)
+            T = np.tril(R[:, s:e])
+            T[np.diag_indices(e - s)] /= omega
+            dx = scipy.linalg.solve_triangular(T, b[s:e] - R @ x, lower=True,
+                                               check_finite=False)
+            x[s:e] += dx
+            e2 += np.dot(dx, dx)
+        self._diag = d
+        return np.sqrt(e2), Av
+
+
+def is_stream(A):
+    """Indique si A doit être traitée hors mémoire : chemin d'un `.npy`, np.memmap ou MatrixStream."""
+    return isinstance(A, (str, os.PathLike, np.memmap, MatrixStream))
+
+
+def as_stream(A):
+    """Retourne A sous forme de MatrixStream (voir `is_stream`)."""
+    return A if isinstance(A, MatrixStream) else MatrixStream(A)
+
+
+def _block_diagonal(R, s):
+    """Les coefficients diagonaux A[i, i] des lignes s..s+m-1 contenues dans le bloc R."""
+    m = R.shape[0]
+    return R[np.arange(m), s + np.arange(m)]
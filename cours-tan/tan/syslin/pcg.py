@@ -1,19 +1,31 @@
 import numpy as np
+import scipy.linalg
+from tan.history import History
+from tan.syslin.batched import is_batched, pcg_batched
+from tan.syslin.precond import aspreconditioner
+from tan.syslin.utils import size
 
-def pcg(A, b, P=None, x0=None, tol=1e-6, maxiter=100):
+def pcg(A, b, P=None, x0=None, tol=1e-6, maxiter=100, atol=0.0, history="list",
+        callback=None):
     """
     Calcule la solution du système linéaire Ax = b en utilisant la méthode du gradient conjugué préconditionné.
     
     Paramètres :
     ----------
-    A : ndarray, shape (n, n)
-        Matrice des coefficients.
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        Matrice des coefficients. Seuls des produits A @ p sont utilisés. Une
+        pile de matrices de shape (batch, n, n), avec b de shape (batch, n), est
+        résolue en itérant tous les systèmes ensemble (voir
+        `tan.syslin.batched.pcg_batched`).
     
-    b : ndarray, shape (n,)
-        Vecteur de droite.
+    b : ndarray, shape (n,) ou (n, k)
+        Vecteur de droite. Avec k seconds membres, on utilise le gradient
+        conjugué par blocs (voir `block_cg`).
     
-    P : ndarray, shape (n, n), optionnel
-        Matrice de préconditionnement. Par défaut, il s'agit de la matrice d'identité.
+    P : Preconditioner, ndarray, matrice creuse ou LinearOperator, optionnel
+        Préconditionneur (voir `tan.syslin.precond`). Par défaut, il s'agit de la
+        matrice d'identité. Une matrice est factorisée une seule fois, un
+        LinearOperator représente directement l'action de P^{-1}.
     
     x0 : ndarray, shape (n,), optionnel
         Estimation initiale de la solution. Par défaut, il s'agit d'un vecteur nul.
@@ -22,7 +34,19 @@ def pcg(A, b, P=None, x0=None, tol=1e-6, maxiter=100):
         Nombre maximal d'itérations pour le solveur. La valeur par défaut est 100.
     
     tol : float, optionnel
-        Tolérance pour le critère de convergence de la norme résiduelle. La valeur par défaut est 1e-6.
+        Tolérance pour le critère de convergence de la norme résiduelle relative
+        ||r|| / ||r0|| et de l'incrément. La valeur par défaut est 1e-6.
+
+    atol : float, optionnel
+        Tolérance absolue sur la norme résiduelle ||r||. La valeur par défaut est 0.
+
+    history : {"list", "array", "none"}, optionnel
+        Le stockage des historiques `inc` et `res` (voir `tan.history.History`) :
+        listes (par défaut), tableaux NumPy préalloués, ou aucun (None est retourné).
+
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc, res) ; si elle
+        retourne True, les itérations s'arrêtent.
     
     Retourne :
     -------
@@ -36,40 +60,179 @@ def pcg(A, b, P=None, x0=None, tol=1e-6, maxiter=100):
         L'incrément à chaque itération.
 
     res : list
-        La norme résiduelle à chaque itération.
+        La norme résiduelle relative à chaque itération.
 
     Notes :
     -----
     La méthode du gradient conjugué préconditionné utilise la matrice P pour accélérer la convergence. La méthode itère
     tant que la norme résiduelle est supérieure à la tolérance spécifiée ou jusqu'à ce que le nombre maximal d'itérations soit atteint.
+
+    Chaque itération effectue exactement un produit matrice-vecteur A @ p et une
+    application du préconditionneur : le produit q = A @ p sert à la fois au
+    calcul du pas alpha et à la mise à jour du résidu, et le coefficient beta est
+    obtenu par le rapport (r_{k+1}, z_{k+1}) / (r_k, z_k). Les vecteurs x, r, p et
+    q sont mis à jour en place.
     """
-    if P is None:
-        P = np.eye(len(A))
+    if is_batched(A):
+        return pcg_batched(A, b, P, x0, tol, maxiter, atol, history, callback)
+    if np.ndim(b) == 2:
+        return block_cg(A, b, P, x0, tol, maxiter, atol, history, callback)
     if x0 is None:
-        x0 = np.zeros(len(A))
+        x0 = np.zeros(size(A))
+    P = aspreconditioner(P)
     niter = 0
-    x = x0
+    x = np.array(x0, dtype=float)
     r = b - A @ x
-    r0 = r
-    z = np.linalg.solve(P, r)
-    p = z
-    res = [1]
-    inc = []
-    #while res[-1] > tol and niter < maxiter:
+    nr0 = np.linalg.norm(r)
+    res = History(history, maxiter + 1)
+    res.append(1)
+    inc = History(history, maxiter)
+    if nr0 == 0:
+        return x, niter, inc.result(), res.result()
+    z = P.apply(r)
+    p = z.copy()
+    q = np.empty_like(x)
+    rz = np.dot(r, z)
     while niter < maxiter:
         niter += 1
-        pold = p
-        zold = z
-        rold = r
-        xold = x
-        alpha = np.dot(p, rold) / np.dot(p, A @ p)
-        x = xold + alpha * p
-        r = rold - alpha * A @ p
-        z = np.linalg.solve(P, r)
-        beta = np.dot(z, A @ pold ) / np.dot(pold, A @ pold)
-        p =  z - beta * pold
-        res.append(np.linalg.norm(r)/np.linalg.norm(r0))
-        inc.append(np.linalg.norm(x - xold))
-        if inc[-1] < tol:
+        if isinstance(A, np.ndarray):
+            np.dot(A, p, out=q)
+        else:
+            q[:] = A @ p
+        alpha = rz / np.dot(p, q)
+        x += alpha * p
+        r -= alpha * q
+        rn = np.linalg.norm(r) / nr0
+        e = abs(alpha) * np.linalg.norm(p)
+        res.append(rn)
+        inc.append(e)
+        if callback is not None and callback(niter, x, e, rn):
+            break
+        if rn < tol or rn * nr0 <= atol:
+            break
+        if e < tol:
+            break
+        z = P.apply(r)
+        rz_new = np.dot(r, z)
+        if rz_new == 0:
+            break
+        p *= rz_new / rz
+        p += z
+        rz = rz_new
+    return x, niter, inc.result(), res.result()
+
+
+def block_cg(A, b, P=None, x0=None, tol=1e-6, maxiter=100, atol=0.0, history="list",
+             callback=None):
+    """
+    Résout AX = B pour k seconds membres par la méthode du gradient conjugué préconditionné par blocs.
+
+    Les k colonnes partagent le même espace de Krylov par blocs : chaque itération
+    effectue un seul produit matrice-matrice A @ P (BLAS-3 pour une matrice dense)
+    et une application du préconditionneur au bloc des résidus. Les coefficients
+    alpha et beta sont des matrices s x s obtenues par une factorisation de
+    Cholesky de P^T A P. Dès qu'une colonne a convergé, elle est retirée du bloc
+    des résidus et la taille du bloc de directions de descente diminue d'autant
+    à l'itération suivante, sans redémarrage.
+    
+    Paramètres :
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+        Matrice symétrique définie positive des coefficients.
+    
+    b : ndarray, shape (n, k)
+        Les seconds membres.
+    
+    P : Preconditioner, ndarray, matrice creuse ou LinearOperator, optionnel
+        Préconditionneur symétrique défini positif (voir `tan.syslin.precond`).
+    
+    x0 : ndarray, shape (n, k), optionnel
+        Estimation initiale des solutions. Par défaut, des vecteurs nuls.
+    
+    maxiter : int, optionnel
+        Nombre maximal d'itérations pour le solveur. La valeur par défaut est 100.
+    
+    tol : float, optionnel
+        Tolérance sur la norme résiduelle relative et l'incrément de chaque colonne.
+
+    atol : float, optionnel
+        Tolérance absolue sur la norme résiduelle de chaque colonne.
+
+    history : {"list", "array", "none"}, optionnel
+        Le stockage des historiques `inc` et `res` (voir `tan.history.History`) ;
+        en mode "array", ce sont des tableaux de shape (niter, k).
+
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc, res) avec le
+        bloc des solutions courantes et les tableaux (k,) des incréments et des
+        résidus ; si elle retourne True, les itérations s'arrêtent.
+    
+    Retourne :
+    -------
+    x : ndarray, shape (n, k)
+        Solutions approximatives de AX = B.
+    
+    niter : ndarray, shape (k,)
+        Nombre d'itérations effectuées pour chaque colonne.
+
+    inc : liste
+        Pour chaque itération, le tableau (k,) des incréments (nan pour les colonnes déjà convergées).
+
+    res : list
+        Pour chaque itération, le tableau (k,) des normes résiduelles relatives.
+    """
+    b = np.asarray(b, dtype=float)
+    n, k = b.shape
+    P = aspreconditioner(P)
+    if x0 is None:
+        x = np.zeros((n, k))
+    else:
+        x = np.array(np.broadcast_to(x0, (n, k)), dtype=float)
+    R = b - A @ x
+    nr0 = np.linalg.norm(R, axis=0)
+    niter = np.zeros(k, dtype=int)
+    res = History(history, maxiter + 1)
+    res.append(np.where(nr0 > 0, 1.0, 0.0))
+    inc = History(history, maxiter)
+    active = np.flatnonzero(nr0 > atol)
+    R = R[:, active]
+    if active.size == 0:
+        return x, niter, inc.result(), res.result()
+    Z = P.apply(R)
+    D = Z.copy()
+    it = 0
+    while it < maxiter:
+        it += 1
+        Q = A @ D
+        DtQ = D.T @ Q
+        try:
+            c = scipy.linalg.cho_factor(DtQ)
+            solve = lambda rhs: scipy.linalg.cho_solve(c, rhs)
+        except np.linalg.LinAlgError:
+            # directions presque liées : on se contente d'une pseudo-inverse
+            pinv = np.linalg.pinv(DtQ)
+            solve = lambda rhs: pinv @ rhs
+        alpha = solve(D.T @ R)
+        dx = D @ alpha
+        x[:, active] += dx
+        R -= Q @ alpha
+        rn = np.linalg.norm(R, axis=0)
+        incn = np.linalg.norm(dx, axis=0)
+        res_row = np.full(k, np.nan)
+        res_row[active] = rn / nr0[active]
+        inc_row = np.full(k, np.nan)
+        inc_row[active] = incn
+        res.append(res_row)
+        inc.append(inc_row)
+        niter[active] = it
+        if callback is not None and callback(it, x, inc_row, res_row):
+            break
+        done = (rn < tol * nr0[active]) | (rn <= atol) | (incn < tol)
+        active = active[~done]
+        R = R[:, ~done]
+        if active.size == 0:
             break
-    return x, niter, inc, res
\ No newline at end of file
+        Z = P.apply(R)
+        beta = -solve(Q.T @ Z)
+        D = Z + D @ beta
+    return x, niter, inc.result(), res.result()
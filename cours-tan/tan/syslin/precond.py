@@ -0,0 +1,263 @@
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from tan.syslin.utils import (diag_plus, diagonal, is_operator, is_sparse, lower_solver,
+                              scale_rows, size, tril, triu, upper_solver)
+
+
+class Preconditioner:
+    """Classe de base des préconditionneurs.
+
+    Toute la mise en place (extraction de la diagonale, factorisation, ...) est
+    faite une seule fois à la construction ; la méthode `apply(r)` calcule ensuite
+    z = P^{-1} r à chaque itération pour un coût faible. r peut être un vecteur
+    de shape (n,) ou un bloc de vecteurs de shape (n, k). L'écriture `P @ r` est
+    équivalente à `P.apply(r)`.
+    """
+
+    def apply(self, r):
+        raise NotImplementedError
+
+    def __matmul__(self, r):
+        return self.apply(r)
+
+
+class Identity(Preconditioner):
+    """Pas de préconditionnement : P = I."""
+
+    def apply(self, r):
+        return np.array(r, dtype=float)
+
+
+class Jacobi(Preconditioner):
+    """Préconditionneur diagonal (Jacobi) : P = D = diag(A).
+
+    Paramètres
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator
+        La matrice du système. Un LinearOperator doit fournir `diagonal()`.
+    """
+
+    def __init__(self, A):
+        self.invd = 1 / diagonal(A)
+
+    def apply(self, r):
+        return scale_rows(self.invd, r)
+
+
+class SSOR(Preconditioner):
+    """Préconditionneur SSOR.
+
+    P = omega/(2-omega) (D/omega + L) (D/omega)^{-1} (D/omega + U), où L et U
+    sont les parties triangulaires strictes de A. P est symétrique définie
+    positive lorsque A l'est et peut donc être utilisé avec `pcg`.
+
+    Paramètres
+    ----------
+    A : ndarray ou matrice creuse
+        La matrice du système.
+    omega : float, optionnel
+        Le paramètre de relaxation, 0 < omega < 2.
+    """
+
+    def __init__(self, A, omega=1.0):
+        d = diagonal(A)
+        self.dw = d / omega
+        self.scale = (2 - omega) / omega
+        self.forward = lower_solver(diag_plus(self.dw, tril(A, -1)))
+        self.backward = upper_solver(diag_plus(self.dw, triu(A, 1)))
+
+    def apply(self, r):
+        return self.scale * self.backward(scale_rows(self.dw, self.forward(r)))
+
+
+class ILU0(Preconditioner):
+    """Factorisation LU incomplète sans remplissage, ILU(0).
+
+    Les facteurs L (à diagonale unité) et U ont exactement la structure creuse
+    des parties triangulaires de A. L'application coûte deux descentes
+    triangulaires creuses, soit O(nnz).
+
+    Paramètres
+    ----------
+    A : ndarray ou matrice creuse
+        La matrice du système.
+    """
+
+    def __init__(self, A):
+        LU = _ilu0(A)
+        n = LU.shape[0]
+        self.L = sp.tril(LU, -1, format="csc") + sp.identity(n, format="csc")
+        self.U = sp.triu(LU, format="csc")
+        self.forward = lower_solver(self.L)
+        self.backward = upper_solver(self.U)
+
+    def apply(self, r):
+        return self.backward(self.forward(r))
+
+
+class IC0(Preconditioner):
+    """Factorisation de Cholesky incomplète sans remplissage, IC(0).
+
+    Pour A symétrique, ILU(0) donne U = D L^T, d'où le facteur de Cholesky
+    incomplet L D^{1/2} qui a la structure de la partie triangulaire inférieure
+    de A. P = L L^T est symétrique définie positive et peut être utilisé avec
+    `pcg`.
+
+    Paramètres
+    ----------
+    A : ndarray ou matrice creuse
+        La matrice symétrique définie positive du système.
+    """
+
+    def __init__(self, A):
+        LU = _ilu0(A)
+        d = LU.diagonal()
+        if np.any(d <= 0):
+            raise ValueError("Pivot négatif ou nul : la factorisation IC(0) n'existe pas")
+        n = LU.shape[0]
+        L = sp.tril(LU, -1, format="csr") + sp.identity(n, format="csr")
+        self.L = sp.csc_matrix(L @ sp.diags(np.sqrt(d)))
+        self.forward = lower_solver(self.L)
+        self.backward = upper_solver(self.L.T)
+
+    def apply(self, r):
+        return self.backward(self.forward(r))
+
+
+class Factorized(Preconditioner):
+    """Préconditionneur donné par une matrice P, factorisée une seule fois.
+
+    Une matrice dense est factorisée par LU avec pivot partiel (LAPACK), une
+    matrice creuse par SuperLU ; `apply` effectue ensuite deux descentes
+    triangulaires au lieu d'une résolution complète à chaque itération.
+
+    Paramètres
+    ----------
+    P : ndarray ou matrice creuse
+        La matrice de préconditionnement.
+    """
+
+    def __init__(self, P):
+        if is_sparse(P):
+            self.solve = spla.splu(sp.csc_matrix(P, dtype=float)).solve
+        else:
+            lu = scipy.linalg.lu_factor(np.asarray(P, dtype=float))
+            self.solve = lambda r: scipy.linalg.lu_solve(lu, r)
+
+    def apply(self, r):
+        return self.solve(r)
+
+
+class Operator(Preconditioner):
+    """Préconditionneur donné par un LinearOperator qui représente P^{-1}."""
+
+    def __init__(self, op):
+        self.op = op
+
+    def apply(self, r):
+        return self.op @ r
+
+
+def aspreconditioner(P):
+    """Convertit l'argument `P` des solveurs en un objet Preconditioner.
+
+    Paramètres
+    ----------
+    P : None, Preconditioner, LinearOperator, ndarray ou matrice creuse
+        None donne l'identité, un Preconditioner est renvoyé tel quel, un
+        LinearOperator représente l'action de P^{-1} et une matrice est
+        factorisée une seule fois.
+
+    Retourne
+    --------
+    M : Preconditioner
+    """
+    if P is None:
+        return Identity()
+    if isinstance(P, Preconditioner):
+        return P
+    if is_operator(P):
+        return Operator(P)
+    return Factorized(P)
+
+
+def _ilu0(A):
+    """Calcule les facteurs ILU(0) de A, stockés dans une matrice CSR.
+
+    Élimination de Gauss restreinte à la structure de A (variante KIJ) : pour
+    chaque pivot k, a_ik <- a_ik / a_kk pour les i > k non nuls, puis
+    a_ij <- a_ij - a_ik a_kj pour les j > k tels que a_ij soit dans la
+    structure. Le résultat est celui de l'algorithme IKJ ligne par ligne.
+
+    Les pivots sont traités par niveaux : le pivot k dépend des pivots k' < k
+    tels que a_kk' != 0 ou a_k'k != 0 (qui modifient sa ligne ou sa colonne),
+    et les pivots d'un même niveau, indépendants, sont éliminés ensemble par
+    des opérations vectorisées. La boucle Python porte sur les niveaux (de
+    l'ordre de 2 sqrt(n) pour le laplacien sur une grille carrée) et non sur
+    les coefficients.
+    """
+    A = sp.csr_matrix(A, dtype=float, copy=True)
+    A.sum_duplicates()
+    A.sort_indices()
+    n = size(A)
+    indptr, indices, data = A.indptr, A.indices.astype(np.int64), A.data
+    rows = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    on_diag = np.flatnonzero(rows == indices)
+    if len(on_diag) < n:
+        i = np.setdiff1d(np.arange(n), rows[on_diag])[0]
+        raise ValueError(f"Coefficient diagonal nul à la ligne {i}")
+    diag = on_diag
+    # coefficients de L (i > k) rangés par colonne k
+    lower = np.flatnonzero(indices < rows)
+    lower = lower[np.argsort(indices[lower], kind="stable")]
+    lptr = np.concatenate([[0], np.cumsum(np.bincount(indices[lower], minlength=n))])
+    # clés des coefficients de la structure, croissantes pour une matrice CSR triée
+    keys = rows * n + indices
+    for ks in _levels(rows, indices, n):
+        lcount = lptr[ks + 1] - lptr[ks]
+        lp = lower[_ranges(lptr[ks], lcount)]
+        if len(lp) == 0:
+            continue
+        k = indices[lp]
+        pivot = data[diag[k]]
+        if np.any(pivot == 0):
+            raise ValueError(f"Pivot nul à la ligne {k[pivot == 0][0]}")
+        data[lp] /= pivot
+        ucount = indptr[k + 1] - diag[k] - 1
+        li = np.repeat(lp, ucount)
+        uj = _ranges(diag[k] + 1, ucount)
+        target = np.searchsorted(keys, rows[li] * n + indices[uj])
+        target[target == len(keys)] = 0
+        ok = keys[target] == rows[li] * n + indices[uj]
+        np.subtract.at(data, target[ok], data[li[ok]] * data[uj[ok]])
+    return A
+
+
+def _levels(rows, indices, n):
+    """Les niveaux des pivots de l'élimination (voir `_ilu0`), par l'algorithme de Kahn.
+
+    Le pivot k dépend de min(i, j) pour chaque coefficient a_ij hors diagonale
+    avec max(i, j) = k ; chaque niveau regroupe les pivots dont toutes les
+    dépendances sont dans les niveaux précédents.
+    """
+    off = rows != indices
+    src = np.minimum(rows[off], indices[off])
+    dst = np.maximum(rows[off], indices[off])
+    order = np.argsort(src, kind="stable")
+    dst = dst[order]
+    sptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=n))])
+    indegree = np.bincount(dst, minlength=n)
+    level = np.flatnonzero(indegree == 0)
+    while len(level) > 0:
+        yield level
+        succ = dst[_ranges(sptr[level], sptr[level + 1] - sptr[level])]
+        indegree -= np.bincount(succ, minlength=n)
+        level = np.unique(succ[indegree[succ] == 0])
+
+
+def _ranges(starts, counts):
+    """La concaténation des arange(s, s + c) pour s, c dans starts, counts."""
+    ends = np.cumsum(counts)
+    return np.repeat(starts - ends + counts, counts) + np.arange(ends[-1] if len(ends) else 0)
@@ -1,23 +1,52 @@
 import numpy as np
 import scipy.linalg # <0>
+from tan.history import History
+from tan.syslin.batched import is_batched, sor_batched
+from tan.syslin.jacobi import jacobi_spectral_radius
+from tan.syslin.outofcore import as_stream, is_stream
+from tan.syslin.precond import SSOR
+from tan.syslin.splitting import SORSplitting, stationary
+from tan.syslin.utils import (diag_plus, diagonal, is_operator, is_sparse,
+                              iterate_columns, lower_solver, scale_rows, tril, triu,
+                              upper_solver)
 
-def sor1( A, b, x0, omega=1.0, tol=1e-6, maxiter=100):
+def sor1( A, b, x0, omega=1.0, tol=1e-6, maxiter=100, history="list", callback=None,
+         block=None):
     """Solve the linear system Ax = b using the SOR method.
 
     Parameters
     ----------
-    A : array_like
-        The matrix of the linear system.
+    A : array_like, sparse matrix, np.memmap or path
+        The matrix of the linear system. Sparse matrices are swept with a
+        sparse triangular solve and are never densified. A matrix on disk
+        (np.memmap or `.npy` file) is streamed in row blocks, reading it
+        once per iteration (see `tan.syslin.outofcore.MatrixStream.sweep`).
     b : array_like
         The right-hand side vector of the linear system.
     x0 : array_like
         The initial guess for the solution.
-    omega : float, optional
-        The relaxation parameter.        
+    omega : float or "auto", optional
+        The relaxation parameter. With "auto", the optimal parameter is
+        computed from a power estimate of the spectral radius of the Jacobi
+        iteration matrix, which is refined by one more power iteration at
+        each step of the solve. This parameter is only optimal for
+        consistently ordered matrices: if it does not contract faster than
+        Gauss-Seidel, omega = 1 is used instead (see `_auto_omega`).
     tol : float, optional
         The tolerance for the stopping criterion.
     maxiter : int, optional
         The maximum number of iterations.
+    history : {"list", "array", "none"}, optional
+        How the `inc` history is stored (see `tan.history.History`): a list
+        (default), a preallocated NumPy array, or not at all (None is returned).
+    callback : callable, optional
+        Called after each iteration as callback(niter, x, inc) with the new
+        iterate x and its increment; returning True stops the iterations.
+    block : int, optional
+        If given, the rows of a dense A are updated by contiguous blocks of
+        this size, with one matrix-vector product and one small triangular
+        solve per block instead of a Python loop over the rows. The iterates
+        are the same as with the row loop (see `_sor_blocks`).
 
     Returns
     -------
@@ -28,40 +57,144 @@ def sor1( A, b, x0, omega=1.0, tol=1e-6, maxiter=100):
     inc : array_like
         The increment at each iteration.
     """
+    if is_stream(A):
+        return _sor_stream(A, b, x0, omega, tol, maxiter, history, callback)
+    if is_sparse(A) or is_operator(A) or is_batched(A):
+        return sor2(A, b, x0, omega, tol, maxiter, history, callback)
+    if block is not None:
+        return _sor_blocks(A, b, x0, omega, block, tol, maxiter, history, callback)
+    adaptive = omega == "auto"
+    if adaptive:
+        omega, rho, v, adaptive = _auto_omega(A, SORSplitting(A))
     x = x0.copy()
     niter = 0
-    inc = []
+    inc = History(history, maxiter)
     while True:
         niter += 1
         x_new = np.zeros_like(x)
         for i in range(len(A)):
             x_new[i] = (1-omega)*x[i] + omega*(b[i] - np.dot(A[i, :i], x_new[:i]) - np.dot(A[i, i+1:], x[i+1:])) / A[i, i] # <1>
 
-        inc.append(np.linalg.norm(x_new - x))
-        if inc[-1] < tol:
+        e = np.linalg.norm(x_new - x)
+        inc.append(e)
+        if callback is not None and callback(niter, x_new, e):
+            break
+        if e < tol:
             break
         if niter == maxiter:
             break
+        if adaptive:
+            rho, v = _adapt_omega(A, rho, v)
+            omega = optimal_omega(rho)
         x = x_new
-    return x, niter,inc
+    return x, niter, inc.result()
 
-def sor2( A, b, x0, omega=1.0, tol=1e-6, maxiter=100):
+def sor2( A, b, x0, omega=1.0, tol=1e-6, maxiter=100, history="list", callback=None,
+         workspace=None):
     """Solve the linear system Ax = b using the SOR method.
 
+    Each iteration is a forward triangular solve
+    (D-omega*E) x_new = ((1-omega)*D+omega*F) x + omega*b against the lower
+    part of A; the iteration matrix is never formed.
+
+    Parameters
+    ----------
+    A : array_like or sparse matrix
+        The matrix of the linear system. Sparse matrices are swept with a
+        sparse triangular solve and are never densified.
+    b : array_like, shape (n,) or (n, k)
+        The right-hand side vector of the linear system. With k right-hand
+        sides, the columns are swept together (one block triangular solve per
+        iteration) and each column stops as soon as it has converged. omega is
+        then not re-estimated during the solve. With a stack of matrices A of
+        shape (batch, n, n) and b of shape (batch, n), the independent systems
+        are iterated together, omega may be an array of shape (batch,) (see
+        `tan.syslin.batched`).
+    x0 : array_like
+        The initial guess for the solution.
+    omega : float or "auto", optional
+        The relaxation parameter. With "auto", the optimal parameter is
+        computed from a power estimate of the spectral radius of the Jacobi
+        iteration matrix, which is refined by one more power iteration at
+        each step of the solve. This parameter is only optimal for
+        consistently ordered matrices: if it does not contract faster than
+        Gauss-Seidel, omega = 1 is used instead (see `_auto_omega`).
+    tol : float, optional
+        The tolerance for the stopping criterion.
+    maxiter : int, optional
+        The maximum number of iterations.
+    history : {"list", "array", "none"}, optional
+        How the `inc` history is stored (see `tan.history.History`): a list
+        (default), a preallocated NumPy array, or not at all (None is returned).
+    callback : callable, optional
+        Called after each iteration as callback(niter, x, inc) with the new
+        iterate x and its increment; returning True stops the iterations.
+        With a single right-hand side, x is a work vector reused by the next
+        iteration.
+    workspace : Workspace, optional
+        Work vectors (see `tan.syslin.splitting.Workspace`) to reuse across
+        solves, so that no vector is allocated per iteration for a dense A.
+
+    Returns
+    -------
+    x : array_like
+        The solution of the linear system.
+    niter : int or ndarray of shape (k,)
+        The number of iterations performed (for each column if b is 2D).
+    inc : array_like
+        The increment at each iteration.
+    """
+    if is_operator(A):
+        raise TypeError("SOR needs the lower triangular part of A, "
+                        "which a LinearOperator does not provide")
+    if is_batched(A):
+        return sor_batched(A, b, x0, omega, tol, maxiter, history, callback)
+    adaptive = omega == "auto"
+    S = SORSplitting(A, 1.0 if adaptive else omega) # <2>
+    if adaptive:
+        omega, rho, v, adaptive = _auto_omega(A, S)
+    if np.ndim(b) == 2:
+        def sweep(x, b):
+            return S.solve(scale_rows(S.c, x) - omega * (S.U @ x) + omega * b)
+        return iterate_columns(sweep, b, x0, tol, maxiter, history, callback)
+
+    def update():
+        nonlocal rho, v
+        rho_old = rho
+        rho, v = _adapt_omega(A, rho, v)
+        if rho != rho_old:
+            S.set_omega(optimal_omega(rho))
+    # (D-omega*E) x_new = ((1-omega)*D+omega*F) x + omega*b, computed in place
+    return stationary(S, b, x0, tol, maxiter, history, callback, # <4>
+                      update if adaptive else None, workspace)
+
+
+def ssor(A, b, x0, omega=1.0, tol=1e-6, maxiter=100, history="list", callback=None):
+    """Solve the linear system Ax = b using the symmetric SOR (SSOR) method.
+
+    Each iteration is a forward SOR sweep followed by a backward SOR sweep,
+    i.e. one lower and one upper triangular solve.
+
     Parameters
     ----------
-    A : array_like
+    A : array_like or sparse matrix
         The matrix of the linear system.
     b : array_like
         The right-hand side vector of the linear system.
     x0 : array_like
         The initial guess for the solution.
     omega : float, optional
-        The relaxation parameter.        
+        The relaxation parameter, 0 < omega < 2.
     tol : float, optional
         The tolerance for the stopping criterion.
     maxiter : int, optional
         The maximum number of iterations.
+    history : {"list", "array", "none"}, optional
+        How the `inc` history is stored (see `tan.history.History`): a list
+        (default), a preallocated NumPy array, or not at all (None is returned).
+    callback : callable, optional
+        Called after each iteration as callback(niter, x, inc) with the new
+        iterate x and its increment; returning True stops the iterations.
 
     Returns
     -------
@@ -72,22 +205,234 @@ def sor2( A, b, x0, omega=1.0, tol=1e-6, maxiter=100):
     inc : array_like
         The increment at each iteration.
     """
-    x = x0.copy()
+    if is_operator(A):
+        raise TypeError("SSOR needs the triangular parts of A, "
+                        "which a LinearOperator does not provide")
+    x = np.array(x0, dtype=float)
     niter = 0
-    inc = []
-    invD=np.diag(1/np.diag(A))
-    E=-np.tril(A,-1)
-    F=-np.triu(A,1)
-    B=scipy.linalg.solve_triangular(np.eye(len(A))-omega*invD@E,(1-omega)*np.eye(len(A))+omega*invD@F, lower=True) # <2>
-    g=omega*invD@b
+    inc = History(history, maxiter)
+    d = diagonal(A)
+    L = tril(A, -1)
+    U = triu(A, 1)
+    forward = lower_solver(diag_plus(d, omega * L))
+    backward = upper_solver(diag_plus(d, omega * U))
     while True:
         niter += 1
-        x_new = np.zeros_like(x)
-        x_new=np.dot(B,x)+g # <4>
-        inc.append(np.linalg.norm(x_new - x))
-        if inc[-1] < tol:
+        x_half = forward((1 - omega) * d * x - omega * (U @ x) + omega * b)
+        x_new = backward((1 - omega) * d * x_half - omega * (L @ x_half) + omega * b)
+        e = np.linalg.norm(x_new - x)
+        inc.append(e)
+        if callback is not None and callback(niter, x_new, e):
+            break
+        if e < tol:
+            break
+        if niter == maxiter:
+            break
+        x = x_new
+    return x, niter, inc.result()
+
+
+def ssor_preconditioner(A, omega=1.0):
+    """Build the SSOR preconditioner of A.
+
+    The preconditioner is
+    P = omega/(2-omega) (D/omega + L) (D/omega)^{-1} (D/omega + U)
+    where L and U are the strict lower and upper parts of A. It is symmetric
+    positive definite when A is, so it can be used with `pcg`.
+
+    Parameters
+    ----------
+    A : array_like or sparse matrix
+        The matrix of the linear system.
+    omega : float, optional
+        The relaxation parameter, 0 < omega < 2.
+
+    Returns
+    -------
+    P : tan.syslin.precond.SSOR
+        The preconditioner, to pass as the `P` argument of `gradient`,
+        `richardson` and `pcg`.
+    """
+    return SSOR(A, omega)
+
+
+def optimal_omega(rho):
+    """Return the optimal SOR relaxation parameter 2/(1+sqrt(1-rho^2)).
+
+    rho is the spectral radius of the Jacobi iteration matrix; the formula is
+    exact for consistently ordered matrices (e.g. tridiagonal ones). For other
+    matrices it may be far from optimal: the solvers check it with
+    `_auto_omega` before using it.
+    """
+    if rho >= 1:
+        return 1.0
+    return 2 / (1 + np.sqrt(1 - rho**2))
+
+
+def _sor_stream(A, b, x0, omega, tol, maxiter, history, callback):
+    """SOR over a matrix on disk: one sequential pass of A per iteration.
+
+    With omega="auto", the power iteration on the Jacobi matrix that estimates
+    rho(B_J) is fused with the sweeps (A @ v is computed during the same pass),
+    starting from omega = 1, instead of paying 20 extra passes up front. The
+    safeguard of `_auto_omega` would cost 20 more passes and is not applied:
+    "auto" assumes a consistently ordered matrix here.
+    """
+    A = as_stream(A)
+    b = np.asarray(b, dtype=float)
+    adaptive = omega == "auto"
+    if adaptive:
+        rho, omega = 0.0, 1.0
+        v = np.random.default_rng(0).random(len(b))
+    x = np.array(x0, dtype=float)
+    niter = 0
+    inc = History(history, maxiter)
+    while True:
+        niter += 1
+        x_new = x.copy()
+        e, Av = A.sweep(x_new, b, omega, v if adaptive else None)
+        inc.append(e)
+        if callback is not None and callback(niter, x_new, e):
+            break
+        if e < tol:
+            break
+        if niter == maxiter:
+            break
+        if adaptive:
+            d = A.diagonal()
+            w = np.abs(d)
+            y = v - Av / d
+            rho_new = np.sqrt(np.dot(w * y, y) / np.dot(w * v, v))
+            v = y / rho_new if rho_new > 0 else v
+            if 1 - rho_new < 0.9 * (1 - rho):
+                rho = rho_new
+                omega = optimal_omega(rho)
+        x = x_new
+    return x, niter, inc.result()
+
+
+def _sor_blocks(A, b, x0, omega, block, tol, maxiter, history, callback):
+    """SOR over a dense matrix by blocks of rows.
+
+    For the row block I = [s, e), with x already updated on [0, s), the
+    correction d solves (D/omega + L)_II d = b_I - A_I x, where L is the
+    strictly lower triangular part: this is exactly the sequence of row
+    updates of sor1, computed with one matrix-vector product and one
+    triangular solve (BLAS) per block, so the Python overhead of a sweep is
+    divided by the block size. The triangular blocks are extracted once; with
+    omega="auto" only their diagonals change when omega is refined.
+    """
+    if block < 1:
+        raise ValueError(f"block must be a positive integer, got {block}")
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float)
+    n = len(A)
+    adaptive = omega == "auto"
+    if adaptive:
+        omega, rho, v, adaptive = _auto_omega(A, SORSplitting(A))
+    d = diagonal(A)
+    blocks = []
+    for s in range(0, n, block):
+        e = min(s + block, n)
+        blocks.append((s, e, A[s:e], np.tril(A[s:e, s:e])))
+
+    def set_omega(omega):
+        for s, e, R, T in blocks:
+            T[np.diag_indices(e - s)] = d[s:e] / omega
+
+    set_omega(omega)
+    x = np.array(x0, dtype=float)
+    niter = 0
+    inc = History(history, maxiter)
+    while True:
+        niter += 1
+        x_new = x.copy()
+        e2 = 0.0
+        for s, e, R, T in blocks:
+            dx = scipy.linalg.solve_triangular(T, b[s:e] - R @ x_new, lower=True,
+                                               overwrite_b=True, check_finite=False)
+            x_new[s:e] += dx
+            e2 += np.dot(dx, dx)
+        e = np.sqrt(e2)
+        inc.append(e)
+        if callback is not None and callback(niter, x_new, e):
+            break
+        if e < tol:
             break
         if niter == maxiter:
             break
+        if adaptive:
+            rho_new, v = _adapt_omega(A, rho, v)
+            if rho_new != rho:
+                rho = rho_new
+                omega = optimal_omega(rho)
+                set_omega(omega)
         x = x_new
-    return x, niter,inc    
\ No newline at end of file
+    return x, niter, inc.result()
+
+
+def _auto_omega(A, S):
+    """Choose omega for omega="auto", with a safeguard.
+
+    The optimal parameter 2/(1+sqrt(1-rho_J^2)) only holds for consistently
+    ordered matrices (e.g. tridiagonal ones, or the 5-point Laplacian in
+    lexicographic or red-black ordering); for other matrices it can make SOR
+    slower than Gauss-Seidel (for `tan.matrix.matrix(200, 0.3)`, SOR needs 37
+    iterations with it against 22 for Gauss-Seidel). The contraction factors
+    of SOR with that omega and of Gauss-Seidel are therefore measured by 10
+    power iterations each, started from the dominant Jacobi eigenvector
+    estimate, and omega = 1 is used if SOR does not contract faster.
+
+    Parameters
+    ----------
+    A : array_like or sparse matrix
+        The matrix of the linear system.
+    S : SORSplitting
+        A splitting of A, whose omega is changed (and left at the chosen value).
+
+    Returns
+    -------
+    omega : float
+        The relaxation parameter.
+    rho, v :
+        The estimate of rho(B_J) and the power iterate (see `_adapt_omega`).
+    adaptive : bool
+        False if omega = 1 was forced: omega must then not be re-estimated.
+    """
+    rho, v = jacobi_spectral_radius(A)
+    omega = optimal_omega(rho)
+    if omega > 1 and _contraction(A, S, omega, v) >= _contraction(A, S, 1.0, v):
+        omega = 1.0
+    S.set_omega(omega)
+    return omega, rho, v, omega > 1
+
+
+def _contraction(A, S, omega, v, maxiter=10):
+    """Estimate rho(B_SOR(omega)) by power iterations from v (geometric mean of the last ratios)."""
+    S.set_omega(omega)
+    x = v / np.linalg.norm(v)
+    logs = []
+    for _ in range(maxiter):
+        # B x = x - M^{-1} A x with M = (D + omega L) / omega
+        y = x - omega * S.solve(A @ x)
+        ny = np.linalg.norm(y)
+        if ny == 0:
+            return 0.0
+        logs.append(np.log(ny))
+        x = y / ny
+    return float(np.exp(np.mean(logs[maxiter // 2:])))
+
+
+def _adapt_omega(A, rho, v):
+    """Refine the estimate of rho(B_J) with one more power iteration.
+
+    The new estimate is only returned when it is significantly closer to 1, so
+    that omega (and the triangular factor that depends on it) is only updated a
+    logarithmic number of times. Since the power iterations approach rho from
+    below, omega approaches its optimal value from below, which is the safe side.
+    """
+    rho_new, v = jacobi_spectral_radius(A, maxiter=1, x0=v)
+    if 1 - rho_new < 0.9 * (1 - rho):
+        return rho_new, v
+    return rho, v
+
@@ -0,0 +1,238 @@
+import numpy as np
+from scipy.linalg import lapack
+from tan.history import History
+from tan.syslin.precond import Identity, Jacobi, aspreconditioner
+from tan.syslin.utils import (diag_plus, diagonal, is_operator, is_sparse, lower_solver, matvec,
+                              tril, triu)
+
+
+class Workspace:
+    """Vecteurs de travail réutilisables d'une résolution à l'autre.
+
+    `stationary` prend ses vecteurs (itérés, incrément, résidu, ...) dans un
+    Workspace : en passant le même objet à des résolutions successives de même
+    taille, aucun vecteur n'est alloué, ni par itération ni par résolution
+    (hormis la copie de la solution retournée). Les vecteurs sont réalloués si
+    la taille change.
+    """
+
+    def __init__(self):
+        self._vectors = []
+
+    def vectors(self, n, k):
+        """Retourne k vecteurs de travail de taille n (leur contenu est quelconque)."""
+        if self._vectors and len(self._vectors[0]) != n:
+            self._vectors = []
+        while len(self._vectors) < k:
+            self._vectors.append(np.empty(n))
+        return self._vectors[:k]
+
+
+class Splitting:
+    """Décomposition A = M - N d'une méthode itérative stationnaire.
+
+    Une itération calcule x_new = M^{-1}(N x + b) et l'incrément dx = x_new - x
+    dans des vecteurs fournis, sans allocation. La mise en place (diagonale,
+    parties triangulaires, factorisation de M) est faite une fois à la
+    construction : un Splitting peut servir à plusieurs résolutions avec la
+    même matrice.
+    """
+
+    nwork = 0  # nombre de vecteurs de travail supplémentaires
+
+    def start(self, x, b, work):
+        """Prépare les itérations à partir de x0 (par exemple, le résidu initial)."""
+
+    def step(self, x, b, x_new, dx, work):
+        """Effectue une itération ; retourne la norme résiduelle relative si elle est calculée, sinon None."""
+        raise NotImplementedError
+
+
+class JacobiSplitting(Splitting):
+    """Jacobi pondéré : M = D / omega, soit x_new = x + omega D^{-1}(b - Ax)."""
+
+    def __init__(self, A, omega=1.0):
+        self.A = A.tocsr() if is_sparse(A) else A
+        self.w = omega / diagonal(A)
+
+    def step(self, x, b, x_new, dx, work):
+        matvec(self.A, x, dx)
+        np.subtract(b, dx, out=dx)
+        dx *= self.w
+        np.add(x, dx, out=x_new)
+
+
+class SORSplitting(Splitting):
+    """SOR : M = D / omega - E, Gauss-Seidel pour omega = 1.
+
+    On résout (D - omega E) x_new = ((1 - omega) D + omega F) x + omega b, où -E
+    et -F sont les parties strictement inférieure et supérieure de A. Pour une
+    matrice dense, le facteur triangulaire est stocké en ordre Fortran et la
+    descente (LAPACK trtrs) est faite en place ; pour une matrice creuse, la
+    descente de SuperLU alloue son résultat.
+    """
+
+    nwork = 1
+
+    def __init__(self, A, omega=1.0):
+        if is_operator(A):
+            raise TypeError("SOR nécessite la partie triangulaire inférieure de A, "
+                            "qu'un LinearOperator ne fournit pas")
+        self.d = diagonal(A)
+        self.L = tril(A, -1)
+        self.U = triu(A, 1)
+        self.set_omega(omega)
+
+    def set_omega(self, omega):
+        """Change le paramètre de relaxation (et refactorise M)."""
+        self.omega = omega
+        self.c = (1 - omega) * self.d
+        T = diag_plus(self.d, omega * self.L)
+        self.solve = lower_solver(T)
+        self.T = None if is_sparse(T) else np.asfortranarray(T)
+
+    def step(self, x, b, x_new, dx, work):
+        y = x_new
+        matvec(self.U, x, y)
+        if self.omega == 1:
+            np.subtract(b, y, out=y)
+        else:
+            t = work[0]
+            y *= -self.omega
+            np.multiply(self.c, x, out=t)
+            y += t
+            np.multiply(self.omega, b, out=t)
+            y += t
+        if self.T is None:
+            y[:] = self.solve(y)
+        else:
+            z, info = lapack.dtrtrs(self.T, y, lower=1, overwrite_b=1)
+            if info > 0:
+                raise np.linalg.LinAlgError(f"Pivot nul : le coefficient diagonal {info - 1} "
+                                            "de D / omega - E est nul")
+            if info < 0:
+                raise ValueError(f"Argument {-info} de dtrtrs invalide")
+            # LAPACK n'écrit en place que si y convient (float64, contigu) :
+            # sinon, le résultat est dans une copie
+            if not np.shares_memory(z, y):
+                y[:] = z
+        np.subtract(x_new, x, out=dx)
+
+
+class RichardsonSplitting(Splitting):
+    """Richardson préconditionné : M = P / alpha.
+
+    Le résidu r = b - Ax est mis à jour à chaque itération (un produit par A) et
+    sert au test d'arrêt. Les préconditionneurs identité et Jacobi sont
+    appliqués en place ; les autres allouent leur résultat.
+    """
+
+    nwork = 1
+
+    def __init__(self, A, P=None, alpha=1.0):
+        self.A = A.tocsr() if is_sparse(A) else A
+        self.P = aspreconditioner(P)
+        self.alpha = alpha
+        if isinstance(self.P, Identity):
+            self.scale = None
+        elif isinstance(self.P, Jacobi):
+            self.scale = self.P.invd
+        else:
+            self.scale = False
+
+    def start(self, x, b, work):
+        r = work[0]
+        matvec(self.A, x, r)
+        np.subtract(b, r, out=r)
+        self.nr0 = np.linalg.norm(r)
+
+    def step(self, x, b, x_new, dx, work):
+        r = work[0]
+        if self.scale is None:
+            np.multiply(self.alpha, r, out=dx)
+        elif self.scale is False:
+            np.multiply(self.alpha, self.P.apply(r), out=dx)
+        else:
+            np.multiply(self.scale, r, out=dx)
+            dx *= self.alpha
+        np.add(x, dx, out=x_new)
+        # le résidu de x_new sert au test d'arrêt puis au pas suivant :
+        # un seul produit par A par itération
+        matvec(self.A, x_new, r)
+        np.subtract(b, r, out=r)
+        np.subtract(x_new, x, out=dx)
+        return np.linalg.norm(r) / self.nr0
+
+
+def stationary(S, b, x0, tol=1e-6, maxiter=100, history="list", callback=None, update=None,
+               workspace=None):
+    """Résolvez le système linéaire Ax = b par la méthode itérative stationnaire associée à S.
+
+    Moteur commun de `jacobi2`, `gauss_seidel2`, `sor2` et `richardson` (pour un
+    seul second membre). Les itérés, l'incrément et les vecteurs de travail de
+    S sont pris dans `workspace` et toutes les opérations sont faites en place
+    (`out=`) : en régime établi, une itération n'alloue aucun vecteur (hormis
+    les cas signalés dans la documentation des décompositions), ce qui compte
+    pour un grand nombre de petites résolutions.
+
+    Paramètres
+    ----------
+    S : Splitting
+        La décomposition A = M - N (par exemple `JacobiSplitting(A)`).
+    b : array_like, shape (n,)
+        Le vecteur de droite du système linéaire.
+    x0 : array_like
+        L'estimation initiale de la solution.
+    tol : float, optionnel
+        La tolérance pour le critère d'arrêt, sur l'incrément et, si S le
+        calcule, sur la norme résiduelle relative.
+    maxiter : int, optionnel
+        Le nombre maximum d'itérations.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage de l'historique `inc` (voir `tan.history.History`).
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc) (et la norme
+        résiduelle relative si S la calcule) ; si elle retourne True, les
+        itérations s'arrêtent. x est un vecteur de travail, réutilisé à
+        l'itération suivante : il faut le copier pour le conserver.
+    update : callable, optionnel
+        Appelée sans argument à la fin de chaque itération qui n'arrête pas la
+        méthode (par exemple pour adapter omega).
+    workspace : Workspace, optionnel
+        Les vecteurs de travail, à réutiliser d'une résolution à l'autre.
+
+    Retourne
+    --------
+    x : ndarray
+        La solution du système linéaire.
+    niter : int
+        Le nombre d'itérations effectuées.
+    inc : array_like
+        L'incrément à chaque itération.
+    """
+    b = np.asarray(b, dtype=float)
+    if workspace is None:
+        workspace = Workspace()
+    x, x_new, dx, *work = workspace.vectors(len(b), 3 + S.nwork)
+    x[:] = x0
+    S.start(x, b, work)
+    niter = 0
+    inc = History(history, maxiter)
+    while True:
+        niter += 1
+        rn = S.step(x, b, x_new, dx, work)
+        e = np.linalg.norm(dx)
+        inc.append(e)
+        if callback is not None:
+            if callback(niter, x_new, e) if rn is None else callback(niter, x_new, e, rn):
+                break
+        if rn is not None and rn < tol:
+            break
+        if e < tol:
+            break
+        if niter == maxiter:
+            break
+        if update is not None:
+            update()
+        x, x_new = x_new, x
+    return x.copy(), niter, inc.result()
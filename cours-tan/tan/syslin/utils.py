@@ -0,0 +1,205 @@
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from tan.history import History
+
+
+def is_sparse(A):
+    """Indique si A est une matrice creuse scipy.sparse (CSR, CSC, DIA, ...)."""
+    return sp.issparse(A)
+
+
+def is_operator(A):
+    """Indique si A est un opérateur sans matrice (scipy.sparse.linalg.LinearOperator)."""
+    return isinstance(A, spla.LinearOperator)
+
+
+def size(A):
+    """Retourne la dimension n du système associé à A.
+
+    `len(A)` n'est pas défini pour les matrices creuses ni pour les opérateurs,
+    on utilise donc la forme de A.
+    """
+    return A.shape[0]
+
+
+def diagonal(A):
+    """Extrait la diagonale de A sans jamais densifier la matrice.
+
+    Paramètres
+    ----------
+    A : ndarray, matrice creuse ou LinearOperator
+        Un LinearOperator doit fournir sa diagonale via une méthode `diagonal()`.
+
+    Retourne
+    --------
+    d : ndarray, shape (n,)
+        Copie de la diagonale de A.
+    """
+    if is_sparse(A):
+        return np.asarray(A.diagonal(), dtype=float)
+    if is_operator(A):
+        if hasattr(A, "diagonal"):
+            return np.asarray(A.diagonal(), dtype=float)
+        raise TypeError("l'opérateur doit fournir sa diagonale via une méthode diagonal()")
+    return np.diag(A).astype(float)
+
+
+def tril(A, k=0):
+    """Partie triangulaire inférieure de A, au même format que A (dense ou CSR)."""
+    if is_sparse(A):
+        return sp.tril(A, k, format="csr")
+    if is_operator(A):
+        raise TypeError("la partie triangulaire d'un LinearOperator n'est pas accessible")
+    return np.tril(A, k)
+
+
+def triu(A, k=0):
+    """Partie triangulaire supérieure de A, au même format que A (dense ou CSR)."""
+    if is_sparse(A):
+        return sp.triu(A, k, format="csr")
+    if is_operator(A):
+        raise TypeError("la partie triangulaire d'un LinearOperator n'est pas accessible")
+    return np.triu(A, k)
+
+
+def lower_solver(L):
+    """Prépare la résolution répétée de systèmes triangulaires inférieurs Lx = b.
+
+    Pour une matrice creuse, L est « factorisée » une seule fois par SuperLU en
+    ordre naturel et sans pivotage (les facteurs ont la structure de L), ce qui
+    donne ensuite des descentes en O(nnz) dans du code compilé.
+
+    Retourne
+    --------
+    solve : callable
+        La fonction b -> L^{-1} b.
+    """
+    if is_sparse(L):
+        lu = spla.splu(sp.csc_matrix(L), permc_spec="NATURAL", diag_pivot_thresh=0,
+                       options=dict(SymmetricMode=True))
+        return lu.solve
+    return lambda b: scipy.linalg.solve_triangular(L, b, lower=True)
+
+
+def upper_solver(U):
+    """Prépare la résolution répétée de systèmes triangulaires supérieurs Ux = b.
+
+    Voir `lower_solver`.
+    """
+    if is_sparse(U):
+        lu = spla.splu(sp.csc_matrix(U), permc_spec="NATURAL", diag_pivot_thresh=0,
+                       options=dict(SymmetricMode=True))
+        return lu.solve
+    return lambda b: scipy.linalg.solve_triangular(U, b, lower=False)
+
+
+def bandwidth(A):
+    """Largeur de bande de A, i.e. max |i - j| sur les coefficients non nuls."""
+    if is_sparse(A):
+        C = A.tocoo()
+        if C.nnz == 0:
+            return 0
+        return int(np.max(np.abs(C.row - C.col)))
+    if is_operator(A):
+        raise TypeError("la structure d'un LinearOperator n'est pas accessible")
+    i, j = np.nonzero(A)
+    if len(i) == 0:
+        return 0
+    return int(np.max(np.abs(i - j)))
+
+
+def matvec(A, x, out):
+    """Calcule out = A @ x en place, sans allocation pour une matrice dense.
+
+    Pour une matrice creuse ou un LinearOperator, le produit est alloué puis
+    copié dans out : scipy.sparse n'offre pas de produit en place public.
+    """
+    if isinstance(A, np.ndarray):
+        np.dot(A, x, out=out)
+    else:
+        out[:] = A @ x
+    return out
+
+
+def diag_plus(d, T):
+    """Retourne diag(d) + T, au format de T (dense ou CSR)."""
+    if is_sparse(T):
+        return (sp.diags(d) + T).tocsr()
+    return np.diag(d) + T
+
+
+def scale_rows(d, x):
+    """Retourne diag(d) @ x pour un vecteur x de shape (n,) ou un bloc (n, k)."""
+    if np.ndim(x) == 2:
+        return d[:, None] * x
+    return d * x
+
+
+def iterate_columns(sweep, b, x0, tol, maxiter, history="list", callback=None):
+    """Itère x_new = sweep(x, b) simultanément sur les k colonnes de b.
+
+    Toutes les colonnes actives sont traitées ensemble par des produits
+    matrice-matrice ; chaque colonne est retirée du bloc dès que son incrément
+    passe sous `tol`, et conserve alors son dernier itéré (comme dans le cas
+    d'un seul second membre).
+
+    Paramètres
+    ----------
+    sweep : callable
+        La fonction (X, B) -> X_new qui effectue une itération sur un bloc de
+        colonnes X de shape (n, s) avec les seconds membres B de shape (n, s).
+    b : ndarray, shape (n, k)
+        Les seconds membres.
+    x0 : ndarray, shape (n, k)
+        Les estimations initiales.
+    tol : float
+        La tolérance sur l'incrément de chaque colonne.
+    maxiter : int
+        Le nombre maximum d'itérations.
+    history : {"list", "array", "none"}, optionnel
+        Le stockage de l'historique `inc` (voir `tan.history.History`).
+    callback : callable, optionnel
+        Appelée après chaque itération par callback(niter, x, inc) avec le bloc
+        (n, k) des itérés courants et le tableau (k,) des incréments ; si elle
+        retourne True, les itérations s'arrêtent.
+
+    Retourne
+    --------
+    x : ndarray, shape (n, k)
+        Les solutions.
+    niter : ndarray, shape (k,)
+        Le nombre d'itérations effectuées pour chaque colonne.
+    inc : list, ndarray ou None
+        Pour chaque itération, le tableau (k,) des incréments des colonnes
+        (nan pour les colonnes déjà convergées) ; un tableau (niter, k) en mode
+        "array".
+    """
+    b = np.asarray(b, dtype=float)
+    x = np.array(np.broadcast_to(x0, b.shape), dtype=float)
+    k = b.shape[1]
+    active = np.arange(k)
+    niter = np.zeros(k, dtype=int)
+    inc = History(history, maxiter)
+    it = 0
+    while active.size > 0:
+        it += 1
+        xa = x[:, active]
+        x_new = sweep(xa, b[:, active])
+        d = np.linalg.norm(x_new - xa, axis=0)
+        row = np.full(k, np.nan)
+        row[active] = d
+        inc.append(row)
+        niter[active] = it
+        if callback is not None:
+            xc = x.copy()
+            xc[:, active] = x_new
+            if callback(it, xc, row):
+                break
+        if it == maxiter:
+            break
+        keep = d >= tol
+        x[:, active[keep]] = x_new[:, keep]
+        active = active[keep]
+    return x, niter, inc.result()
@@ -0,0 +1,206 @@
+import inspect
+from collections import OrderedDict
+
+import numpy as np
+
+
+class WarmStart:
+    """Cache LRU de solutions, pour démarrer les solveurs itératifs près de la solution.
+
+    Lors d'un balayage de paramètres (par exemple `epsi` dans
+    `tan.matrix.matrix`), les systèmes successifs sont voisins et leurs
+    solutions aussi. Les solutions calculées sont conservées, indexées par les
+    paramètres du problème, et la solution d'un nouveau système part de :
+
+    - l'extrapolation (ou l'interpolation) linéaire à partir des deux solutions
+      de paramètres les plus proches, si `extrapolate` est vrai et si le
+      nouveau paramètre n'est pas plus loin de la plus proche que celles-ci ne
+      le sont entre elles ;
+    - sinon, la solution de paramètres les plus proches ;
+    - ou d'un vecteur nul si le cache ne contient aucune solution de même taille.
+
+    Les solutions les moins récemment utilisées sont évincées lorsque la mémoire
+    occupée dépasse `maxbytes`.
+
+    Le gain est estimé en comparant le nombre d'itérations de chaque résolution
+    démarrée depuis le cache à celui de la résolution démarrée de zéro dont
+    les paramètres sont les plus proches : voir les attributs `cold`, `warm`
+    et `saved`. La difficulté des systèmes varie souvent le long d'un
+    balayage : avec `probe` = k, une résolution sur k démarrées depuis le
+    cache est refaite de zéro pour mettre à jour cette référence.
+
+    Paramètres
+    ----------
+    maxbytes : int, optionnel
+        La mémoire maximale occupée par les solutions (64 Mo par défaut).
+    extrapolate : bool, optionnel
+        Si True (par défaut), extrapole à partir des deux solutions les plus proches.
+    probe : int, optionnel
+        Si > 0, une résolution sur `probe` démarrées depuis le cache est aussi
+        faite de zéro, pour mesurer le gain (0 par défaut : pas de surcoût).
+
+    Attributs
+    ---------
+    hits, misses : int
+        Le nombre de résolutions démarrées depuis le cache et de zéro.
+    cold, warm : list
+        Le nombre d'itérations de chaque résolution démarrée de zéro, depuis le cache.
+    saved : float
+        Le nombre estimé d'itérations économisées : pour chaque résolution
+        démarrée depuis le cache, le nombre d'itérations de la résolution de
+        zéro de paramètres les plus proches, moins le sien.
+    last : str ou None
+        L'origine du dernier itéré initial : "extrapolation", "nearest" ou None.
+
+    Exemple
+    -------
+    Le second membre ne dépend pas de epsi (avec celui de `matrix`, la
+    solution serait toujours le vecteur de uns) :
+
+    >>> ws = WarmStart(probe=10)
+    >>> b = np.ones(1000)
+    >>> for epsi in np.linspace(0.1, 0.3, 100):
+    ...     A, _ = matrix(1000, epsi)
+    ...     x, niter, inc, res = ws.solve(pcg, A, b, epsi, tol=1e-10)
+    >>> ws.hits, ws.misses, len(ws.cold)
+    (99, 1, 10)
+    >>> np.mean(ws.cold), np.mean(ws.warm)
+    (12.2, 5.6...)
+    """
+
+    def __init__(self, maxbytes=2**26, extrapolate=True, probe=0):
+        self.maxbytes = maxbytes
+        self.extrapolate = extrapolate
+        self.probe = probe
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.cold = []
+        self.warm = []
+        self.saved = 0.0
+        self.last = None
+        self._entries = OrderedDict()
+        self._cold_keys = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def guess(self, key, n):
+        """Retourne l'itéré initial pour les paramètres `key` et la taille n, ou None.
+
+        Paramètres
+        ----------
+        key : float ou tuple de float
+            Les paramètres du problème.
+        n : int
+            La taille du système.
+        """
+        p = _key(key)
+        near = sorted((np.linalg.norm(np.subtract(q, p)), q)
+                      for q, x in self._entries.items() if len(q) == len(p) and len(x) == n)
+        self.last = None
+        if not near:
+            return None
+        p1 = near[0][1]
+        self._entries.move_to_end(p1)
+        x1 = self._entries[p1]
+        self.last = "nearest"
+        if self.extrapolate and len(near) > 1 and near[0][0] > 0:
+            p2 = near[1][1]
+            d = np.subtract(p1, p2)
+            t = np.dot(np.subtract(p, p1), d) / np.dot(d, d)
+            # t est rapporté à l'écart entre p1 et p2 : la tolérance absorbe les
+            # arrondis des paramètres (np.linspace) pour un pas régulier
+            if abs(t) <= 1 + 1e-9:
+                self.last = "extrapolation"
+                return x1 + t * (x1 - self._entries[p2])
+        return x1.copy()
+
+    def store(self, key, x):
+        """Conserve la solution x des paramètres `key`."""
+        p = _key(key)
+        x = np.array(x, dtype=float)
+        if p in self._entries:
+            self.nbytes -= self._entries.pop(p).nbytes
+        if x.nbytes > self.maxbytes:
+            return
+        self._entries[p] = x
+        self.nbytes += x.nbytes
+        while self.nbytes > self.maxbytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def solve(self, solver, A, b, key, **options):
+        """Résout Ax = b avec `solver` en partant de l'itéré initial du cache, puis conserve la solution.
+
+        Pour les solveurs qui arrêtent sur la norme résiduelle relative à celle
+        de l'itéré initial, ||r|| / ||r0|| < tol (`pcg`, `gmres`, `bicgstab`),
+        un bon itéré initial rendrait le critère plus exigeant : on leur passe
+        alors `atol = tol ||b||` (sauf si `atol` est donné), c'est-à-dire la
+        précision qu'ils atteindraient en partant de zéro.
+
+        Paramètres
+        ----------
+        solver : callable
+            Un solveur de `tan.syslin` acceptant l'argument `x0`, par exemple
+            `pcg` ou `sor2`.
+        A : ndarray, matrice creuse ou LinearOperator, shape (n, n)
+            La matrice du système.
+        b : ndarray, shape (n,)
+            Le second membre.
+        key : float ou tuple de float
+            Les paramètres du problème.
+        **options
+            Les autres arguments du solveur (tol, maxiter, P, omega, ...).
+
+        Retourne
+        --------
+        La sortie de `solver`, dont la solution x et le nombre d'itérations
+        sont les deux premiers éléments.
+        """
+        b = np.asarray(b, dtype=float)
+        x0 = self.guess(key, len(b))
+        if x0 is None:
+            out = solver(A, b, x0=np.zeros(len(b)), **options)
+            self.misses += 1
+            self._record_cold(key, out[1])
+            self.store(key, out[0])
+            return out
+        warm_options = dict(options)
+        params = inspect.signature(solver).parameters
+        if "atol" in params and "atol" not in options:
+            tol = options.get("tol", params["tol"].default)
+            warm_options["atol"] = tol * np.linalg.norm(b)
+        out = solver(A, b, x0=x0, **warm_options)
+        x, niter = out[0], out[1]
+        self.hits += 1
+        self.warm.append(niter)
+        if self.probe > 0 and self.hits % self.probe == 0:
+            self._record_cold(key, solver(A, b, x0=np.zeros(len(b)), **options)[1])
+        if self.cold:
+            self.saved += self._cold_estimate(key) - niter
+        self.store(key, x)
+        return out
+
+    def _record_cold(self, key, niter):
+        self.cold.append(niter)
+        self._cold_keys.append(_key(key))
+
+    def _cold_estimate(self, key):
+        """Le nombre d'itérations de la résolution de zéro de paramètres les plus proches de `key`."""
+        p = _key(key)
+        near = [(np.linalg.norm(np.subtract(q, p)), -i)
+                for i, q in enumerate(self._cold_keys) if len(q) == len(p)]
+        if not near:
+            return np.mean(self.cold)
+        return self.cold[-min(near)[1]]
+
+    def clear(self):
+        """Vide le cache (les statistiques sont conservées)."""
+        self._entries.clear()
+        self.nbytes = 0
+
+
+def _key(key):
+    """Les paramètres sous forme d'un tuple de float, utilisable comme clé."""
+    return tuple(float(k) for k in np.atleast_1d(key))
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from tan.matrix import laplacian, matrix
+from tan.syslin import SolveResult, diagnose, solve
+
+
+def test_import_is_lazy():
+    code = "import sys, tan.syslin.pcg; print('tan.syslin.auto' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_auto_choices_solve_the_system():
+    rng = np.random.default_rng(0)
+    cases = [matrix(100, 0.3)[0], laplacian((40, 40)), laplacian((500,)),
+             sp.csr_matrix(laplacian((30, 30)) + sp.diags(rng.uniform(0, 1, 900), 1, (900, 900)))]
+    for A in cases:
+        b = rng.standard_normal(A.shape[0])
+        r = solve(A, b, tol=1e-10)
+        assert isinstance(r, SolveResult) and r.converged
+        dense = A.toarray() if sp.issparse(A) else A
+        assert np.allclose(r.x, np.linalg.solve(dense, b), atol=1e-6)
+        assert r.residual < 1e-8
+
+
+def test_explicit_method_is_not_replaced():
+    A, b = matrix(300, 0.3)
+    r = solve(A, b, method="jacobi", maxiter=3)
+    assert r.method == "jacobi" and r.niter == 3
+    assert not r.converged
+    r = solve(A, b, method="gauss_seidel", tol=1e-12, maxiter=500)
+    assert r.method == "gauss_seidel" and r.converged
+
+
+def test_auto_falls_back_to_direct():
+    A = laplacian((40, 40))
+    b = np.ones(A.shape[0])
+    r = solve(A, b, tol=1e-10, maxiter=5)
+    assert r.method == "direct" and r.converged
+    assert "repli" in r.diagnostics["reason"]
+
+
+def test_operator_diagnostics():
+    A = laplacian((20, 20))
+    d = diagnose(spla.aslinearoperator(A))
+    assert d["operator"] and d["symmetric"]
+    r = solve(spla.aslinearoperator(A), np.ones(400), tol=1e-10)
+    assert r.method == "pcg" and r.converged
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from tan.matrix import matrix
+from tan.syslin.auto import solve
+from tan.syslin.banded import banded_factor, solve_banded, to_banded
+
+
+@pytest.mark.parametrize("format", ["dense", "dia", "csr", "operator"])
+def test_matrix_formats_agree(format):
+    dense, b = matrix(30, 0.3)
+    A, b2 = matrix(30, 0.3, format=format)
+    assert np.allclose(b2, b)
+    assert np.allclose(dense.sum(axis=1), b)
+    x = np.random.default_rng(0).standard_normal(30)
+    assert np.allclose(A @ x, dense @ x)
+
+
+def test_banded_storage_round_trip():
+    dense, _ = matrix(30, 0.3)
+    ab, _ = matrix(30, 0.3, format="banded")
+    for A in (dense, sp.csr_matrix(dense)):
+        l, u, ab2 = to_banded(A)
+        assert (l, u) == (2, 2)
+        assert np.allclose(ab2, ab)
+
+
+@pytest.mark.parametrize("spd", [False, True])
+def test_solve_banded_matches_solve(spd):
+    dense, b = matrix(200, 0.3)
+    ab, _ = matrix(200, 0.3, format="banded")
+    x_ref = np.linalg.solve(dense, b)
+    assert np.allclose(x_ref, 1)
+    for A, l, u in ((dense, None, None), (sp.csr_matrix(dense), None, None), (ab, 2, 2)):
+        assert np.allclose(solve_banded(A, b, l, u, spd=spd), x_ref)
+    solve = banded_factor(ab, 2, 2, spd=spd)
+    B = np.column_stack([b, 2 * b])
+    assert np.allclose(solve(B), np.column_stack([x_ref, 2 * x_ref]))
+
+
+def test_nonsymmetric_band_with_pivoting():
+    rng = np.random.default_rng(1)
+    A = sp.diags([rng.standard_normal(99), rng.standard_normal(100), rng.standard_normal(98)],
+                 [-1, 0, 2]).toarray()
+    b = rng.standard_normal(100)
+    l, u, ab = to_banded(A)
+    assert (l, u) == (1, 2)
+    assert np.allclose(A @ solve_banded(A, b), b)
+
+
+def test_operator_rejected():
+    A, _ = matrix(10, 0.3, format="operator")
+    with pytest.raises(TypeError):
+        to_banded(A)
+
+
+@pytest.mark.parametrize("n", [5, 7])
+def test_square_matrix_is_not_band_storage(n):
+    # pour n = l + u + 1, une matrice carrée ne doit pas être lue comme un stockage bande
+    A, b = matrix(n, 0.1)
+    x_ref = np.linalg.solve(A, b)
+    assert np.allclose(solve_banded(A, b, 2, 2), x_ref)
+    assert np.allclose(solve(A, b, method="banded").x, x_ref)
+    ab, _ = matrix(7, 0.1, format="banded")
+    A7, b7 = matrix(7, 0.1)
+    assert np.allclose(solve_banded(ab, b7, 2, 2), np.linalg.solve(A7, b7))
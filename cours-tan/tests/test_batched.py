@@ -0,0 +1,51 @@
+import numpy as np
+
+from tan.matrix import matrix
+from tan.syslin.batched import jacobi_batched, pcg_batched, sor_batched
+from tan.syslin.gauss_seidel import gauss_seidel2
+from tan.syslin.jacobi import jacobi2
+from tan.syslin.pcg import pcg
+
+
+def _stack(epsis=(0.05, 0.1, 0.2, 0.3), n=40):
+    A, b = zip(*(matrix(n, e) for e in epsis))
+    return np.stack(A), np.stack(b)
+
+
+def test_stationary_systems_leave_the_stack_independently():
+    A, b = _stack()
+    x0 = np.zeros(A.shape[1])
+    for batched, single in ((jacobi_batched, jacobi2), (sor_batched, gauss_seidel2)):
+        x, niter, inc = batched(A, b, tol=1e-10, maxiter=500, history="array")
+        assert inc.shape == (niter.max(), len(A))
+        # les systèmes plus faciles convergent plus tôt : leur historique est masqué ensuite
+        assert len(set(niter)) > 1
+        for k in range(len(A)):
+            xk, nk, _ = single(A[k], b[k], x0, tol=1e-10, maxiter=500)
+            assert niter[k] == nk
+            assert np.allclose(x[k], xk)
+            assert np.allclose(x[k], np.linalg.solve(A[k], b[k]), atol=1e-8)
+            assert not np.isnan(inc[:nk, k]).any() and np.isnan(inc[nk:, k]).all()
+
+
+def test_pcg_batched_matches_pcg_per_system():
+    rng = np.random.default_rng(0)
+    Q = rng.standard_normal((5, 30, 30))
+    A = np.einsum("kij,kil->kjl", Q, Q) + np.arange(1, 6)[:, None, None] * np.eye(30)
+    b = rng.standard_normal((5, 30))
+    b[2] = 0
+    for P in (None, "jacobi"):
+        x, niter, inc, res = pcg_batched(A, b, P=P, tol=1e-10, maxiter=200)
+        assert niter[2] == 0 and not x[2].any()
+        for k in (0, 1, 3, 4):
+            Pk = None if P is None else np.diag(np.diag(A[k]))
+            xk, nk, _, _ = pcg(A[k], b[k], P=Pk, tol=1e-10, maxiter=200)
+            # mêmes itérations, aux arrondis près des produits einsum
+            assert abs(niter[k] - nk) <= 2
+            assert np.allclose(x[k], np.linalg.solve(A[k], b[k]), atol=1e-7)
+
+
+def test_dispatch_from_single_system_solvers():
+    A, b = _stack()
+    x, niter, inc = jacobi2(A, b, None, tol=1e-10, maxiter=500)
+    assert np.allclose(x, np.linalg.solve(A, b[..., None])[..., 0], atol=1e-8)
@@ -0,0 +1,41 @@
+import numpy as np
+
+from tan.matrix import laplacian, matrix
+from tan.syslin.gauss_seidel import gauss_seidel2
+from tan.syslin.pcg import block_cg, pcg
+from tan.syslin.precond import IC0
+
+
+def test_block_cg_matches_solve_and_saves_iterations():
+    A = laplacian((24, 24))
+    rng = np.random.default_rng(0)
+    B = rng.standard_normal((A.shape[0], 6))
+    X_ref = np.linalg.solve(A.toarray(), B)
+    single = [pcg(A, B[:, j], tol=1e-10, maxiter=1000)[1] for j in range(6)]
+    for P in (None, IC0(A)):
+        X, niter, inc, res = block_cg(A, B, P=P, tol=1e-10, maxiter=1000)
+        assert X.shape == B.shape
+        assert np.allclose(X, X_ref, atol=1e-7)
+        assert niter.shape == (6,)
+    X, niter, inc, res = block_cg(A, B, tol=1e-10, maxiter=1000)
+    # espace de Krylov par blocs : moins d'itérations que la colonne la plus lente
+    assert niter.max() < max(single)
+
+
+def test_block_cg_retires_converged_columns():
+    A = laplacian((24, 24))
+    rng = np.random.default_rng(1)
+    B = np.column_stack([np.zeros(A.shape[0]), rng.standard_normal((A.shape[0], 2))])
+    X, niter, inc, res = block_cg(A, B, tol=1e-10, maxiter=1000, history="array")
+    assert niter[0] == 0 and not X[:, 0].any()
+    assert np.allclose(A @ X, B, atol=1e-7)
+    assert res.shape[1] == 3
+
+
+def test_stationary_solvers_with_several_right_hand_sides():
+    A, b = matrix(80, 0.2)
+    B = np.column_stack([b, 2 * b, np.ones(80)])
+    X, niter, inc = gauss_seidel2(A, B, np.zeros((80, 3)), tol=1e-10, maxiter=500)
+    assert np.allclose(X, np.linalg.solve(A, B), atol=1e-8)
+    for j in range(3):
+        assert niter[j] == gauss_seidel2(A, B[:, j], np.zeros(80), tol=1e-10, maxiter=500)[1]
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from tan.matrix import laplacian, matrix
+from tan.syslin.gradient import chebyshev, richardson
+from tan.syslin.precond import Jacobi
+
+
+def test_gershgorin_bounds_converge_at_chebyshev_rate():
+    # laplacien décalé : les disques de Gershgorin sont dans [0.5, 8.5]
+    A = (laplacian((20, 20)) + 0.5 * sp.identity(400)).tocsr()
+    b = np.ones(A.shape[0])
+    x, niter, res = chebyshev(A, b, tol=1e-8, maxiter=2000, check=5)
+    assert np.allclose(A @ x, b, atol=1e-6)
+    assert res[-1] < 1e-8
+    with pytest.raises(ValueError, match="Gershgorin"):
+        chebyshev(laplacian((20, 20)), b)
+    lam = np.linalg.eigvalsh(A.toarray())
+    lmin, lmax = lam[0], lam[-1]
+    x2, niter2, res2 = chebyshev(A, b, bounds=(lmin, lmax), tol=1e-8, maxiter=2000, check=5)
+    kappa = lmax / lmin
+    rate = (np.sqrt(kappa) - 1) / (np.sqrt(kappa) + 1)
+    assert niter2 <= np.log(1e-8 / 2) / np.log(rate) + 5
+    assert np.allclose(A @ x2, b, atol=1e-6)
+    assert niter2 <= niter
+
+
+def test_faster_than_optimal_richardson():
+    A, b = matrix(200, 0.3)
+    A = A @ A.T
+    lam = np.linalg.eigvalsh(A)
+    bounds = (lam[0], lam[-1])
+    _, n_cheb, _ = chebyshev(A, b, bounds=bounds, tol=1e-10, maxiter=5000, check=1)
+    _, n_rich, _ = richardson(A, b, alpha=2 / (lam[0] + lam[-1]), tol=1e-10, maxiter=5000)
+    assert n_cheb < n_rich / 2
+
+
+def test_jacobi_preconditioner_bounds_and_operator():
+    A, b = matrix(100, 0.2)
+    x, niter, res = chebyshev(A, b, P=Jacobi(A), tol=1e-10, maxiter=500)
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+    with pytest.raises(TypeError):
+        chebyshev(spla.aslinearoperator(A), b)
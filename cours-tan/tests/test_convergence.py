@@ -0,0 +1,41 @@
+import numpy as np
+
+from tan.matrix import laplacian, matrix
+from tan.syslin.convergence import predict, spectral_radius
+from tan.syslin.gauss_seidel import gauss_seidel2
+from tan.syslin.jacobi import jacobi2
+from tan.syslin.sor import sor2
+
+
+def _observed(A, b):
+    x0 = np.zeros(len(b))
+    return {"jacobi": jacobi2(A, b, x0, tol=1e-10, maxiter=5000)[1],
+            "gauss_seidel": gauss_seidel2(A, b, x0, tol=1e-10, maxiter=5000)[1],
+            "sor": sor2(A, b, x0, "auto", tol=1e-10, maxiter=5000)[1]}
+
+
+def test_predict_sor_auto_uses_safeguarded_omega():
+    A, b = matrix(200, 0.3)
+    p = predict(A, b, tol=1e-10)
+    assert p["sor"].omega == 1
+    assert p["sor"].niter <= p["gauss_seidel"].niter
+    observed = _observed(A, b)
+    for m, q in p.items():
+        assert q.converges
+        assert abs(q.niter - observed[m]) <= 0.25 * observed[m]
+
+
+def test_predict_ranks_methods_on_laplacian():
+    A = laplacian((16, 16)).toarray()
+    b = np.ones(len(A))
+    p = predict(A, b, tol=1e-10)
+    assert p["sor"].omega > 1
+    assert p["sor"].niter < p["gauss_seidel"].niter < p["jacobi"].niter
+    observed = _observed(A, b)
+    assert observed["sor"] < observed["gauss_seidel"] < observed["jacobi"]
+
+
+def test_spectral_radius_matches_eigvals():
+    A, _ = matrix(12, 0.3)
+    B = np.eye(12) - np.linalg.solve(np.tril(A), A)
+    assert np.isclose(spectral_radius(A, "gauss_seidel"), np.max(np.abs(np.linalg.eigvals(B))))
@@ -0,0 +1,55 @@
+import numpy as np
+import scipy.sparse as sp
+
+from tan.matrix import laplacian
+from tan.syslin.deflation import RecycledCG, deflated_cg
+from tan.syslin.pcg import pcg
+
+
+def _sequence(n_steps, shape=(32, 32)):
+    L = laplacian(shape)
+    n = L.shape[0]
+    rng = np.random.default_rng(0)
+    for t in range(n_steps):
+        A = (L + sp.diags(1e-4 * t * (1 + np.sin(np.arange(n) / 50)))).tocsr()
+        yield A, rng.standard_normal(n)
+
+
+def test_recycled_cg_sequence_converges_and_saves_iterations():
+    rc = RecycledCG(k=8)
+    plain, recycled = [], []
+    for A, b in _sequence(6):
+        x, niter, inc, res = rc.solve(A, b, tol=1e-10, maxiter=1000)
+        assert np.allclose(x, np.linalg.solve(A.toarray(), b), atol=1e-7)
+        assert res[-1] < 1e-10
+        recycled.append(niter)
+        plain.append(pcg(A, b, tol=1e-10, maxiter=1000)[1])
+    assert rc.W.shape == (A.shape[0], 8)
+    assert np.all(np.isfinite(rc.ritz))
+    assert recycled[0] == plain[0]
+    assert sum(recycled[2:]) < 0.8 * sum(plain[2:])
+
+
+def test_recycled_cg_window_buffers_are_finite(monkeypatch):
+    # un tampon np.empty peut contenir des NaN : ils ne doivent pas atteindre la fenêtre
+    empty_like = np.empty_like
+
+    def nan_like(a, *args, **kwargs):
+        out = empty_like(a, *args, **kwargs)
+        if out.dtype.kind == "f":
+            out.fill(np.nan)
+        return out
+
+    monkeypatch.setattr(np, "empty_like", nan_like)
+    rc = RecycledCG(k=4)
+    for A, b in _sequence(2, shape=(16, 16)):
+        rc.solve(A, b, tol=1e-10, maxiter=1000)
+    assert np.all(np.isfinite(rc.W))
+
+
+def test_deflated_cg_without_space_is_pcg():
+    A, b = next(_sequence(1))
+    x, niter, _, res = deflated_cg(A, b, None, tol=1e-8, maxiter=500)
+    x_ref, niter_ref, _, res_ref = pcg(A, b, tol=1e-8, maxiter=500)
+    assert niter == niter_ref
+    assert np.allclose(x, x_ref)
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from tan.matrix import laplacian
+from tan.syslin.direct import (FactorizationCache, backward_substitution, cholesky,
+                               cholesky_solve, fingerprint, forward_substitution, lu,
+                               lu_solve, solve)
+
+rng = np.random.default_rng(0)
+
+
+@pytest.mark.parametrize("n, block", [(50, 64), (130, 32), (97, 8)])
+def test_blocked_lu_and_cholesky(n, block):
+    A = rng.standard_normal((n, n))
+    b = rng.standard_normal((n, 3))
+    LU, perm = lu(A, block=block)
+    L = np.tril(LU, -1) + np.eye(n)
+    assert np.allclose(L @ np.triu(LU), A[perm])
+    assert np.all(np.abs(L) <= 1 + 1e-12)
+    assert np.allclose(lu_solve(LU, perm, b), np.linalg.solve(A, b))
+    S = A @ A.T + n * np.eye(n)
+    C = cholesky(S, block=block)
+    assert np.allclose(C, np.linalg.cholesky(S))
+    assert np.allclose(cholesky_solve(C, b), np.linalg.solve(S, b))
+
+
+def test_triangular_substitutions():
+    T = np.tril(rng.standard_normal((100, 100))) + 10 * np.eye(100)
+    b = rng.standard_normal(100)
+    assert np.allclose(T @ forward_substitution(T, b, block=16), b)
+    assert np.allclose(T.T @ backward_substitution(T.T, b, block=16), b)
+
+
+def test_singular_matrix_raises():
+    with pytest.raises(np.linalg.LinAlgError):
+        lu(np.ones((4, 4)))
+
+
+def test_cache_reuses_factorization_and_evicts():
+    cache = FactorizationCache()
+    A = rng.standard_normal((60, 60))
+    b = rng.standard_normal(60)
+    for _ in range(3):
+        assert np.allclose(solve(A, b, cache=cache), np.linalg.solve(A, b))
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 1)
+    B = A.copy()
+    B[3, 7] += 1e-6
+    assert fingerprint(B) != fingerprint(A)
+    solve(B, b, cache=cache)
+    assert cache.misses == 2
+    # cache.nbytes contient les facteurs de A et de B : place pour un seul
+    small = FactorizationCache(maxbytes=cache.nbytes // 2 + 1)
+    solve(A, b, cache=small)
+    solve(B, b, cache=small)
+    assert len(small) == 1 and small.nbytes <= small.maxbytes
+
+
+def test_sparse_and_spd():
+    A = laplacian((20, 20))
+    b = np.ones(400)
+    for spd in (False, True):
+        x = solve(A, b, spd=spd, cache=False)
+        assert np.allclose(A @ x, b)
+    assert np.allclose(solve(A.toarray(), b, spd=True), np.linalg.solve(A.toarray(), b))
@@ -0,0 +1,25 @@
+import numpy as np
+
+from tan.eig.eigpower import eigpower
+from tan.eig.invshift import invshift
+
+A = np.array([[4.0, 1, 0, 0], [1, 3, 1, 0], [0, 1, 2, 1], [0, 0, 1, 1]])
+EIGS = np.linalg.eigvalsh(A)
+
+
+def test_eigpower_arity_depends_on_history():
+    lam, x, niter = eigpower(A, tol=1e-12, nmax=1000)
+    assert np.isclose(lam, EIGS[-1])
+    assert np.allclose(A @ x, lam * x, atol=1e-5)
+    lam2, x2, niter2, err = eigpower(A, tol=1e-12, nmax=1000, history="array")
+    assert (lam2, niter2) == (lam, niter)
+    assert len(err) == niter and err[-1] <= 1e-12 * abs(lam)
+
+
+def test_invshift_arity_depends_on_history():
+    x0 = np.ones(4)
+    lam, x, niter = invshift(A, mu=1.9, tol=1e-12, x0=x0)
+    assert np.isclose(lam, EIGS[np.argmin(abs(EIGS - 1.9))])
+    lam2, x2, niter2, err = invshift(A, mu=1.9, tol=1e-12, x0=x0, history="list")
+    assert (lam2, niter2) == (lam, niter)
+    assert len(err) == niter
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from tan.matrix import laplacian, matrix
+from tan.syslin.gauss_seidel import gauss_seidel1, gauss_seidel2, gauss_seidel_multicolor
+from tan.syslin.jacobi import jacobi2
+
+
+def test_triangular_sweep_matches_row_loop():
+    A, b = matrix(60, 0.2)
+    x0 = np.zeros(60)
+    x1, n1, inc1 = gauss_seidel1(A, b, x0, tol=1e-10, maxiter=500)
+    for M in (A, sp.csr_matrix(A)):
+        x2, n2, inc2 = gauss_seidel2(M, b, x0, tol=1e-10, maxiter=500)
+        assert n2 == n1
+        assert np.allclose(inc2, inc1, rtol=1e-12, atol=1e-14)
+        assert np.allclose(x2, np.linalg.solve(A, b), atol=1e-9)
+
+
+def test_gauss_seidel_converges_twice_as_fast_as_jacobi():
+    A = laplacian((16, 16))
+    b = A @ np.ones(256)
+    x, n_gs, _ = gauss_seidel2(A, b, np.zeros(256), tol=1e-8, maxiter=5000)
+    _, n_j, _ = jacobi2(A, b, np.zeros(256), tol=1e-8, maxiter=5000)
+    assert np.allclose(x, 1, atol=1e-5)
+    # rho_GS = rho_J^2 pour le Laplacien
+    assert 0.4 < n_gs / n_j < 0.6
+
+
+def test_multicolor_red_black():
+    A = laplacian((16, 16))
+    b = A @ np.ones(256)
+    _, n_gs, _ = gauss_seidel2(A, b, np.zeros(256), tol=1e-8, maxiter=5000)
+    i, j = np.divmod(np.arange(256), 16)
+    for colors in (None, (i + j) % 2):
+        x, niter, inc = gauss_seidel_multicolor(A, b, np.zeros(256), colors=colors, tol=1e-8,
+                                                maxiter=5000)
+        assert np.allclose(x, np.linalg.solve(A.toarray(), b), atol=1e-5)
+        # même taux asymptotique que l'ordre naturel (ordre compatible)
+        assert abs(niter - n_gs) <= 0.05 * n_gs
+
+
+def test_gauss_seidel_rejects_operator():
+    A, b = matrix(20, 0.2)
+    with pytest.raises(TypeError):
+        gauss_seidel2(spla.aslinearoperator(A), b, np.zeros(20))
+    with pytest.raises(TypeError):
+        gauss_seidel_multicolor(spla.aslinearoperator(A), b, np.zeros(20))
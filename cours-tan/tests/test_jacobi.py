@@ -0,0 +1,53 @@
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from tan.matrix import laplacian, matrix
+from tan.syslin.jacobi import jacobi1, jacobi2, jacobi_spectral_radius
+from tan.syslin.splitting import Workspace
+
+
+def test_matrix_free_kernel_matches_row_loop():
+    A, b = matrix(60, 0.2)
+    x0 = np.zeros(60)
+    x1, n1, inc1 = jacobi1(A, b, x0, tol=1e-10, maxiter=500)
+    for M in (A, sp.csr_matrix(A)):
+        x2, n2, inc2 = jacobi2(M, b, x0, tol=1e-10, maxiter=500)
+        assert n2 == n1
+        assert np.allclose(inc2, inc1, rtol=1e-10, atol=1e-14)
+        assert np.allclose(x2, np.linalg.solve(A, b), atol=1e-9)
+
+
+def test_operator_with_diagonal():
+    A, b = matrix(60, 0.2)
+    op = spla.aslinearoperator(A)
+    op.diagonal = lambda: np.diag(A).copy()
+    x, niter, inc = jacobi2(op, b, np.zeros(60), tol=1e-10, maxiter=500)
+    assert niter == jacobi2(A, b, np.zeros(60), tol=1e-10, maxiter=500)[1]
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-9)
+
+
+def test_weighted_jacobi_and_spectral_radius():
+    A = laplacian(64)
+    b = A @ np.ones(64)
+    lam = np.linalg.eigvalsh(np.eye(64) - A.toarray() / 2)
+    rho, _ = jacobi_spectral_radius(A, maxiter=2000)
+    assert abs(rho - np.abs(lam).max()) < 1e-3
+    # omega < 1 ralentit, omega trop grand diverge (valeurs propres de D^{-1}A dans ]0, 2[)
+    _, n1, _ = jacobi2(A, b, np.zeros(64), tol=1e-6, maxiter=50000)
+    _, n23, _ = jacobi2(A, b, np.zeros(64), tol=1e-6, maxiter=50000, omega=2 / 3)
+    assert n1 < n23 < 50000
+    _, n, inc = jacobi2(A, b, np.zeros(64), tol=1e-6, maxiter=200, omega=1.2)
+    assert n == 200 and inc[-1] > inc[0]
+
+
+def test_workspace_is_reused():
+    A, b = matrix(80, 0.2)
+    ws = Workspace()
+    x, n, _ = jacobi2(A, b, np.zeros(80), tol=1e-10, maxiter=500, workspace=ws)
+    vectors = [id(v) for v in ws._vectors]
+    y, m, _ = jacobi2(A, 2 * b, np.zeros(80), tol=1e-10, maxiter=500, workspace=ws)
+    assert [id(v) for v in ws._vectors] == vectors
+    assert np.allclose(y, 2 * x, atol=1e-8)
+    # la solution retournée n'est pas un vecteur de travail
+    assert not any(np.shares_memory(x, v) for v in ws._vectors)
@@ -0,0 +1,46 @@
+import numpy as np
+import scipy.sparse as sp
+
+from tan.syslin.kaczmarz import _random_access, kaczmarz
+
+
+def _system(m=2000, n=20, seed=0):
+    rng = np.random.default_rng(seed)
+    A = rng.standard_normal((m, n)) * rng.uniform(0.5, 2, (m, 1))
+    x = rng.standard_normal(n)
+    return A, A @ x, x
+
+
+def test_dense_memmap_sparse_and_stream_reach_solution(tmp_path):
+    A, b, x_true = _system()
+    np.save(tmp_path / "A.npy", A)
+    np.save(tmp_path / "b.npy", b)
+
+    def stream():
+        for s in range(0, len(A), 300):
+            yield A[s:s + 300], b[s:s + 300]
+
+    for A_, b_ in ((A, b), (tmp_path / "A.npy", tmp_path / "b.npy"), (sp.csr_matrix(A), b),
+                   (stream, None)):
+        for block, average in ((1, True), (8, True), (8, False)):
+            x, niter, inc = kaczmarz(A_, b_, tol=1e-10, maxiter=200, block=block,
+                                     average=average)
+            assert np.allclose(x, x_true, atol=1e-8)
+            assert niter < 200
+
+
+def test_two_level_sampling_follows_block_norms():
+    m, n, block = 64, 4, 4
+    rng = np.random.default_rng(1)
+    A = np.ones((m, n)) * np.repeat(np.arange(1, m // block + 1), block)[:, None]
+    b = np.arange(m, dtype=float)
+    # des paquets de 16 lignes : 4 paquets de 4 blocs
+    epoch = _random_access(A, b, block, rng, chunk_bytes=16 * 8 * n)
+    counts = np.zeros(m // block)
+    for _ in range(400):
+        for R, br in epoch():
+            assert R.shape == (block, n)
+            counts[int(br[0]) // block] += 1
+    norms = block * n * np.arange(1, m // block + 1) ** 2
+    assert counts.sum() == 400 * m // block
+    assert np.allclose(counts / counts.sum(), norms / norms.sum(), atol=0.01)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from tan.matrix import laplacian
+from tan.syslin.bicgstab import bicgstab
+from tan.syslin.gmres import gmres
+from tan.syslin.precond import ILU0, Jacobi
+
+
+def _convection_diffusion(m=20, c=10.0):
+    """Laplacien 2D plus un terme de convection centré : non symétrique."""
+    h = 1 / (m + 1)
+    D = sp.diags([-1.0, 1.0], [-1, 1], shape=(m, m)) * (c * h / 2)
+    C = sp.kron(sp.identity(m), D) + sp.kron(D, sp.identity(m))
+    return (laplacian((m, m)) + C).tocsr()
+
+
+@pytest.mark.parametrize("solver", [gmres, bicgstab])
+def test_nonsymmetric_system_matches_solve(solver):
+    A = _convection_diffusion()
+    b = np.random.default_rng(0).standard_normal(A.shape[0])
+    x_ref = np.linalg.solve(A.toarray(), b)
+    counts = {}
+    for name, P in (("none", None), ("jacobi", Jacobi(A)), ("ilu0", ILU0(A))):
+        x, niter, inc, res = solver(A, b, P=P, tol=1e-10, maxiter=2000)
+        assert np.allclose(x, x_ref, atol=1e-7)
+        assert res[-1] < 1e-10
+        # le résidu suivi est celui du système initial
+        assert np.isclose(np.linalg.norm(b - A @ x) / np.linalg.norm(b), res[-1], rtol=1e-3,
+                          atol=1e-13)
+        counts[name] = niter
+    assert counts["ilu0"] < counts["none"]
+
+
+def test_gmres_without_restart_is_monotone_and_finite():
+    A = _convection_diffusion(m=12)
+    b = np.ones(A.shape[0])
+    n = A.shape[0]
+    x, niter, inc, res = gmres(A, b, tol=1e-12, maxiter=n, restart=n, history="array")
+    assert niter <= n
+    assert np.all(np.diff(res) <= 1e-14)
+    assert np.allclose(A @ x, b, atol=1e-9)
+
+
+def test_gmres_restart_and_operator():
+    A = _convection_diffusion()
+    b = np.ones(A.shape[0])
+    x, niter, inc, res = gmres(spla.aslinearoperator(A), b, tol=1e-10, maxiter=2000, restart=10)
+    assert niter > 10
+    assert np.allclose(A @ x, b, atol=1e-7)
+
+
+@pytest.mark.parametrize("solver", [gmres, bicgstab])
+def test_atol_and_zero_rhs(solver):
+    A = _convection_diffusion(m=8)
+    x, niter, inc, res = solver(A, np.zeros(A.shape[0]))
+    assert niter == 0 and not x.any()
+    b = np.ones(A.shape[0])
+    x, niter, inc, res = solver(A, b, tol=0, atol=1e-3, maxiter=500)
+    assert np.linalg.norm(b - A @ x) <= 1.01e-3
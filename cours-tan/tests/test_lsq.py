@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from tan.syslin.lsq import cgls, lsqr
+
+
+def _problem(m=200, n=30, seed=0):
+    rng = np.random.default_rng(seed)
+    A = rng.standard_normal((m, n)) @ np.diag(np.logspace(0, 2, n))
+    # système incompatible : r = b - Ax ne tend pas vers zéro
+    return A, rng.standard_normal(m)
+
+
+@pytest.mark.parametrize("solver", [cgls, lsqr])
+def test_matches_lstsq_on_inconsistent_system(solver):
+    A, b = _problem()
+    x_ref = np.linalg.lstsq(A, b, rcond=None)[0]
+    for op in (A, sp.csr_matrix(A), spla.aslinearoperator(A)):
+        x, niter, inc, res = solver(op, b, tol=1e-12, maxiter=200)
+        assert np.allclose(x, x_ref, rtol=1e-8, atol=1e-10)
+        assert niter < 100
+        assert res[0] == 1 and res[-1] < 1e-10
+        assert np.linalg.norm(b - A @ x) > 1
+
+
+def test_cgls_and_lsqr_iterates_agree():
+    A, b = _problem(seed=1)
+    for k in (1, 5, 10):
+        x1 = cgls(A, b, tol=0, maxiter=k)[0]
+        x2 = lsqr(A, b, tol=0, maxiter=k)[0]
+        assert np.allclose(x1, x2, rtol=1e-6)
+
+
+def test_lsqr_residual_estimate_is_normal_equation_residual():
+    A, b = _problem(seed=2)
+    seen = []
+    lsqr(A, b, tol=0, maxiter=8, callback=lambda k, x, e, r: seen.append((x.copy(), r)))
+    ns0 = np.linalg.norm(A.T @ b)
+    for x, r in seen:
+        assert np.isclose(r, np.linalg.norm(A.T @ (b - A @ x)) / ns0, rtol=1e-6)
+
+
+@pytest.mark.parametrize("solver", [cgls, lsqr])
+def test_zero_right_hand_side(solver):
+    A, _ = _problem()
+    x, niter, inc, res = solver(A, np.zeros(200))
+    assert niter == 0 and not x.any()
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+import scipy.linalg
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from tan.matrix import laplacian, matrix
+from tan.syslin.mixed import mixed_solve
+
+
+@pytest.mark.parametrize("spd", [False, True])
+def test_well_conditioned_dense_refines_to_double(spd):
+    A, _ = matrix(300, 0.3)
+    if spd:
+        A = A @ A.T
+    x_true = np.random.default_rng(0).standard_normal(300)
+    b = A @ x_true
+    x, niter, inc, precision = mixed_solve(A, b, spd=spd)
+    assert precision == "float32"
+    assert 1 <= niter <= 10
+    assert np.allclose(x, x_true, rtol=1e-12, atol=1e-12)
+    assert inc[-1] < inc[0]
+
+
+def test_sparse_matrix():
+    A = laplacian((30, 30)).tocsr()
+    b = np.ones(900)
+    x, niter, inc, precision = mixed_solve(A, b, spd=True)
+    assert precision == "float32"
+    assert np.allclose(A @ x, b, rtol=0, atol=1e-10)
+
+
+def test_ill_conditioned_falls_back_to_double():
+    A = scipy.linalg.hilbert(12)
+    b = A @ np.ones(12)
+    x, niter, inc, precision = mixed_solve(A, b)
+    assert precision == "float64"
+    # kappa ~ 1e16 : seule l'erreur inverse est petite
+    assert np.linalg.norm(b - A @ x) <= 1e-12 * np.linalg.norm(b)
+
+
+def test_operator_rejected():
+    with pytest.raises(TypeError):
+        mixed_solve(spla.aslinearoperator(sp.eye(3)), np.ones(3))
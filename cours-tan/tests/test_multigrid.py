@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from tan.matrix import laplacian
+from tan.syslin.multigrid import Multigrid, multigrid
+from tan.syslin.pcg import pcg
+
+
+@pytest.mark.parametrize("shape", [(255,), (31, 31)])
+@pytest.mark.parametrize("smoother", ["gauss_seidel", "jacobi"])
+def test_cycles_converge_independently_of_grid_size(shape, smoother):
+    counts = []
+    for s in (shape, tuple(2 * m + 1 for m in shape)):
+        A = laplacian(s)
+        b = np.ones(A.shape[0])
+        x, niter, inc, res = multigrid(A, b, shape=s, tol=1e-10, maxiter=100, smoother=smoother)
+        assert np.allclose(A @ x, b, atol=1e-8 * np.linalg.norm(b))
+        counts.append(niter)
+    assert counts[1] <= counts[0] + 2
+    assert counts[1] < 30
+
+
+def test_w_cycle_and_pcg_preconditioner():
+    shape = (63, 63)
+    A = laplacian(shape)
+    b = np.random.default_rng(0).standard_normal(A.shape[0])
+    n_v = multigrid(A, b, shape=shape, tol=1e-10)[1]
+    n_w = multigrid(A, b, shape=shape, tol=1e-10, cycle="W")[1]
+    assert n_w <= n_v
+    P = Multigrid(A, shape)
+    x, niter, inc, res = pcg(A, b, P=P, tol=1e-10, maxiter=100)
+    assert niter < 15
+    assert np.allclose(A @ x, b, atol=1e-8)
+    # un cycle à partir de 0 est symétrique : P^{-1} est une matrice symétrique
+    u, v = np.random.default_rng(1).standard_normal((2, A.shape[0]))
+    assert np.isclose(u @ P.apply(v), v @ P.apply(u))
+
+
+def test_invalid_arguments():
+    A = laplacian((15,))
+    with pytest.raises(ValueError):
+        Multigrid(A, shape=(4, 4))
+    with pytest.raises(ValueError):
+        Multigrid(A, cycle="F")
@@ -0,0 +1,34 @@
+import numpy as np
+
+from tan.matrix import matrix
+from tan.syslin.gauss_seidel import gauss_seidel1
+from tan.syslin.jacobi import jacobi2
+from tan.syslin.outofcore import MatrixStream
+from tan.syslin.sor import sor1
+
+
+def test_streamed_solvers_match_in_memory(tmp_path):
+    A, b = matrix(120, 0.2)
+    path = tmp_path / "A.npy"
+    np.save(path, A)
+    x0 = np.zeros(120)
+    # blocs de 16 lignes : plusieurs blocs, le dernier incomplet
+    S = MatrixStream(path, block_bytes=16 * 120 * 8)
+    assert S.rows == 16
+    assert np.allclose(S @ b, A @ b)
+    assert np.allclose(S.diagonal(), np.diag(A))
+    for stream in (S, path, np.load(path, mmap_mode="r")):
+        for solver, args in ((gauss_seidel1, ()), (sor1, (1.2,))):
+            x_mem, n_mem, _ = solver(A, b, x0, *args, tol=1e-10, maxiter=200)
+            x, niter, inc = solver(stream, b, x0, *args, tol=1e-10, maxiter=200)
+            assert niter == n_mem
+            assert np.allclose(x, x_mem)
+        x, niter, inc = jacobi2(stream, b, x0, tol=1e-10, maxiter=200)
+        assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+
+
+def test_streamed_sor_auto_converges(tmp_path):
+    A, b = matrix(80, 0.1)
+    np.save(tmp_path / "A.npy", A)
+    x, niter, inc = sor1(tmp_path / "A.npy", b, np.zeros(80), "auto", tol=1e-10, maxiter=200)
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
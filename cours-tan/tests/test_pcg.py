@@ -0,0 +1,58 @@
+import numpy as np
+import scipy.sparse.linalg as spla
+
+from tan.matrix import laplacian, matrix
+from tan.syslin.pcg import pcg
+from tan.syslin.precond import IC0
+
+
+def _counting(A):
+    """A sous forme de LinearOperator qui compte les produits A @ p."""
+    calls = [0]
+
+    def matvec(x):
+        calls[0] += 1
+        return A @ np.ravel(x)
+
+    return spla.LinearOperator(A.shape, matvec=matvec, dtype=float), calls
+
+
+def test_pcg_matches_solve():
+    A, b = matrix(200, 0.2)
+    x, niter, inc, res = pcg(A, b, tol=1e-12, maxiter=500)
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-9)
+    assert res[0] == 1 and res[-1] < 1e-12
+    assert len(res) == niter + 1 and len(inc) == niter
+
+
+def test_pcg_one_matvec_per_iteration():
+    A = laplacian((20, 20))
+    b = A @ np.ones(A.shape[0])
+    op, calls = _counting(A)
+    x, niter, inc, res = pcg(op, b, tol=1e-10, maxiter=500)
+    # le résidu initial b - A x0, puis un produit par itération
+    assert calls[0] == niter + 1
+    assert np.allclose(x, 1, atol=1e-8)
+
+
+def test_pcg_preconditioner_reduces_iterations():
+    A = laplacian((30, 30))
+    b = A @ np.ones(A.shape[0])
+    x, n_plain, _, _ = pcg(A, b, tol=1e-10, maxiter=1000)
+    y, n_ic, _, _ = pcg(A, b, P=IC0(A), tol=1e-10, maxiter=1000)
+    assert np.allclose(y, np.linalg.solve(A.toarray(), b), atol=1e-7)
+    assert n_ic < n_plain
+    # en arithmétique exacte, au plus n itérations
+    assert n_plain <= A.shape[0]
+
+
+def test_pcg_history_array_and_x0():
+    A, b = matrix(100, 0.1)
+    x, niter, inc, res = pcg(A, np.zeros(100), history="array")
+    assert niter == 0 and not x.any()
+    # x0 déjà proche de la solution : atol arrête aussitôt
+    xs = np.linalg.solve(A, b)
+    x, niter, inc, res = pcg(A, b, x0=xs, atol=1e-8)
+    assert niter <= 1 and np.allclose(x, xs)
+    x, niter, inc, res = pcg(A, b, tol=1e-10, history="array")
+    assert isinstance(res, np.ndarray) and res.shape == (niter + 1,)
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from tan.matrix import laplacian, matrix
+from tan.syslin.pcg import pcg
+from tan.syslin.precond import IC0, ILU0, _ilu0
+
+
+def _ilu0_reference(A):
+    """ILU(0) par l'algorithme IKJ dense, restreint à la structure de A."""
+    A = np.array(A, dtype=float)
+    nz = A != 0
+    n = len(A)
+    for i in range(1, n):
+        for k in range(i):
+            if nz[i, k]:
+                A[i, k] /= A[k, k]
+                for j in range(k + 1, n):
+                    if nz[i, j]:
+                        A[i, j] -= A[i, k] * A[k, j]
+    return A
+
+
+@pytest.mark.parametrize("A", [
+    laplacian((7, 9)).toarray(),
+    matrix(30, 0.3)[0],
+    (sp.random(40, 40, density=0.1, random_state=1) + 4 * sp.eye(40)).toarray(),
+])
+def test_ilu0_matches_reference(A):
+    assert np.allclose(_ilu0(A).toarray(), _ilu0_reference(A))
+
+
+def test_ilu0_is_exact_for_tridiagonal():
+    A = laplacian((50,))
+    r = np.random.default_rng(0).standard_normal(50)
+    assert np.allclose(ILU0(A).apply(A @ r), r)
+
+
+def test_ilu0_errors():
+    with pytest.raises(ValueError, match="diagonal"):
+        ILU0(np.array([[0.0, 1.0], [1.0, 1.0]]))
+    with pytest.raises(ValueError, match="Pivot"):
+        IC0(np.array([[1.0, 2.0], [2.0, 1.0]]))
+
+
+def test_ic0_reduces_pcg_iterations():
+    A = laplacian((40, 40))
+    b = np.ones(A.shape[0])
+    plain = pcg(A, b, tol=1e-10, maxiter=1000)
+    x, niter, inc, res = pcg(A, b, P=IC0(A), tol=1e-10, maxiter=1000)
+    assert np.allclose(A @ x, b, atol=1e-7)
+    assert niter < 0.6 * plain[1]
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from tan.matrix import laplacian
+from tan.syslin.pcg import pcg
+from tan.syslin.schwarz import Schwarz, block_jacobi
+
+
+def test_graph_overlap_reduces_pcg_iterations_on_grid():
+    A = laplacian((30, 30))
+    b = np.ones(A.shape[0])
+    counts = []
+    for overlap in (0, 1, 3):
+        with Schwarz(A, nblocks=6, overlap=overlap, workers=1, spd=True) as P:
+            x, niter, inc, res = pcg(A, b, P=P, tol=1e-10, maxiter=500)
+        assert np.allclose(A @ x, b, atol=1e-7)
+        counts.append(niter)
+    assert counts[0] > counts[1] > counts[2]
+
+
+def test_overlap_reaches_neighbouring_grid_rows():
+    A = laplacian((10, 10))
+    with Schwarz(A, nblocks=2, overlap=2, workers=1) as P:
+        s, e, h, _ = P.blocks[0]
+        # le bloc 0 couvre les lignes 0 à 4 de la grille : 2 couches de plus
+        assert (s, e) == (0, 50)
+        assert set(h) == set(range(50, 70))
+
+
+def test_workers_match_serial_and_own_their_blocks():
+    A = laplacian((20, 20))
+    r = np.random.default_rng(0).standard_normal(A.shape[0])
+    with Schwarz(A, nblocks=5, overlap=2, workers=1) as P1:
+        z1 = P1.apply(r)
+    with Schwarz(A, nblocks=5, overlap=2, workers=3) as P3:
+        for _ in range(3):
+            assert np.allclose(P3.apply(r), z1)
+        owned = P3._run("__getattribute__", "blocks")
+        assert sorted(i for blocks in owned for i, *_ in blocks) == list(range(5))
+        assert [[i for i, *_ in blocks] for blocks in owned] == [[0, 3], [1, 4], [2]]
+
+
+def test_worker_errors_are_raised():
+    A = np.eye(8)
+    A[6, 6] = 0
+    with pytest.raises(np.linalg.LinAlgError):
+        Schwarz(A, nblocks=4, workers=2)
+
+
+def test_block_jacobi_solves_tridiagonal():
+    T = 4 * np.eye(50) - np.eye(50, k=1) - np.eye(50, k=-1)
+    b = np.ones(50)
+    x0, k0, _ = block_jacobi(T, b, np.zeros(50), 1e-10, 500, nblocks=5, workers=2)
+    x2, k2, _ = block_jacobi(T, b, np.zeros(50), 1e-10, 500, nblocks=5, overlap=2, workers=2)
+    for x in (x0, x2):
+        assert np.allclose(x, np.linalg.solve(T, b))
+    assert k2 < k0
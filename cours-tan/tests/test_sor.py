@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from tan.matrix import laplacian, matrix
+from tan.syslin.batched import sor_batched
+from tan.syslin.gauss_seidel import gauss_seidel1, gauss_seidel2
+from tan.syslin.sor import sor1, sor2
+
+
+@pytest.mark.parametrize("epsi", [0.1, 0.2, 0.3])
+def test_auto_omega_not_slower_than_gauss_seidel(epsi):
+    # matrix(n, epsi) n'est pas « consistently ordered » : la formule de omega
+    # optimal y ralentit SOR, et le garde-fou doit revenir à Gauss-Seidel
+    A, b = matrix(200, epsi)
+    x0 = np.zeros(len(b))
+    n_gs = gauss_seidel2(A, b, x0, tol=1e-10, maxiter=1000)[1]
+    for x, niter, _ in (sor2(A, b, x0, "auto", tol=1e-10, maxiter=1000),
+                        sor1(A, b, x0, "auto", tol=1e-10, maxiter=1000),
+                        sor1(A, b, x0, "auto", tol=1e-10, maxiter=1000, block=32)):
+        assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+        assert niter <= n_gs
+    niter = sor_batched(np.stack([A, A]), np.stack([b, b]), None, "auto", tol=1e-10,
+                        maxiter=1000)[1]
+    assert np.all(niter <= n_gs)
+
+
+def test_auto_omega_accelerates_laplacian():
+    A = laplacian((16, 16)).toarray()
+    b = np.ones(len(A))
+    x0 = np.zeros(len(b))
+    n_gs = gauss_seidel2(A, b, x0, tol=1e-10, maxiter=5000)[1]
+    x, niter, _ = sor2(A, b, x0, "auto", tol=1e-10, maxiter=5000)
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-7)
+    assert niter < n_gs / 4
+    niter = sor_batched(A[None], b[None], None, "auto", tol=1e-10, maxiter=5000)[1]
+    assert niter[0] < n_gs / 4
+
+
+@pytest.mark.parametrize("block", [1, 7, 32, 500])
+@pytest.mark.parametrize("omega", [1.0, 1.3])
+def test_block_sweeps_match_row_loop(block, omega):
+    A, b = matrix(100, 0.2)
+    x0 = np.zeros(100)
+    x_row, n_row, inc_row = sor1(A, b, x0, omega, tol=1e-10, maxiter=200)
+    x_blk, n_blk, inc_blk = sor1(A, b, x0, omega, tol=1e-10, maxiter=200, block=block)
+    assert n_blk == n_row
+    assert np.allclose(x_blk, x_row, rtol=1e-12, atol=1e-14)
+    assert np.allclose(inc_blk, inc_row, rtol=1e-8)
+    assert np.allclose(x_blk, np.linalg.solve(A, b), atol=1e-8)
+    if omega == 1.0:
+        x_gs, n_gs, _ = gauss_seidel1(A, b, x0, tol=1e-10, maxiter=200, block=block)
+        assert n_gs == n_row and np.allclose(x_gs, x_row)
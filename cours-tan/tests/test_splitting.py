@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from tan.matrix import matrix
+from tan.syslin import splitting
+from tan.syslin.splitting import SORSplitting, Workspace, stationary
+
+
+@pytest.mark.parametrize("in_place", [True, False])
+@pytest.mark.parametrize("omega", [1.0, 1.2])
+def test_sor_step_matches_dense_formula(omega, in_place, monkeypatch):
+    A, b = matrix(20, 0.3)
+    S = SORSplitting(A, omega)
+    x = np.random.default_rng(0).standard_normal(20)
+    D = np.diag(np.diag(A))
+    expected = np.linalg.solve(D + omega * np.tril(A, -1),
+                               ((1 - omega) * D - omega * np.triu(A, 1)) @ x + omega * b)
+    if not in_place:
+        # LAPACK peut retourner le résultat dans une copie plutôt qu'en place
+        dtrtrs = splitting.lapack.dtrtrs
+        monkeypatch.setattr(splitting.lapack, "dtrtrs",
+                            lambda T, y, **kw: dtrtrs(T, y.copy(), **kw))
+    x_new = np.zeros(20)
+    dx = np.zeros(20)
+    S.step(x, b, x_new, dx, [np.zeros(20)])
+    assert np.allclose(x_new, expected)
+    assert np.allclose(dx, expected - x)
+
+
+def test_sor_zero_pivot_raises():
+    A = np.array([[1.0, 2.0], [3.0, 0.0]])
+    S = SORSplitting(A)
+    with pytest.raises(np.linalg.LinAlgError):
+        S.step(np.zeros(2), np.ones(2), np.zeros(2), np.zeros(2), [np.zeros(2)])
+
+
+def test_sor_rejects_linear_operator():
+    with pytest.raises(TypeError, match="LinearOperator"):
+        SORSplitting(spla.aslinearoperator(np.eye(3)))
+
+
+def test_stationary_reuses_workspace():
+    A, b = matrix(50, 0.2)
+    ws = Workspace()
+    for M in (A, sp.csr_matrix(A)):
+        x, niter, inc = stationary(SORSplitting(M, 1.1), b, np.zeros(50), tol=1e-12,
+                                   maxiter=500, workspace=ws)
+        assert np.allclose(x, np.linalg.solve(A, b))
+    assert len(ws.vectors(50, 4)) == 4
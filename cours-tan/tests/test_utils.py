@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+from tan.matrix import matrix
+from tan.syslin import utils
+from tan.syslin.gauss_seidel import gauss_seidel2
+from tan.syslin.gradient import gradient, richardson
+from tan.syslin.jacobi import jacobi2
+from tan.syslin.pcg import pcg
+from tan.syslin.sor import sor2, ssor
+
+
+class _NoDense(sp.csr_matrix):
+    """Matrice CSR qui refuse d'être densifiée."""
+
+    def toarray(self, *args, **kwargs):
+        raise AssertionError("matrice densifiée")
+
+    todense = toarray
+
+
+STATIONARY = [
+    lambda A, b: jacobi2(A, b, np.zeros(len(b)), tol=1e-10, maxiter=500),
+    lambda A, b: gauss_seidel2(A, b, np.zeros(len(b)), tol=1e-10, maxiter=500),
+    lambda A, b: sor2(A, b, np.zeros(len(b)), omega=1.2, tol=1e-10, maxiter=500),
+    lambda A, b: ssor(A, b, np.zeros(len(b)), omega=1.2, tol=1e-10, maxiter=500),
+]
+KRYLOV = [
+    lambda A, b: gradient(A, b, tol=1e-10, maxiter=2000),
+    lambda A, b: richardson(A, b, alpha=0.5, tol=1e-10, maxiter=2000),
+    lambda A, b: pcg(A, b, tol=1e-12, maxiter=500),
+]
+
+
+@pytest.mark.parametrize("solver", STATIONARY + KRYLOV)
+def test_sparse_formats_match_dense(solver):
+    A, b = matrix(80, 0.2)
+    x, niter = solver(A, b)[:2]
+    assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+    for M in (sp.csr_matrix(A), sp.csc_matrix(A), _NoDense(A)):
+        y, m = solver(M, b)[:2]
+        assert m == niter
+        assert np.allclose(y, x, atol=1e-10)
+
+
+@pytest.mark.parametrize("solver", [STATIONARY[0]] + KRYLOV)
+def test_linear_operator(solver):
+    A, b = matrix(80, 0.2)
+    op = spla.aslinearoperator(A)
+    op.diagonal = lambda: np.diag(A).copy()
+    x, niter = solver(A, b)[:2]
+    y, m = solver(op, b)[:2]
+    assert m == niter
+    assert np.allclose(y, x, atol=1e-10)
+
+
+def test_helpers_keep_the_format():
+    A, b = matrix(30, 0.2)
+    S = sp.csr_matrix(A)
+    assert np.array_equal(utils.diagonal(S), np.diag(A))
+    L = utils.tril(S)
+    assert sp.issparse(L) and np.array_equal(L.toarray(), np.tril(A))
+    assert np.allclose(utils.lower_solver(L)(b), np.linalg.solve(np.tril(A), b))
+    assert np.allclose(utils.upper_solver(utils.triu(S))(b), np.linalg.solve(np.triu(A), b))
+    op = spla.aslinearoperator(A)
+    assert utils.size(op) == 30
+    for f in (utils.diagonal, utils.tril, utils.triu):
+        with pytest.raises(TypeError):
+            f(op)
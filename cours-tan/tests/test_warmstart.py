@@ -0,0 +1,74 @@
+import numpy as np
+
+from tan.matrix import matrix
+from tan.syslin.pcg import pcg
+from tan.syslin.sor import sor2
+from tan.syslin.warmstart import WarmStart
+
+
+def _rhs(n):
+    """Un second membre fixe : avec b = A @ ones (`matrix`), la solution ne dépendrait pas de epsi."""
+    return np.random.default_rng(0).standard_normal(n)
+
+
+def _sweep(ws, solver, epsis, **options):
+    b = _rhs(100)
+    counts = []
+    for epsi in epsis:
+        A, _ = matrix(100, epsi)
+        x, niter = ws.solve(solver, A, b, epsi, **options)[:2]
+        assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+        counts.append(niter)
+    return counts
+
+
+def test_linspace_sweep_extrapolates_and_saves_iterations():
+    ws = WarmStart(probe=5)
+    epsis = np.linspace(0.1, 0.3, 21)
+    b = _rhs(100)
+    for i, epsi in enumerate(epsis):
+        A, _ = matrix(100, epsi)
+        x, niter, inc, res = ws.solve(pcg, A, b, epsi, tol=1e-10, maxiter=1000)
+        assert np.allclose(x, np.linalg.solve(A, b), atol=1e-8)
+        # à partir de la troisième résolution, le pas de np.linspace est
+        # régulier à l'arrondi près : l'itéré initial doit être extrapolé
+        if i >= 2:
+            assert ws.last == "extrapolation"
+    assert (ws.hits, ws.misses, len(ws.cold)) == (20, 1, 5)
+    # démarrage à chaud : au moins 20 % d'itérations en moins qu'à froid
+    assert np.mean(ws.warm) < 0.8 * np.mean(ws.cold)
+    assert ws.saved >= 0.2 * np.mean(ws.cold) * ws.hits
+    assert ws.saved <= max(ws.cold) * ws.hits
+    # l'extrapolation fait mieux que la solution la plus proche
+    nearest = WarmStart(extrapolate=False)
+    assert sum(_sweep(nearest, pcg, epsis, tol=1e-10, maxiter=1000)[1:]) > sum(ws.warm)
+
+
+def test_extrapolation_is_exact_for_affine_solutions():
+    ws = WarmStart()
+    ws.store(0.1, np.array([1.0, 2.0]))
+    ws.store(0.2, np.array([2.0, 3.0]))
+    assert np.allclose(ws.guess(0.3, 2), [3.0, 4.0])
+    assert ws.last == "extrapolation"
+    assert np.allclose(ws.guess(0.6, 2), [2.0, 3.0])
+    assert ws.last == "nearest"
+    assert ws.guess(0.3, 3) is None
+
+
+def test_lru_eviction_bounds_memory():
+    ws = WarmStart(maxbytes=3 * 8 * 10)
+    for k in range(5):
+        ws.store(k, np.full(10, k))
+    assert len(ws) == 3 and ws.nbytes <= ws.maxbytes
+    assert ws.guess(0, 10)[0] == 2
+
+
+def test_stationary_solver_converges_from_cache():
+    epsis = np.linspace(0.1, 0.3, 11)
+    warm = _sweep(WarmStart(), sor2, epsis, tol=1e-10, maxiter=1000)
+    b = _rhs(100)
+    cold = [sor2(matrix(100, epsi)[0], b, np.zeros(100), tol=1e-10, maxiter=1000)[1]
+            for epsi in epsis]
+    assert warm[0] == cold[0]
+    assert all(w < c for w, c in zip(warm[1:], cold[1:]))
+    assert sum(warm) < 0.9 * sum(cold)